@@ -0,0 +1,9 @@
+"""Make the tools and analytics modules importable, as they are when run from tools/"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "tools", ROOT / "tools" / "analytics"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,77 @@
+"""Tests for fingerprint encoding and the reference-case index (tools/fingerprint_index.py)"""
+
+import numpy as np
+
+from fingerprint_index import FingerprintIndex, signature_concepts
+
+# Characterization of the demo network written the way reference cases are:
+# its signature types share no words with the Filament pattern types
+MATCHING_CASE = """\
+characterization_metadata:
+  characterization_id: "CHAR_DEMO_NETWORK"
+  phenomenon_name_processed: "Demo threshold network"
+phenomenon_characterization:
+  individual_eep_characterizations:
+    - eep_name: "Distributed Intelligence"
+      confidence_in_identification: {level: High}
+  quantitative_signatures_detected:
+    - signature_type: "critical_value"
+      confidence: "High"
+    - signature_type: "avalanche_size_distribution"
+      confidence: "High"
+    - signature_type: "small_world_topology"
+      confidence: "Medium"
+"""
+
+# Same EEP, unrelated signatures that share literal words with the Filament output
+DECOY_CASE = """\
+characterization_metadata:
+  characterization_id: "CHAR_DECOY"
+  phenomenon_name_processed: "Decoy"
+phenomenon_characterization:
+  individual_eep_characterizations:
+    - eep_name: "Distributed Intelligence"
+      confidence_in_identification: {level: High}
+  quantitative_signatures_detected:
+    - signature_type: "network_function_information_analysis"
+      confidence: "High"
+    - signature_type: "wavenumber_selection"
+      confidence: "High"
+"""
+
+
+def test_filament_and_reference_labels_share_concepts():
+    assert signature_concepts("threshold_function") == signature_concepts("critical_value")
+    assert signature_concepts("information_cascade") == signature_concepts("avalanche_size_distribution")
+    assert signature_concepts("homogeneous") == ["homogeneous"]
+
+
+def test_filament_output_retrieves_matching_reference_case(tmp_path):
+    from ler_access import LERQueryEngine
+    from conftest import ROOT
+    from filament_v001 import FilamentEvent
+
+    (tmp_path / "matching.yaml").write_text(MATCHING_CASE, encoding="utf-8")
+    (tmp_path / "decoy.yaml").write_text(DECOY_CASE, encoding="utf-8")
+    index = FingerprintIndex()
+    index.add_reference_cases(ROOT / "validation" / "reference_cases")
+    assert index.add_reference_cases(tmp_path) == 2
+
+    event = FilamentEvent(LERQueryEngine(str(ROOT)))
+    event.process_hardcoded_query()
+    event.retrieve_ler_guidance()
+    event.execute_stubbed_analysis()
+    output = event.generate_output_projection()
+    assert output["results"]["detected_signatures"]
+
+    matches = index.query_output(output, k=3)
+    assert matches[0]["case_id"] == "CHAR_DEMO_NETWORK"
+
+
+def test_add_batch_keeps_last_row_of_repeated_id():
+    index = FingerprintIndex()
+    rows = np.eye(3, index.encoder.dimension, dtype=np.float32)
+    index.add_batch(["a", "b", "a"], ["first", "b", "second"], rows)
+    assert index.case_ids == ["b", "a"]
+    assert index.names == ["b", "second"]
+    np.testing.assert_array_equal(index.vectors[1], rows[2])
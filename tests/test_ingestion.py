@@ -0,0 +1,21 @@
+"""Tests for interaction log ingestion (tools/ingestion.py)"""
+
+from datetime import datetime
+
+import numpy as np
+
+from ingestion import InteractionLogReader, _parse_timestamps
+
+
+def test_mixed_numeric_strings_and_iso_timestamps():
+    iso = "2024-01-02T03:04:05+00:00"
+    parsed = _parse_timestamps(["1.5", iso, 7, "  2 "])
+    np.testing.assert_array_equal(parsed, [1.5, datetime.fromisoformat(iso).timestamp(), 7.0, 2.0])
+
+
+def test_csv_with_mixed_timestamp_column(tmp_path):
+    log = tmp_path / "events.csv"
+    log.write_text("timestamp,type\n1.5,a\n2024-01-02T03:04:05+00:00,b\n3,a\n", encoding="utf-8")
+    chunks = list(InteractionLogReader(str(log)).iter_chunks())
+    timestamps = np.concatenate([c.timestamps for c in chunks])
+    np.testing.assert_array_equal(timestamps, [1.5, 1704164645.0, 3.0])
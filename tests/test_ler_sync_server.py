@@ -0,0 +1,49 @@
+"""Tests for the LER sync server (tools/ler_sync_server.py)"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import ROOT
+from ler_access import LERQueryEngine
+from ler_sync_server import LERSyncIndex, LERSyncServer
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = LERSyncServer(("127.0.0.1", 0), LERSyncIndex(LERQueryEngine(str(ROOT))))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_page_token_walks_every_page(base_url):
+    ids, token = [], ""
+    while True:
+        status, page = _get(f"{base_url}/v1/eeps?page_size=1&page_token={token}")
+        assert status == 200
+        ids.extend(item["id"] for item in page["items"])
+        token = page["next_page_token"]
+        if not token:
+            break
+    assert ids == sorted(ids) and len(ids) == 3
+
+
+@pytest.mark.parametrize("token", ["@@@", "not-a-token", "%C3%A9"])
+def test_invalid_page_token_is_rejected(base_url, token):
+    status, body = _get(f"{base_url}/v1/eeps?page_token={token}")
+    assert status == 400
+    assert body["error"] == "bad_request"
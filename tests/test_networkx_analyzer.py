@@ -0,0 +1,27 @@
+"""Tests for the network signature-scanning plugin (tools/analytics/networkx_analyzer.py)"""
+
+import pytest
+
+pytest.importorskip("networkx")
+
+from networkx_analyzer import run_signature_scanning
+
+
+def _connectivity(results):
+    return next(p for p in results["patterns"] if p["name"] == "Connectivity Patterns")
+
+
+def test_plugin_bootstrap_is_opt_in():
+    results = run_signature_scanning({"query_data": {"random_seed": 1}})
+    assert "overall_confidence_interval" not in results
+    assert all("confidence_interval" not in p for p in results["patterns"])
+
+
+def test_connectivity_confidence_is_resampled():
+    results = run_signature_scanning({"query_data": {"random_seed": 1, "bootstrap_resamples": 100}})
+    pattern = _connectivity(results)
+    interval = pattern["confidence_interval"]
+    assert interval["resamples"] == 100
+    assert interval["low"] <= pattern["confidence"] <= interval["high"]
+    assert interval["std"] > 0
+    assert len(results["overall_confidence_interval"]["weights"]) == 3
@@ -0,0 +1,22 @@
+"""Tests for power-law fitting (tools/analytics/power_law.py)"""
+
+import numpy as np
+import pytest
+
+from power_law import PowerLawFitter
+
+special = pytest.importorskip("scipy.special")
+
+
+def _discrete_power_law(alpha, size, rng):
+    k = np.arange(1, 200_000)
+    cdf = np.cumsum(k ** -alpha / special.zeta(alpha, 1))
+    return k[np.minimum(np.searchsorted(cdf, rng.random(size)), len(k) - 1)]
+
+
+@pytest.mark.parametrize("alpha", [2.0, 2.5, 3.0])
+def test_discrete_fit_recovers_xmin_one(alpha):
+    x = _discrete_power_law(alpha, 5000, np.random.default_rng(1))
+    result = PowerLawFitter(discrete=True).fit(x)
+    assert result["xmin"] == 1.0
+    assert result["alpha"] == pytest.approx(alpha, abs=0.05)
@@ -0,0 +1,85 @@
+"""Tests for the cross-event result cache (tools/result_cache.py)"""
+
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from conftest import ROOT
+from result_cache import EventResultCache
+
+
+def _put_entries(cache_dir, worker, count):
+    cache = EventResultCache(cache_dir)
+    for i in range(count):
+        cache.put(f"{worker:02d}{i:062d}", {"DISTRIBUTED_INTELLIGENCE": "h"}, {}, {})
+
+
+def test_concurrent_puts_keep_every_index_entry(tmp_path):
+    workers, count = 4, 25
+    with ProcessPoolExecutor(workers) as pool:
+        for future in [pool.submit(_put_entries, str(tmp_path), w, count) for w in range(workers)]:
+            future.result()
+
+    index = EventResultCache(tmp_path)._load_index()
+    assert len(index["DISTRIBUTED_INTELLIGENCE"]) == workers * count
+
+
+def _copy_ler(destination):
+    for name in ("eep_definitions", "sops", "schemas", "ontology"):
+        shutil.copytree(ROOT / name, destination / name)
+    return destination
+
+
+def test_ler_version_check_invalidates_entries_for_changed_definitions(tmp_path):
+    from ler_access import LERQueryEngine
+    from filament_v001 import DEMO_QUERY
+
+    ler_root = _copy_ler(tmp_path / "ler")
+    cache = EventResultCache(tmp_path / "cache")
+    engine = LERQueryEngine(str(ler_root))
+    key, deps = cache.make_key(DEMO_QUERY, engine)
+    cache.put(key, deps, {"overall_confidence": 0.9}, {})
+    assert cache.check_ler_version(engine) == 0
+    assert cache.get(key) is not None
+
+    # Startup against an unchanged LER keeps the entry
+    assert cache.check_ler_version(LERQueryEngine(str(ler_root))) == 0
+    assert cache.get(key) is not None
+
+    definition = ler_root / "eep_definitions" / "distributed_intelligence.yaml"
+    text = definition.read_text(encoding="utf-8")
+    definition.write_text(text.replace('version: "0.0.1"', 'version: "0.0.2"'), encoding="utf-8")
+
+    assert cache.check_ler_version(LERQueryEngine(str(ler_root))) == 1
+    assert cache.get(key) is None
+
+
+@pytest.mark.parametrize("field, value", [("weighted_analysis", True), ("bootstrap_resamples", 200),
+                                          ("time_budget_seconds", 0.5)])
+def test_result_affecting_query_fields_change_the_key(tmp_path, field, value):
+    from ler_access import LERQueryEngine
+    from filament_v001 import DEMO_QUERY
+
+    cache = EventResultCache(tmp_path)
+    engine = LERQueryEngine(str(ROOT))
+    key, _ = cache.make_key(DEMO_QUERY, engine)
+    other, _ = cache.make_key(dict(DEMO_QUERY, **{field: value}), engine)
+    assert key is not None and other != key
+    assert cache.make_key(dict(DEMO_QUERY, query_text="reworded"), engine)[0] == key
+
+
+def test_weighted_query_misses_the_unweighted_entry(tmp_path):
+    from ler_access import LERQueryEngine
+    from filament_v001 import FilamentEvent, DEMO_QUERY
+
+    cache = EventResultCache(tmp_path)
+    engine = LERQueryEngine(str(ROOT))
+    for query in (DEMO_QUERY, dict(DEMO_QUERY, weighted_analysis=True)):
+        event = FilamentEvent(engine, result_cache=cache)
+        event.process_hardcoded_query(query)
+        event.retrieve_ler_guidance()
+        event.execute_stubbed_analysis()
+        event.generate_output_projection()
+    assert cache.hits == 0 and cache.misses == 2
+    assert "weighted_analysis" in event.analysis_results
@@ -0,0 +1,28 @@
+"""Tests for FFT spatial pattern analysis (tools/analytics/spatial_pattern_analyzer.py)"""
+
+import numpy as np
+import pytest
+
+from spatial_pattern_analyzer import SpatialPatternAnalyzer, synthesize_pattern
+
+
+def _field():
+    return synthesize_pattern((32, 32), wavelength=8.0, n_frames=4, seed=1).astype(np.float64)
+
+
+@pytest.mark.parametrize("window", [None, "hann"])
+def test_read_only_float64_memmap(tmp_path, window):
+    path = tmp_path / "field.npy"
+    np.save(path, _field())
+    field = np.load(path, mmap_mode="r")
+
+    results = SpatialPatternAnalyzer(window=window).analyze(field)
+    assert results["dominant_wavelength"]["wavelength"] == pytest.approx(8.0, rel=0.1)
+
+
+@pytest.mark.parametrize("window", [None, "hann"])
+def test_input_field_is_not_modified(window):
+    field = _field()
+    original = field.copy()
+    SpatialPatternAnalyzer(window=window).analyze(field)
+    np.testing.assert_array_equal(field, original)
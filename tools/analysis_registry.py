@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Analysis Plugin Registry
+Maps SOP step analytical procedures to lazily imported analysis backends
+
+Each SOP step declares an ``analytical_procedure`` (e.g.
+``pattern_matching_and_detection``). Plugins register against a procedure with
+a ``"module:attribute"`` target string, the same format used by Python entry
+points, and are only imported the first time a step dispatches to them.
+"""
+
+import os
+import sys
+import logging
+import importlib
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Analysis modules live next to this file in tools/analytics
+ANALYTICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analytics')
+
+# Entry point group scanned for third-party analysis plugins.
+# Entry point name = analytical procedure, value = "module:callable"
+ENTRY_POINT_GROUP = "eep_ler.analysis_plugins"
+
+# Plugins shipped with the repository (procedure, target, supported EEPs)
+BUILTIN_PLUGINS = [
+    ("pattern_matching_and_detection",
+     "networkx_analyzer:run_signature_scanning",
+     ["EEP_DISTRIBUTED_INTELLIGENCE"]),
+    ("fingerprint_synthesis_and_integration",
+     "fingerprint_index:run_fingerprint_synthesis",
+     None),
+]
+
+
+class AnalysisPlugin:
+    """
+    A registered analysis backend for one analytical procedure
+
+    The target is resolved on the first call to load(); until then the plugin
+    costs nothing beyond its spec.
+    """
+
+    def __init__(self, procedure: str, target: str,
+                 eep_ids: Optional[Iterable[str]] = None, source: str = "builtin"):
+        """
+        Args:
+            procedure: SOP analytical_procedure this plugin handles
+            target: Import path in "module:attribute" form
+            eep_ids: EEP ids the plugin supports (None = any EEP)
+            source: Where the plugin was declared ("builtin", "entry_point", ...)
+        """
+        if ':' not in target:
+            raise ValueError(f"Plugin target must be 'module:attribute', got: {target}")
+        self.procedure = procedure
+        self.target = target
+        self.eep_ids = set(eep_ids) if eep_ids else None
+        self.source = source
+        self._callable = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._callable is not None
+
+    def load(self) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Import the plugin module and resolve the target callable"""
+        if self._callable is None:
+            module_name, _, attr_path = self.target.partition(':')
+            if ANALYTICS_DIR not in sys.path:
+                sys.path.append(ANALYTICS_DIR)
+            obj = importlib.import_module(module_name)
+            for attr in attr_path.split('.'):
+                obj = getattr(obj, attr)
+            self._callable = obj
+            # Plugins may narrow their EEP support once loaded
+            declared = getattr(obj, 'supported_eeps', None)
+            if declared and self.eep_ids is None:
+                self.eep_ids = set(declared)
+            logger.debug(f"Loaded analysis plugin {self.target} for {self.procedure}")
+        return self._callable
+
+    def supports(self, eep_id: str) -> bool:
+        """Check whether this plugin can analyze the given EEP"""
+        return self.eep_ids is None or eep_id in self.eep_ids
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "lazy"
+        return f"AnalysisPlugin({self.procedure!r}, {self.target!r}, {state})"
+
+
+class AnalysisRegistry:
+    """
+    Registry of analysis plugins keyed by SOP analytical procedure
+
+    Dispatch picks the first registered plugin for the procedure that supports
+    the requested EEP. Entry points are scanned once, on the first lookup.
+    """
+
+    def __init__(self, include_builtins: bool = True, use_entry_points: bool = True):
+        self._plugins: Dict[str, List[AnalysisPlugin]] = {}
+        self._entry_points_loaded = not use_entry_points
+
+        if include_builtins:
+            for procedure, target, eep_ids in BUILTIN_PLUGINS:
+                self.register(procedure, target, eep_ids)
+
+    def register(self, procedure: str, target: str,
+                 eep_ids: Optional[Iterable[str]] = None, source: str = "builtin") -> AnalysisPlugin:
+        """
+        Register a plugin target for an analytical procedure
+
+        Args:
+            procedure: SOP analytical_procedure name
+            target: Import path in "module:attribute" form
+            eep_ids: Optional list of supported EEP ids
+
+        Returns:
+            The registered AnalysisPlugin
+        """
+        plugin = AnalysisPlugin(procedure, target, eep_ids, source)
+        self._plugins.setdefault(procedure, []).append(plugin)
+        return plugin
+
+    def _load_entry_points(self):
+        """Register plugins declared under ENTRY_POINT_GROUP"""
+        self._entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+
+        try:
+            eps = entry_points()
+            if hasattr(eps, 'select'):
+                group = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                group = eps.get(ENTRY_POINT_GROUP, [])
+        except Exception as e:
+            logger.warning(f"Could not read analysis plugin entry points: {e}")
+            return
+
+        for ep in group:
+            self.register(ep.name, ep.value, source="entry_point")
+            logger.debug(f"Registered entry point plugin {ep.value} for {ep.name}")
+
+    def plugins_for(self, procedure: str) -> List[AnalysisPlugin]:
+        """Return all plugins registered for a procedure"""
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return list(self._plugins.get(procedure, []))
+
+    def resolve(self, procedure: str, eep_id: str) -> Optional[AnalysisPlugin]:
+        """
+        Find the plugin that should handle a procedure for an EEP
+
+        Args:
+            procedure: SOP analytical_procedure name
+            eep_id: EEP being analyzed
+
+        Returns:
+            Matching AnalysisPlugin or None if no plugin applies
+        """
+        for plugin in self.plugins_for(procedure):
+            if plugin.eep_ids is not None and not plugin.supports(eep_id):
+                continue
+            try:
+                plugin.load()
+            except (ImportError, AttributeError) as e:
+                logger.warning(f"Analysis plugin {plugin.target} unavailable: {e}")
+                continue
+            if plugin.supports(eep_id):
+                return plugin
+        return None
+
+    def dispatch(self, procedure: str, eep_id: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run the plugin registered for a procedure
+
+        Args:
+            procedure: SOP analytical_procedure name
+            eep_id: EEP being analyzed
+            context: Analysis context passed through to the plugin
+
+        Returns:
+            Plugin analysis results, or None if no plugin handles the procedure
+        """
+        plugin = self.resolve(procedure, eep_id)
+        if plugin is None:
+            return None
+        logger.debug(f"Dispatching {procedure} for {eep_id} to {plugin.target}")
+        return plugin.load()(context)
+
+    def list_procedures(self) -> List[str]:
+        """Return all procedures with at least one registered plugin"""
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return sorted(self._plugins.keys())
+
+    def loaded_plugins(self) -> List[str]:
+        """Return targets of plugins that have actually been imported"""
+        return [plugin.target for plugins in self._plugins.values()
+                for plugin in plugins if plugin.is_loaded]
+
+
+_default_registry = None
+
+
+def get_default_registry() -> AnalysisRegistry:
+    """Return the process-wide registry, creating it on first use"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = AnalysisRegistry()
+    return _default_registry
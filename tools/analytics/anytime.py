@@ -0,0 +1,120 @@
+# Anytime Analysis Module (deadlines and progressive samples)
+# File: tools/analytics/anytime.py
+
+import time
+from typing import Callable, Iterable, List, Optional, Sequence, Any
+
+# Precision of an anytime result, coarsest first
+PRECISION_LEVELS = ("estimate", "sampled", "exact")
+
+
+def lowest_precision(levels: Iterable[str]) -> str:
+    """Coarsest of several precision levels (the precision of a combined result)"""
+    return min(levels, key=PRECISION_LEVELS.index, default="exact")
+
+
+def sample_standard_error(values, population: int) -> Optional[float]:
+    """Standard error of a sample mean drawn without replacement from `population` items"""
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    k = len(values)
+    if k < 2 or population < 2:
+        return None
+    correction = max(0.0, 1.0 - k / population)
+    return round(float(values.std(ddof=1) / np.sqrt(k) * np.sqrt(correction)), 4)
+
+
+class Deadline:
+    """
+    Wall-clock budget for one analysis
+
+    A budget of None never expires, so callers can pass a Deadline
+    unconditionally.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.start = time.perf_counter()
+        self.at = None if seconds is None else self.start + max(0.0, seconds)
+
+    def remaining(self) -> float:
+        if self.at is None:
+            return float("inf")
+        return max(0.0, self.at - time.perf_counter())
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def expired(self) -> bool:
+        return self.at is not None and time.perf_counter() >= self.at
+
+    def fits(self, predicted_seconds: Optional[float]) -> bool:
+        """Whether work predicted to take predicted_seconds ends before the deadline"""
+        return predicted_seconds is not None and predicted_seconds <= self.remaining()
+
+
+class ProgressiveSample:
+    """
+    Items in a fixed random order, processed in growing batches
+
+    Batches double in size, but are cut down to what the measured cost per
+    item lets finish before the deadline, so a large graph is never handed
+    to one uninterruptible call. Whatever has been processed is a uniform
+    random sample of the items; once every item is processed it is the
+    full population.
+    """
+
+    def __init__(self, items: Sequence[Any], seed: Optional[int] = None, first_batch: int = 8):
+        import numpy as np
+
+        order = np.random.default_rng(seed).permutation(len(items))
+        self.items = [items[i] for i in order]
+        self.first_batch = first_batch
+        self.done = 0
+        self.seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def complete(self) -> bool:
+        return self.done >= len(self.items)
+
+    @property
+    def fraction(self) -> float:
+        return self.done / len(self.items) if self.items else 1.0
+
+    def cost_per_item(self) -> Optional[float]:
+        return self.seconds / self.done if self.done else None
+
+    def advance(self, process: Callable[[List[Any]], None], deadline: Optional[Deadline] = None,
+                max_items: Optional[int] = None) -> int:
+        """
+        Process further items until all are done, max_items have been
+        processed, or the deadline passes
+
+        The first batch always runs, so there is a result even when the
+        budget is already spent.
+
+        Args:
+            process: Called with each batch of items; accumulates its own results
+            deadline: Optional Deadline
+            max_items: Stop once this many items (in total) are processed
+
+        Returns:
+            Number of items processed by this call
+        """
+        target = len(self.items) if max_items is None else min(len(self.items), max_items)
+        start = self.done
+        while self.done < target:
+            if self.done and deadline is not None and deadline.expired():
+                break
+            size = min(max(self.first_batch, self.done), target - self.done)
+            if self.done and deadline is not None and self.seconds > 0:
+                size = max(1, min(size, int(deadline.remaining() / self.cost_per_item())))
+            t0 = time.perf_counter()
+            process(self.items[self.done:self.done + size])
+            self.seconds += time.perf_counter() - t0
+            self.done += size
+        return self.done - start
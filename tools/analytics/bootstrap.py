@@ -0,0 +1,244 @@
+# Bootstrap Confidence Intervals
+# File: tools/analytics/bootstrap.py
+
+import numpy as np
+import logging
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+
+# Suggested resample budget; bootstrap is opt-in (bootstrap_resamples defaults to 0 everywhere)
+DEFAULT_BOOTSTRAP_RESAMPLES = 200
+
+# Smallest std used for precision weighting; confidences are rule-based
+# scores, so spreads below a few hundredths are not meaningful precision
+MIN_WEIGHT_STD = 0.02
+
+# Replicate statistic: dict of resampled (n_block, n) arrays -> (n_block,) values
+Statistic = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+class Bootstrap:
+    """
+    Batched bootstrap resampling with a fixed resample budget
+
+    Resample index matrices are generated in blocks sized to max_block_bytes
+    and every statistic is evaluated on a whole block at once. Blocks are
+    seeded from one SeedSequence, so separate calls on data of the same
+    length see identical resamples: metrics from different analysis
+    sections computed on the same nodes stay paired.
+
+    Methods:
+    - node_replicates: i.i.d. resampling of per-node (or per-observation) values
+    - block_replicates: moving-block resampling of time series
+    - network_replicates: node- or edge-resampled subgraphs with an arbitrary
+      metric, on a process pool
+    """
+
+    def __init__(self, n_resamples: int = 200, confidence: float = 0.95, seed: Optional[int] = None,
+                 max_block_bytes: int = 64 * 1024 * 1024, n_workers: Optional[int] = None):
+        """
+        Args:
+            n_resamples: Resample budget per statistic
+            confidence: Interval coverage (percentile method)
+            seed: Random seed
+            max_block_bytes: Upper bound for one block of resampled values
+            n_workers: Worker processes for network_replicates
+        """
+        self.logger = logging.getLogger(__name__)
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.max_block_bytes = max_block_bytes
+        self.n_workers = n_workers
+
+    def _blocks(self, bytes_per_resample: int) -> Iterator[Tuple[int, np.random.Generator, int]]:
+        """Yield (offset, generator, size) covering n_resamples in memory-bounded blocks"""
+        size = max(1, min(self.n_resamples, self.max_block_bytes // max(bytes_per_resample, 1)))
+        # Spawn per fixed-size chunk so identical budgets and lengths give identical resamples
+        offsets = range(0, self.n_resamples, size)
+        for offset, seq in zip(offsets, np.random.SeedSequence(self.seed).spawn(len(offsets))):
+            yield offset, np.random.default_rng(seq), min(size, self.n_resamples - offset)
+
+    def node_replicates(self, columns: Dict[str, np.ndarray], statistics: Dict[str, Statistic]) -> Dict[str, np.ndarray]:
+        """
+        Replicates of statistics under i.i.d. resampling of rows
+
+        Args:
+            columns: Equal-length 1-D arrays resampled with the same indices
+            statistics: name -> function of the resampled columns
+
+        Returns:
+            name -> (n_resamples,) replicate values
+        """
+        n = len(next(iter(columns.values())))
+        out = {name: np.empty(self.n_resamples) for name in statistics}
+        if n == 0:
+            for values in out.values():
+                values.fill(np.nan)
+            return out
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        for offset, rng, size in self._blocks(n * (4 + 8 * len(arrays))):
+            index = rng.integers(0, n, (size, n), dtype=np.int32 if n < 2 ** 31 else np.int64)
+            sample = {name: values[index] for name, values in arrays.items()}
+            for name, statistic in statistics.items():
+                out[name][offset:offset + size] = statistic(sample)
+        return out
+
+    def block_replicates(self, series: Dict[str, np.ndarray], statistics: Dict[str, Statistic],
+                         block_length: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Replicates of time-series statistics under the moving-block bootstrap
+
+        Each resample concatenates randomly placed blocks of consecutive
+        samples (default length n^(1/3)), preserving short-range dependence.
+
+        Args:
+            series: Equal-length time series resampled with the same blocks
+            statistics: name -> function of the resampled series
+            block_length: Samples per block
+
+        Returns:
+            name -> (n_resamples,) replicate values
+        """
+        n = len(next(iter(series.values())))
+        out = {name: np.empty(self.n_resamples) for name in statistics}
+        if n == 0:
+            for values in out.values():
+                values.fill(np.nan)
+            return out
+        length = int(block_length or max(1, round(n ** (1.0 / 3.0))))
+        length = min(length, n)
+        n_blocks = -(-n // length)
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in series.items()}
+        steps = np.arange(length)
+        for offset, rng, size in self._blocks(n * (8 + 8 * len(arrays))):
+            starts = rng.integers(0, n - length + 1, (size, n_blocks))
+            index = (starts[:, :, None] + steps).reshape(size, -1)[:, :n]
+            sample = {name: values[index] for name, values in arrays.items()}
+            for name, statistic in statistics.items():
+                out[name][offset:offset + size] = statistic(sample)
+        return out
+
+    def network_replicates(self, network, metric: Callable, mode: str = "node") -> np.ndarray:
+        """
+        Replicates of a whole-network metric on resampled subgraphs
+
+        mode "node" keeps the subgraph induced by a with-replacement sample of
+        nodes; mode "edge" keeps a with-replacement sample of edges. metric
+        must be a module-level function (it is pickled to the worker pool
+        when n_workers > 1).
+
+        Returns:
+            (n_resamples,) replicate values (NaN where the metric failed)
+        """
+        if mode not in ("node", "edge"):
+            raise ValueError(f"Unknown network resampling mode: {mode}")
+        nodes = list(network.nodes())
+        edges = list(network.edges())
+        seeds = np.random.SeedSequence(self.seed).spawn(self.n_resamples)
+        tasks = [(network, metric, mode, nodes, edges, seq) for seq in seeds]
+        if self.n_workers and self.n_workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                values = list(pool.map(_network_replicate, tasks,
+                                       chunksize=max(1, len(tasks) // (4 * self.n_workers))))
+        else:
+            values = [_network_replicate(task) for task in tasks]
+        return np.asarray(values, dtype=np.float64)
+
+    def interval(self, estimate: float, replicates: np.ndarray, method: str = "node_bootstrap",
+                 digits: int = 4) -> Dict[str, Any]:
+        """Percentile interval around a point estimate"""
+        finite = replicates[np.isfinite(replicates)]
+        if len(finite) == 0:
+            return {"estimate": round(float(estimate), digits), "low": None, "high": None, "std": None,
+                    "confidence": self.confidence, "resamples": 0, "method": method}
+        tail = (1.0 - self.confidence) / 2.0 * 100.0
+        low, high = np.percentile(finite, [tail, 100.0 - tail])
+        return {
+            "estimate": round(float(estimate), digits),
+            "low": round(float(low), digits),
+            "high": round(float(high), digits),
+            "std": round(float(finite.std()), digits),
+            "confidence": self.confidence,
+            "resamples": int(len(finite)),
+            "method": method
+        }
+
+
+def _network_replicate(task) -> float:
+    """One resampled-subgraph metric evaluation; module-level for the process pool"""
+    import networkx as nx
+
+    network, metric, mode, nodes, edges, seq = task
+    rng = np.random.default_rng(seq)
+    if mode == "node":
+        picked = rng.integers(0, len(nodes), len(nodes))
+        subgraph = network.subgraph({nodes[i] for i in picked})
+    else:
+        picked = rng.integers(0, len(edges), len(edges))
+        subgraph = nx.Graph()
+        subgraph.add_nodes_from(network.nodes(data=True))
+        subgraph.add_edges_from((edges[i][0], edges[i][1], network.edges[edges[i]]) for i in set(picked.tolist()))
+    try:
+        return float(metric(subgraph))
+    except Exception:
+        return float("nan")
+
+
+def bootstrap_ci(values, statistic: Callable[[np.ndarray], np.ndarray] = None, n_resamples: int = 1000,
+                 confidence: float = 0.95, seed: Optional[int] = None, block_length: Optional[int] = None,
+                 time_series: bool = False) -> Dict[str, Any]:
+    """
+    Percentile bootstrap interval of a statistic of one sample
+
+    Args:
+        values: 1-D sample or time series
+        statistic: Function of a (n_block, n) array returning (n_block,) values
+            (defaults to the mean along axis 1)
+        n_resamples: Resample budget
+        confidence: Interval coverage
+        seed: Random seed
+        block_length: Block length for time series
+        time_series: Use the moving-block bootstrap instead of i.i.d. resampling
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    statistic = statistic or (lambda sample: sample.mean(axis=1))
+    bootstrap = Bootstrap(n_resamples, confidence, seed)
+    wrapped = {"value": lambda sample: statistic(sample["x"])}
+    if time_series:
+        replicates = bootstrap.block_replicates({"x": values}, wrapped, block_length)["value"]
+    else:
+        replicates = bootstrap.node_replicates({"x": values}, wrapped)["value"]
+    estimate = float(statistic(values[None, :])[0]) if len(values) else float("nan")
+    return bootstrap.interval(estimate, replicates, "block_bootstrap" if time_series else "node_bootstrap")
+
+
+def weighted_confidence(confidences, intervals) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """
+    Precision-weighted mean of pattern confidences and its interval
+
+    Each confidence is weighted by 1 / std^2 of its bootstrap replicates,
+    so well-determined patterns count more than noisy ones; without
+    intervals this is the plain mean. Stds are floored at MIN_WEIGHT_STD so
+    a (near-)deterministic pattern cannot take over the mean. The interval
+    bounds are combined with the same weights (a comonotone, conservative bound).
+    """
+    confidences = np.asarray(confidences, dtype=np.float64)
+    if len(confidences) == 0:
+        return 0.0, None
+    stds = np.array([ci["std"] if ci and ci.get("std") is not None else np.nan for ci in intervals])
+    if np.all(np.isnan(stds)):
+        return float(confidences.mean()), None
+    stds = np.where(np.isnan(stds), np.nanmax(stds), stds)
+    weights = 1.0 / np.maximum(stds, MIN_WEIGHT_STD) ** 2
+    weights /= weights.sum()
+    lows = np.array([ci["low"] if ci and ci.get("low") is not None else c for ci, c in zip(intervals, confidences)])
+    highs = np.array([ci["high"] if ci and ci.get("high") is not None else c for ci, c in zip(intervals, confidences)])
+    overall = float(weights @ confidences)
+    return overall, {
+        "estimate": round(overall, 4),
+        "low": round(float(weights @ lows), 4),
+        "high": round(float(weights @ highs), 4),
+        "weights": [round(float(w), 4) for w in weights],
+        "method": "precision_weighted"
+    }
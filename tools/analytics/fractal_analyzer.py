@@ -0,0 +1,456 @@
+# Fractal Dimension Analysis Module
+# File: tools/analytics/fractal_analyzer.py
+
+import numpy as np
+import logging
+from contextlib import nullcontext
+from typing import Dict, Any, Optional
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # correlation sums fall back to blocked pairwise distances
+    cKDTree = None
+
+try:
+    from scipy.sparse.csgraph import shortest_path
+except ImportError:  # box covering falls back to NetworkX BFS
+    shortest_path = None
+
+
+def load_field_memmap(path: str, n_rows: int, n_cols: int, dtype: str = "float32") -> np.memmap:
+    """Open a raw (n_rows, n_cols) 2-D field without reading it into RAM"""
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n_rows, n_cols))
+
+
+def _fit_scaling(x: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """Least-squares line y = slope * x + intercept with its R^2"""
+    if len(x) < 2:
+        return {"slope": float("nan"), "intercept": float("nan"), "r_squared": 0.0, "points": int(len(x))}
+    slope, intercept = np.polyfit(x, y, 1)
+    residual = y - (slope * x + intercept)
+    total = ((y - y.mean()) ** 2).sum()
+    r_squared = 1.0 - (residual ** 2).sum() / total if total > 0 else 0.0
+    return {"slope": float(slope), "intercept": float(intercept),
+            "r_squared": float(r_squared), "points": int(len(x))}
+
+
+def _morton_codes(cells: np.ndarray, bits: int) -> np.ndarray:
+    """Interleave the bits of integer cell coordinates (n, d) into one uint64 key"""
+    n, d = cells.shape
+    cells = cells.astype(np.uint64)
+    codes = np.zeros(n, dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(d):
+            codes |= ((cells[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(bit * d + axis)
+    return codes
+
+
+class FractalAnalyzer:
+    """
+    Box-counting, correlation and box-covering dimensions
+
+    Point clouds are quantized once to a fine grid and sorted by Morton code;
+    coarsening a box size is a bit shift that keeps the order, so every scale
+    is counted from the same sorted array. 2-D fields are reduced as an
+    occupancy pyramid tile by tile, so memmapped fields never load whole.
+    """
+
+    def __init__(self, max_tile_bytes: int = 64 * 1024 * 1024, tracer=None):
+        """
+        Args:
+            max_tile_bytes: Upper bound for one field tile or distance block
+            tracer: Optional tracing.Tracer for per-measure spans
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_tile_bytes = max_tile_bytes
+        self.tracer = tracer
+
+    def _span(self, name: str):
+        return self.tracer.span(name) if self.tracer else nullcontext()
+
+    # Point clouds
+
+    def box_counting_points(self, points: np.ndarray, n_scales: int = 16,
+                            max_box_fraction: float = 0.2, min_boxes: int = 4) -> Dict[str, Any]:
+        """
+        Box-counting dimension of a point cloud
+
+        Args:
+            points: (n_points, n_dims) coordinates
+            n_scales: Number of dyadic box sizes (capped by 64-bit Morton keys)
+            max_box_fraction: Scales with more occupied boxes than this fraction
+                of the points are saturated and excluded from the fit
+            min_boxes: Scales with fewer occupied boxes are excluded from the fit
+
+        Returns:
+            Dict with dimension, fit quality and the box counts per scale
+        """
+        with self._span("box_counting_points"):
+            P = np.asarray(points, dtype=np.float64)
+            if P.ndim == 1:
+                P = P[:, np.newaxis]
+            n, d = P.shape
+            bits = min(n_scales, 63 // d)
+
+            lo = P.min(axis=0)
+            extent = float((P.max(axis=0) - lo).max()) or 1.0
+            resolution = 2 ** bits
+            cells = np.clip(((P - lo) / extent * resolution).astype(np.int64), 0, resolution - 1)
+            codes = np.sort(_morton_codes(cells, bits))
+
+            sizes, counts = [], []
+            for level in range(bits + 1):
+                shifted = codes >> np.uint64(level * d)
+                counts.append(1 + int(np.count_nonzero(np.diff(shifted))))
+                sizes.append(2.0 ** (level - bits))
+
+            sizes, counts = np.array(sizes), np.array(counts)
+            usable = (counts <= max_box_fraction * n) & (counts >= min_boxes)
+            fit = _fit_scaling(np.log(1.0 / sizes[usable]), np.log(counts[usable]))
+
+        return {
+            "dimension": round(fit["slope"], 4) if usable.sum() >= 2 else None,
+            "r_squared": round(fit["r_squared"], 4),
+            "scales_fitted": fit["points"],
+            "box_sizes": (sizes * extent).tolist(),
+            "box_counts": counts.tolist()
+        }
+
+    def correlation_dimension(self, points: np.ndarray, n_radii: int = 24, max_points: int = 5000,
+                              max_correlation: float = 0.1, min_pairs: int = 10,
+                              seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Grassberger-Procaccia correlation dimension
+
+        The correlation sum C(r) is evaluated for all radii together: with
+        SciPy through one dual-tree count, otherwise by binning blocked
+        pairwise distances into the sorted radii and accumulating.
+
+        Args:
+            points: (n_points, n_dims) coordinates
+            n_radii: Number of log-spaced radii
+            max_points: Random subsample size bound
+            max_correlation: Radii with C(r) above this are excluded (boundary effects)
+            min_pairs: Radii with fewer pairs are excluded (noise)
+
+        Returns:
+            Dict with dimension, fit quality and C(r)
+        """
+        with self._span("correlation_dimension"):
+            P = np.asarray(points, dtype=np.float64)
+            if P.ndim == 1:
+                P = P[:, np.newaxis]
+            if len(P) > max_points:
+                rng = np.random.default_rng(seed)
+                P = P[rng.choice(len(P), max_points, replace=False)]
+            n = len(P)
+            if n < 3:
+                return {"dimension": None, "r_squared": 0.0, "scales_fitted": 0, "radii": [], "correlation_sum": []}
+
+            extent = float((P.max(axis=0) - P.min(axis=0)).max()) or 1.0
+            radii = np.logspace(np.log10(extent / n), np.log10(extent), n_radii)
+            pairs = self._pair_counts(P, radii)
+
+            correlation = pairs / (n * (n - 1) / 2.0)
+            usable = (pairs >= min_pairs) & (correlation <= max_correlation)
+            fit = _fit_scaling(np.log(radii[usable]), np.log(correlation[usable]))
+
+        return {
+            "dimension": round(fit["slope"], 4) if usable.sum() >= 2 else None,
+            "r_squared": round(fit["r_squared"], 4),
+            "scales_fitted": fit["points"],
+            "radii": radii.tolist(),
+            "correlation_sum": correlation.tolist()
+        }
+
+    def _pair_counts(self, P: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Number of unordered pairs closer than each radius"""
+        n = len(P)
+        if cKDTree is not None:
+            tree = cKDTree(P)
+            # Ordered pairs including self-pairs
+            return (tree.count_neighbors(tree, radii) - n) / 2.0
+
+        histogram = np.zeros(len(radii) + 1, dtype=np.int64)
+        block = max(1, self.max_tile_bytes // (2 * 8 * n))
+        for start in range(0, n, block):
+            rows = P[start:start + block]
+            dist = np.sqrt(((rows[:, np.newaxis, :] - P[np.newaxis, :, :]) ** 2).sum(axis=2))
+            # Upper triangle only: pair (i, j) with j > i
+            upper = np.arange(n)[np.newaxis, :] > np.arange(start, start + len(rows))[:, np.newaxis]
+            bins = np.searchsorted(radii, dist[upper], side='right')
+            histogram += np.bincount(bins, minlength=len(radii) + 1)
+        return np.cumsum(histogram)[:len(radii)].astype(np.float64)
+
+    # 2-D fields
+
+    def _field_threshold(self, field: np.ndarray) -> float:
+        """Mean of the field, accumulated tile by tile"""
+        rows = self._tile_rows(field.shape[1])
+        total = 0.0
+        for start in range(0, field.shape[0], rows):
+            total += float(np.asarray(field[start:start + rows], dtype=np.float64).sum())
+        return total / field.size
+
+    def _tile_rows(self, n_cols: int) -> int:
+        """Largest power-of-two row count whose tile fits the memory budget"""
+        rows = max(1, self.max_tile_bytes // (8 * max(n_cols, 1)))
+        return 1 << (rows.bit_length() - 1)
+
+    @staticmethod
+    def _coarsen(occupied: np.ndarray) -> np.ndarray:
+        """Merge 2x2 boxes of an occupancy grid (padding odd edges with empty cells)"""
+        h, w = occupied.shape
+        if h % 2 or w % 2:
+            occupied = np.pad(occupied, ((0, h % 2), (0, w % 2)))
+        h, w = occupied.shape
+        return occupied.reshape(h // 2, 2, w // 2, 2).any(axis=(1, 3))
+
+    def box_counting_field(self, field: np.ndarray, threshold: Optional[float] = None,
+                           min_boxes: int = 4) -> Dict[str, Any]:
+        """
+        Box-counting dimension of the set {field > threshold}
+
+        Tiles of rows are thresholded and reduced to an occupancy pyramid; tile
+        heights are powers of two so boxes never straddle tiles and counts add.
+        The per-tile tops are stacked and reduced further for the largest boxes.
+
+        Args:
+            field: 2-D array or memmap
+            threshold: Occupancy threshold (defaults to the field mean)
+            min_boxes: Scales with fewer occupied boxes are excluded from the fit
+
+        Returns:
+            Dict with dimension, fit quality, occupied fraction and box counts per scale
+        """
+        with self._span("box_counting_field"):
+            n_rows, n_cols = field.shape
+            if threshold is None:
+                threshold = self._field_threshold(field)
+            max_level = int(np.floor(np.log2(min(n_rows, n_cols))))
+            tile_rows = min(self._tile_rows(n_cols), 1 << max_level)
+            tile_level = tile_rows.bit_length() - 1
+
+            counts = np.zeros(max_level + 1, dtype=np.int64)
+            tops = []
+            for start in range(0, n_rows, tile_rows):
+                occupied = np.asarray(field[start:start + tile_rows]) > threshold
+                if len(occupied) < tile_rows:
+                    occupied = np.pad(occupied, ((0, tile_rows - len(occupied)), (0, 0)))
+                counts[0] += int(occupied.sum())
+                for level in range(1, tile_level + 1):
+                    occupied = self._coarsen(occupied)
+                    counts[level] += int(occupied.sum())
+                tops.append(occupied)
+
+            occupied = np.vstack(tops)
+            for level in range(tile_level + 1, max_level + 1):
+                occupied = self._coarsen(occupied)
+                counts[level] = int(occupied.sum())
+
+            sizes = 2.0 ** np.arange(max_level + 1)
+            usable = counts >= min_boxes
+            fit = _fit_scaling(np.log(1.0 / sizes[usable]), np.log(np.maximum(counts[usable], 1)))
+
+        return {
+            "dimension": round(fit["slope"], 4) if usable.sum() >= 2 else None,
+            "r_squared": round(fit["r_squared"], 4),
+            "scales_fitted": fit["points"],
+            "threshold": float(threshold),
+            "occupied_fraction": round(counts[0] / field.size, 6),
+            "box_sizes": sizes.tolist(),
+            "box_counts": counts.tolist()
+        }
+
+    def field_points(self, field: np.ndarray, threshold: Optional[float] = None,
+                     max_points: int = 5000, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Uniform sample of occupied cell coordinates, for correlation_dimension
+
+        Two tiled passes: one counts occupied cells, one samples them at the
+        rate that yields about max_points.
+        """
+        if threshold is None:
+            threshold = self._field_threshold(field)
+        rows = self._tile_rows(field.shape[1])
+        occupied_total = sum(int((np.asarray(field[s:s + rows]) > threshold).sum())
+                             for s in range(0, field.shape[0], rows))
+        rate = min(1.0, max_points / max(occupied_total, 1))
+
+        rng = np.random.default_rng(seed)
+        sample = []
+        for start in range(0, field.shape[0], rows):
+            cells = np.argwhere(np.asarray(field[start:start + rows]) > threshold)
+            cells = cells[rng.random(len(cells)) < rate]
+            cells[:, 0] += start
+            sample.append(cells)
+        return np.vstack(sample).astype(np.float64) if sample else np.empty((0, 2))
+
+    # Networks
+
+    def network_box_covering(self, network, max_nodes: int = 5000, n_orderings: int = 4,
+                             seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Box-covering dimension of a graph (Song et al. greedy colouring)
+
+        Two nodes may share a box of size l_B when their distance is below
+        l_B. Nodes are coloured greedily once, for every box size at the same
+        time, against the all-pairs distance matrix; the number of colours at
+        size l_B is the box count N_B. The fit reports whether N_B decays as a
+        power of l_B (fractal) or exponentially (small-world).
+
+        Args:
+            network: NetworkX graph (the largest connected component is used)
+            max_nodes: Larger components are reduced to a BFS ball of this size
+            n_orderings: Random node orders tried by the greedy colouring
+        """
+        import networkx as nx
+
+        with self._span("network_box_covering"):
+            component = max(nx.connected_components(network), key=len)
+            graph = network.subgraph(component)
+            if len(graph) > max_nodes:
+                nodes = list(graph.nodes())
+                root = nodes[np.random.default_rng(seed).integers(len(nodes))]
+                ball = list(nx.single_source_shortest_path_length(graph, root))[:max_nodes]
+                self.logger.warning(f"Box covering restricted to a {max_nodes}-node BFS ball")
+                graph = graph.subgraph(ball)
+
+            distances = self._distance_matrix(graph)
+            n = len(distances)
+            diameter = int(distances[np.isfinite(distances)].max())
+            box_sizes = np.arange(1, diameter + 2)
+
+            rng = np.random.default_rng(seed)
+            box_counts = np.full(len(box_sizes), n, dtype=np.int64)
+            for _ in range(n_orderings):
+                order = rng.permutation(n)
+                box_counts = np.minimum(box_counts, self._greedy_box_counts(distances[np.ix_(order, order)], box_sizes))
+            # A covering with boxes of size l_B is also valid for every larger size
+            box_counts = np.minimum.accumulate(box_counts)
+
+            usable = box_counts > 1
+            log_counts = np.log(box_counts[usable])
+            fractal_fit = _fit_scaling(np.log(box_sizes[usable]), log_counts)
+            exponential_fit = _fit_scaling(box_sizes[usable].astype(np.float64), log_counts)
+            is_fractal = fractal_fit["r_squared"] >= exponential_fit["r_squared"]
+
+        return {
+            "dimension": round(-fractal_fit["slope"], 4) if usable.sum() >= 2 else None,
+            "r_squared": round(fractal_fit["r_squared"], 4),
+            "exponential_r_squared": round(exponential_fit["r_squared"], 4),
+            "scaling": "fractal" if is_fractal else "small_world",
+            "nodes_covered": n,
+            "diameter": diameter,
+            "box_sizes": box_sizes.tolist(),
+            "box_counts": box_counts.tolist()
+        }
+
+    @staticmethod
+    def _greedy_box_counts(distances: np.ndarray, box_sizes: np.ndarray) -> np.ndarray:
+        """Colours used by one greedy pass, per box size"""
+        n = len(distances)
+        colors = np.zeros((n, len(box_sizes)), dtype=np.int64)
+        for i in range(1, n):
+            # conflict[b, j]: earlier node j is too far from i to share a box of size b
+            conflict = distances[i, :i][np.newaxis, :] >= box_sizes[:, np.newaxis]
+            used = np.zeros((len(box_sizes), i + 1), dtype=bool)
+            b, j = np.nonzero(conflict)
+            used[b, colors[j, b]] = True
+            colors[i] = np.argmin(used, axis=1)
+        return colors.max(axis=0) + 1
+
+    def _distance_matrix(self, graph) -> np.ndarray:
+        """Dense all-pairs hop distances (inf between components)"""
+        import networkx as nx
+
+        if shortest_path is not None:
+            adjacency = nx.to_scipy_sparse_array(graph, weight=None, format="csr")
+            return shortest_path(adjacency, method="D", unweighted=True, directed=False)
+
+        index = {node: i for i, node in enumerate(graph.nodes())}
+        distances = np.full((len(index), len(index)), np.inf)
+        for source, lengths in nx.all_pairs_shortest_path_length(graph):
+            row = distances[index[source]]
+            for target, length in lengths.items():
+                row[index[target]] = length
+        return distances
+
+
+def _confidence_label(r_squared: float) -> str:
+    if r_squared >= 0.98:
+        return "High"
+    if r_squared >= 0.9:
+        return "Medium"
+    return "Low"
+
+
+# Integration function for Filament
+def analyze_fractal_patterns(points: Optional[np.ndarray] = None, field: Optional[np.ndarray] = None,
+                             network=None, tracer=None) -> Dict[str, Any]:
+    """
+    Fractal analysis in the Filament pattern structure
+
+    Produces entries shaped like the reference cases' fractal_patterns_detected
+    section for every input provided.
+    """
+    analyzer = FractalAnalyzer(tracer=tracer)
+    details = {}
+    patterns = []
+
+    if points is not None:
+        details["point_box_counting"] = analyzer.box_counting_points(points)
+        details["point_correlation"] = analyzer.correlation_dimension(points, seed=0)
+    if field is not None:
+        details["field_box_counting"] = analyzer.box_counting_field(field)
+        details["field_correlation"] = analyzer.correlation_dimension(analyzer.field_points(field, seed=0), seed=0)
+    if network is not None:
+        details["network_box_covering"] = analyzer.network_box_covering(network, seed=0)
+
+    for measure, result in details.items():
+        if result["dimension"] is None:
+            continue
+        if measure == "network_box_covering" and result["scaling"] != "fractal":
+            continue
+        patterns.append({
+            "pattern_type": "self_similarity",
+            "description": f"{measure.replace('_', ' ')} dimension {result['dimension']}",
+            "confidence": _confidence_label(result["r_squared"]),
+            "scale_range": f"{result['scales_fitted']} scales",
+            "estimated_fractal_dimension": result["dimension"]
+        })
+
+    confidences = [d["r_squared"] for d in details.values() if d["dimension"] is not None]
+    return {
+        "pattern_found": bool(patterns),
+        "analysis_type": "fractal_dimension",
+        "details": details,
+        "fractal_patterns_detected": patterns,
+        "confidence": round(min(0.95, float(np.mean(confidences))), 3) if confidences else 0.0,
+        "evidence": ", ".join(p["description"] for p in patterns) or "No self-similar scaling detected"
+    }
+
+
+if __name__ == "__main__":
+    import networkx as nx
+
+    rng = np.random.default_rng(3)
+    # Sierpinski triangle via the chaos game: D = log 3 / log 2 ~ 1.585
+    corners = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, np.sqrt(3) / 2]])
+    sierpinski = np.empty((100_000, 2))
+    p = np.array([0.1, 0.1])
+    for i, corner in enumerate(rng.integers(0, 3, len(sierpinski))):
+        p = (p + corners[corner]) / 2.0
+        sierpinski[i] = p
+
+    # Random field with a fractal-ish level set
+    field = rng.standard_normal((1024, 1024)).cumsum(axis=0).cumsum(axis=1)
+
+    result = analyze_fractal_patterns(points=sierpinski, field=field,
+                                      network=nx.watts_strogatz_graph(400, 4, 0.05, seed=1))
+    print("Fractal Analysis Results:")
+    print("=" * 50)
+    for measure, details in result["details"].items():
+        print(f"{measure}: dimension={details['dimension']} r2={details['r_squared']}")
+    print(f"Network scaling: {result['details']['network_box_covering']['scaling']}")
+    print(result["evidence"])
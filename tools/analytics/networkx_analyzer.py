@@ -4,14 +4,48 @@
 import networkx as nx
 import numpy as np
 import random
+import time
+from contextlib import nullcontext
 from typing import Dict, List, Tuple, Any
 import logging
 
+from bootstrap import Bootstrap, weighted_confidence
+
+# Node sample behind the first (cheapest) anytime estimates
+ANYTIME_ESTIMATE_NODES = 16
+
+# Sections whose precision makes up the overall anytime precision
+ANYTIME_SECTIONS = ("network_motifs", "clustering_analysis", "connectivity_patterns", "information_flow")
+
+
 class NetworkXAnalyzer:
     """Real network analysis using NetworkX for EEP signature detection"""
     
-    def __init__(self):
+    def __init__(self, tracer=None, power_law_detection: bool = False, fractal_detection: bool = False,
+                 seed: int = None, bootstrap_resamples: int = 0, weighted: bool = False,
+                 n_workers: int = None, time_budget: float = None):
         self.logger = logging.getLogger(__name__)
+        # Optional tracing.Tracer; each analysis section becomes a child span
+        self.tracer = tracer
+        # Fit the degree distribution with power_law.fit_power_law in _analyze_connectivity
+        self.power_law_detection = power_law_detection
+        # Add a fractal_analysis section (box-covering dimension of the network)
+        self.fractal_detection = fractal_detection
+        # Seed for the generated test network; None draws a fresh network each run
+        self.seed = seed
+        # Node resamples per analysis for bootstrap intervals (0 disables)
+        self.bootstrap_resamples = bootstrap_resamples
+        self._bootstrap = None
+        # Add a weighted_analysis section (edge weights as connection strengths)
+        self.weighted = weighted
+        # Worker processes for the weighted shortest-path sources
+        self.n_workers = n_workers
+        # Seconds for the whole analysis; sections then refine estimates
+        # progressively and report their precision (None = exact, unbounded)
+        self.time_budget = time_budget
+
+    def _span(self, name: str):
+        return self.tracer.span(name) if self.tracer else nullcontext()
         
     def detect_distributed_intelligence_patterns(self, data_snippet: str = None) -> Dict[str, Any]:
         """
@@ -21,14 +55,33 @@ class NetworkXAnalyzer:
         In production, this would analyze actual network data from the input.
         """
         # Generate a realistic test network (in production, parse from data_snippet)
-        network = self._generate_test_network()
+        with self._span("generate_network"):
+            network = self._generate_test_network()
+        return self.analyze_network(network)
+
+    def analyze_network(self, network: nx.Graph) -> Dict[str, Any]:
+        """Run every analysis section on a network"""
+        if self.bootstrap_resamples:
+            # One seed for the whole run, so every section sees the same node resamples
+            seed = self.seed if self.seed is not None else np.random.SeedSequence().entropy
+            self._bootstrap = Bootstrap(self.bootstrap_resamples, seed=seed)
+        if self.time_budget is not None:
+            return self._analyze_anytime(network)
         
-        results = {
-            "network_motifs": self._analyze_network_motifs(network),
-            "clustering_analysis": self._analyze_clustering(network),
-            "connectivity_patterns": self._analyze_connectivity(network),
-            "information_flow": self._analyze_information_flow(network)
-        }
+        results = {}
+        with self._span("network_motifs"):
+            results["network_motifs"] = self._analyze_network_motifs(network)
+        with self._span("clustering_analysis"):
+            results["clustering_analysis"] = self._analyze_clustering(network)
+        with self._span("connectivity_patterns"):
+            results["connectivity_patterns"] = self._analyze_connectivity(network)
+        with self._span("information_flow"):
+            results["information_flow"] = self._analyze_information_flow(network)
+        if self.weighted:
+            with self._span("weighted_analysis"):
+                results["weighted_analysis"] = self._analyze_weighted(network)
+        if self.fractal_detection:
+            results["fractal_analysis"] = self._analyze_fractal(network)
         
         return results
     
@@ -39,11 +92,12 @@ class NetworkXAnalyzer:
         k_neighbors = 6
         rewiring_prob = 0.3
         
-        network = nx.watts_strogatz_graph(n_nodes, k_neighbors, rewiring_prob)
+        network = nx.watts_strogatz_graph(n_nodes, k_neighbors, rewiring_prob, seed=self.seed)
         
         # Add some random weights to edges (representing connection strength)
+        rng = random.Random(self.seed)
         for u, v in network.edges():
-            network[u][v]['weight'] = random.uniform(0.1, 1.0)
+            network[u][v]['weight'] = rng.uniform(0.1, 1.0)
             
         return network
     
@@ -55,13 +109,29 @@ class NetworkXAnalyzer:
         n_edges = network.number_of_edges()
         density = nx.density(network)
         
+        nodes = list(network)
+        node_clustering = None
+        node_path_length = None
+        random_clustering = random_path_length = 0.0
+
         # Small-world properties
         try:
-            avg_clustering = nx.average_clustering(network)
-            avg_path_length = nx.average_shortest_path_length(network)
+            if self._bootstrap is not None:
+                clustering = nx.clustering(network)
+                node_clustering = np.array([clustering[v] for v in nodes])
+                avg_clustering = float(node_clustering.mean()) if n_nodes else 0.0
+                if not nx.is_connected(network):
+                    raise nx.NetworkXError("Graph is not connected.")
+                # Per-node mean distance; its mean is the average shortest path length
+                node_path_length = np.array([sum(nx.single_source_shortest_path_length(network, v).values())
+                                             for v in nodes]) / (n_nodes - 1)
+                avg_path_length = float(node_path_length.mean())
+            else:
+                avg_clustering = nx.average_clustering(network)
+                avg_path_length = nx.average_shortest_path_length(network)
             
             # Compare to random network for small-world coefficient
-            random_net = nx.erdos_renyi_graph(n_nodes, density)
+            random_net = nx.erdos_renyi_graph(n_nodes, density, seed=self.seed)
             random_clustering = nx.average_clustering(random_net)
             random_path_length = nx.average_shortest_path_length(random_net)
             
@@ -75,12 +145,14 @@ class NetworkXAnalyzer:
             # Handle disconnected networks
             avg_clustering = nx.average_clustering(network)
             avg_path_length = float('inf')
+            node_path_length = None
             sigma = 0.0
         
         # Determine network type based on properties
         network_type = self._classify_network_type(avg_clustering, avg_path_length, sigma)
+        confidence = self._calculate_confidence(network_type, avg_clustering, sigma)
         
-        return {
+        results = {
             "type": network_type,
             "nodes": n_nodes,
             "edges": n_edges,
@@ -88,7 +160,48 @@ class NetworkXAnalyzer:
             "avg_clustering": round(avg_clustering, 3),
             "avg_path_length": round(avg_path_length, 2) if avg_path_length != float('inf') else "disconnected",
             "small_world_coefficient": round(sigma, 3),
-            "confidence": self._calculate_confidence(network_type, avg_clustering, sigma)
+            "confidence": confidence
+        }
+        if self._bootstrap is not None and node_path_length is not None:
+            results.update(self._bootstrap_motifs(node_clustering, node_path_length, random_clustering,
+                                                  random_path_length, network_type, avg_clustering,
+                                                  avg_path_length, sigma, confidence))
+        elif self._bootstrap is not None and node_clustering is not None:
+            replicates = self._bootstrap.node_replicates({"c": node_clustering}, {"c": lambda s: s["c"].mean(axis=1)})
+            results["intervals"] = {"avg_clustering": self._bootstrap.interval(avg_clustering, replicates["c"])}
+
+        return results
+
+    def _bootstrap_motifs(self, node_clustering: np.ndarray, node_path_length: np.ndarray,
+                          random_clustering: float, random_path_length: float, network_type: str,
+                          avg_clustering: float, avg_path_length: float, sigma: float,
+                          confidence: float) -> Dict[str, Any]:
+        """
+        Node-bootstrap intervals for the small-world metrics and the classification
+
+        Clustering and path length are resampled as paired per-node values;
+        the random reference network is held fixed. Each resample is
+        classified and scored exactly like the observed network.
+        """
+        replicates = self._bootstrap.node_replicates(
+            {"c": node_clustering, "l": node_path_length},
+            {"c": lambda s: s["c"].mean(axis=1), "l": lambda s: s["l"].mean(axis=1)})
+        c, l = replicates["c"], replicates["l"]
+        if random_clustering > 0 and random_path_length > 0:
+            sigmas = (c / random_clustering) / (l / random_path_length)
+        else:
+            sigmas = np.ones_like(c)
+        types = [self._classify_network_type(ci, li, si) for ci, li, si in zip(c, l, sigmas)]
+        confidences = np.array([self._calculate_confidence(t, ci, si) for t, ci, si in zip(types, c, sigmas)])
+        interval = self._bootstrap.interval
+        return {
+            "type_agreement": round(float(np.mean([t == network_type for t in types])), 3),
+            "intervals": {
+                "avg_clustering": interval(avg_clustering, c),
+                "avg_path_length": interval(avg_path_length, l),
+                "small_world_coefficient": interval(sigma, sigmas),
+                "confidence": interval(confidence, confidences)
+            }
         }
     
     def _classify_network_type(self, clustering: float, path_length: float, sigma: float) -> str:
@@ -123,18 +236,36 @@ class NetworkXAnalyzer:
         """Analyze clustering properties in detail"""
         
         clustering_coeffs = list(nx.clustering(network).values())
-        
-        return {
-            "global_clustering": round(nx.average_clustering(network), 3),
+        global_clustering = nx.average_clustering(network)
+        return self._summarize_clustering(clustering_coeffs, global_clustering, len(clustering_coeffs))
+
+    def _summarize_clustering(self, clustering_coeffs: List[float], global_clustering: float,
+                              n_nodes: int) -> Dict[str, Any]:
+        """Clustering section from per-node coefficients (all nodes, or a sample of n_nodes)"""
+        high = len([c for c in clustering_coeffs if c > 0.7])
+        results = {
+            "global_clustering": round(global_clustering, 3),
             "clustering_distribution": {
                 "mean": round(np.mean(clustering_coeffs), 3),
                 "std": round(np.std(clustering_coeffs), 3),
                 "min": round(min(clustering_coeffs), 3),
                 "max": round(max(clustering_coeffs), 3)
             },
-            "high_clustering_nodes": len([c for c in clustering_coeffs if c > 0.7]),
+            "high_clustering_nodes": high if n_nodes == len(clustering_coeffs)
+                                     else int(round(high * n_nodes / len(clustering_coeffs))),
             "interpretation": self._interpret_clustering(np.mean(clustering_coeffs))
         }
+        if self._bootstrap is not None and clustering_coeffs:
+            replicates = self._bootstrap.node_replicates(
+                {"c": clustering_coeffs}, {"c": lambda s: s["c"].mean(axis=1)})["c"]
+            results["intervals"] = {
+                "global_clustering": self._bootstrap.interval(global_clustering, replicates),
+                # Confidence of the clustering-structure signature pattern
+                "structure_confidence": self._bootstrap.interval(
+                    min(0.9, 0.5 + global_clustering), np.minimum(0.9, 0.5 + replicates))
+            }
+
+        return results
     
     def _interpret_clustering(self, avg_clustering: float) -> str:
         """Interpret clustering coefficient values"""
@@ -145,7 +276,7 @@ class NetworkXAnalyzer:
         else:
             return "Low clustering, more random connectivity patterns"
     
-    def _analyze_connectivity(self, network: nx.Graph) -> Dict[str, Any]:
+    def _analyze_connectivity(self, network: nx.Graph, power_law: bool = None) -> Dict[str, Any]:
         """Analyze connectivity patterns and degree distribution"""
         
         degrees = [d for n, d in network.degree()]
@@ -157,7 +288,7 @@ class NetworkXAnalyzer:
         
         hubs = [n for n, d in network.degree() if d > hub_threshold]
         
-        return {
+        results = {
             "degree_distribution": {
                 "mean": round(mean_degree, 2),
                 "std": round(std_degree, 2),
@@ -166,9 +297,65 @@ class NetworkXAnalyzer:
             },
             "hub_nodes": len(hubs),
             "hub_threshold": round(hub_threshold, 1),
-            "connectivity_pattern": self._classify_connectivity(degrees)
+            "connectivity_pattern": self._classify_connectivity(degrees),
+            "confidence": round(float(self._connectivity_confidence(
+                std_degree / mean_degree if mean_degree > 0 else 0.0)), 3)
         }
+        if self.power_law_detection if power_law is None else power_law:
+            from power_law import fit_power_law
+            results["power_law"] = fit_power_law(degrees, discrete=True)
+        if self._bootstrap is not None and degrees:
+            results.update(self._bootstrap_connectivity(degrees, mean_degree, std_degree,
+                                                        results["connectivity_pattern"], results["confidence"]))
+
+        return results
     
+    def _bootstrap_connectivity(self, degrees: List[int], mean_degree: float, std_degree: float,
+                                pattern: str, confidence: float) -> Dict[str, Any]:
+        """
+        Node-bootstrap intervals for the degree distribution and the pattern confidence
+
+        Also reports how often resamples are classified like the observed
+        network (classification_agreement). It is kept apart from the
+        pattern confidence: an agreement fraction is usually exactly 1.0,
+        and its Monte Carlo error of 0 would dominate precision weighting.
+        """
+        replicates = self._bootstrap.node_replicates(
+            {"k": degrees}, {"mean": lambda s: s["k"].mean(axis=1), "std": lambda s: s["k"].std(axis=1)})
+        means, stds = replicates["mean"], replicates["std"]
+        cv = np.divide(stds, means, out=np.zeros_like(means), where=means > 0)
+        labels = np.where(cv > 1.0, "scale_free_like", np.where(cv > 0.5, "heterogeneous", "homogeneous"))
+        agreement = float(np.mean(labels == pattern))
+        error = np.sqrt(agreement * (1.0 - agreement) / len(labels))
+        return {
+            "classification_agreement": round(agreement, 3),
+            "intervals": {
+                "degree_mean": self._bootstrap.interval(mean_degree, means),
+                "degree_std": self._bootstrap.interval(std_degree, stds),
+                "confidence": self._bootstrap.interval(confidence, self._connectivity_confidence(cv)),
+                "classification_agreement": {
+                    "estimate": round(agreement, 4),
+                    "low": round(max(0.0, agreement - 1.96 * error), 4),
+                    "high": round(min(1.0, agreement + 1.96 * error), 4),
+                    "std": round(float(error), 4),
+                    "confidence": self._bootstrap.confidence,
+                    "resamples": len(labels),
+                    "method": "resample_agreement"
+                }
+            }
+        }
+
+    @staticmethod
+    def _connectivity_confidence(cv):
+        """
+        Confidence in the connectivity class from the degree coefficient of variation
+
+        Grows with the distance of cv from the nearest class boundary (0.5 and
+        1.0 in _classify_connectivity); works elementwise on bootstrap replicates.
+        """
+        margin = np.minimum(np.abs(np.asarray(cv) - 0.5), np.abs(np.asarray(cv) - 1.0))
+        return np.minimum(0.9, 0.5 + margin)
+
     def _classify_connectivity(self, degrees: List[int]) -> str:
         """Classify connectivity pattern based on degree distribution"""
         
@@ -196,13 +383,207 @@ class NetworkXAnalyzer:
         high_betweenness_nodes = [n for n, b in betweenness.items() if b > 0.1]
         high_closeness_nodes = [n for n, c in closeness.items() if c > 0.6]
         
-        return {
+        results = {
             "information_bottlenecks": len(high_betweenness_nodes),
             "well_connected_nodes": len(high_closeness_nodes),
             "max_betweenness": round(max(betweenness.values()), 3),
             "avg_closeness": round(np.mean(list(closeness.values())), 3),
             "flow_efficiency": self._calculate_flow_efficiency(betweenness, closeness)
         }
+        if self._bootstrap is not None:
+            nodes = list(network)
+            replicates = self._bootstrap.node_replicates(
+                {"b": [betweenness[v] for v in nodes], "c": [closeness[v] for v in nodes]},
+                {"max_betweenness": lambda s: s["b"].max(axis=1),
+                 "avg_closeness": lambda s: s["c"].mean(axis=1),
+                 "flow_efficiency": lambda s: s["c"].mean(axis=1) * (1 - np.minimum(s["b"].max(axis=1), 0.5))})
+            results["intervals"] = {name: self._bootstrap.interval(results[name], values)
+                                    for name, values in replicates.items()}
+
+        return results
+    
+    def _analyze_weighted(self, network: nx.Graph) -> Dict[str, Any]:
+        """Weighted clustering, strengths, Dijkstra path lengths and centralities"""
+        from weighted_graph import analyze_weighted_network
+
+        return analyze_weighted_network(network, weight="weight", n_workers=self.n_workers,
+                                        bootstrap=self._bootstrap)
+    
+    def _analyze_anytime(self, network: nx.Graph) -> Dict[str, Any]:
+        """
+        Deadline-aware analysis within self.time_budget seconds
+
+        1. Every section gets a cheap estimate from a small node sample
+           (connectivity is exact at this stage: it only needs degrees).
+        2. The exact section methods run, cheapest first, when the per-node
+           cost measured on the sample predicts they finish in time.
+        3. Sections still without an exact result are refined on a growing
+           node sample until the deadline.
+        Each section carries its "precision"; an "anytime" entry summarizes
+        the run. Work never blocks past the budget by more than the single
+        batch or exact call in progress when it runs out.
+        """
+        from anytime import Deadline, lowest_precision
+
+        # Load every module the run may need before the clock starts, so a
+        # cold first call does not spend its budget on imports
+        import weighted_graph  # noqa: F401
+        if self.power_law_detection:
+            import power_law  # noqa: F401
+        if self.fractal_detection:
+            import fractal_analyzer  # noqa: F401
+
+        deadline = Deadline(self.time_budget)
+        sample = _NetworkSample(network, self.seed)
+        n_nodes = network.number_of_nodes()
+
+        with self._span("anytime_estimate"):
+            sample.refine(deadline, max_items=ANYTIME_ESTIMATE_NODES)
+            results = self._sampled_sections(network, sample, "estimate")
+            results["connectivity_patterns"] = self._analyze_connectivity(network, power_law=False)
+            results["connectivity_patterns"]["precision"] = "estimate" if self.power_law_detection else "exact"
+
+        # Exact clustering touches each node's neighbourhood once; exact
+        # centralities and path lengths need a search from every node (twice:
+        # betweenness and closeness, or the network and its random reference)
+        costs = {
+            "clustering_analysis": sample.clustering_cost * n_nodes,
+            "information_flow": 2 * sample.path_cost * n_nodes,
+            "network_motifs": 2 * (sample.clustering_cost + sample.path_cost) * n_nodes
+        }
+        methods = {
+            "clustering_analysis": self._analyze_clustering,
+            "information_flow": self._analyze_information_flow,
+            "network_motifs": self._analyze_network_motifs
+        }
+        for section in sorted(costs, key=costs.get):
+            if deadline.fits(costs[section]):
+                with self._span(section):
+                    results[section] = methods[section](network)
+                results[section]["precision"] = "exact"
+
+        pending = [section for section in costs if results[section]["precision"] != "exact"]
+        if pending and not deadline.expired():
+            with self._span("anytime_sampled"):
+                sample.refine(deadline)
+                refined = self._sampled_sections(network, sample, "sampled")
+            for section in pending:
+                results[section] = refined[section]
+
+        if self.power_law_detection and not deadline.expired():
+            from power_law import fit_power_law
+            results["connectivity_patterns"]["power_law"] = fit_power_law(
+                [d for _, d in network.degree()], discrete=True)
+            results["connectivity_patterns"]["precision"] = "exact"
+
+        skipped = []
+        for section, enabled, run in (("weighted_analysis", self.weighted, self._analyze_weighted),
+                                      ("fractal_analysis", self.fractal_detection, self._analyze_fractal)):
+            if not enabled:
+                continue
+            if deadline.expired():
+                skipped.append(section)
+                continue
+            with self._span(section):
+                results[section] = run(network)
+
+        results["anytime"] = {
+            "time_budget": self.time_budget,
+            "elapsed": round(deadline.elapsed(), 3),
+            "budget_exhausted": deadline.expired(),
+            "precision": lowest_precision(results[section]["precision"] for section in ANYTIME_SECTIONS),
+            "sample_fraction": round(sample.fraction, 4),
+            "skipped_sections": skipped
+        }
+        return results
+
+    def _sampled_sections(self, network: nx.Graph, sample: "_NetworkSample", level: str) -> Dict[str, Any]:
+        """
+        Motif, clustering and information-flow sections from a node sample
+
+        Means are over the sampled nodes; counts are scaled to the whole
+        network. Betweenness is the Brandes sum over the sampled sources
+        scaled by n/k. The small-world reference uses the analytical
+        random-graph values C = density, L = ln n / ln <k>. With every node
+        sampled, clustering and information flow are exact.
+        """
+        from anytime import sample_standard_error
+
+        n_nodes = network.number_of_nodes()
+        k = sample.done
+        full = "exact" if sample.complete else level
+        node_clustering = np.asarray(sample.clustering)
+        distance_sum = np.asarray(sample.distance_sum)
+        reachable = np.asarray(sample.reachable)
+
+        n_edges = network.number_of_edges()
+        density = nx.density(network)
+        avg_clustering = float(node_clustering.mean()) if k else 0.0
+        node_path_length = None
+        random_clustering = random_path_length = 0.0
+        if n_nodes > 1 and k and np.all(reachable == n_nodes - 1):
+            node_path_length = distance_sum / (n_nodes - 1)
+            avg_path_length = float(node_path_length.mean())
+            mean_degree = 2.0 * n_edges / n_nodes
+            random_clustering = density
+            random_path_length = float(np.log(n_nodes) / np.log(mean_degree)) if mean_degree > 1 else 0.0
+            if random_clustering > 0 and random_path_length > 0:
+                sigma = (avg_clustering / random_clustering) / (avg_path_length / random_path_length)
+            else:
+                sigma = 1.0
+        else:
+            avg_path_length = float('inf')
+            sigma = 0.0
+        network_type = self._classify_network_type(avg_clustering, avg_path_length, sigma)
+        confidence = self._calculate_confidence(network_type, avg_clustering, sigma)
+        motifs = {
+            "type": network_type,
+            "nodes": n_nodes,
+            "edges": n_edges,
+            "density": round(density, 3),
+            "avg_clustering": round(avg_clustering, 3),
+            "avg_path_length": round(avg_path_length, 2) if avg_path_length != float('inf') else "disconnected",
+            "small_world_coefficient": round(sigma, 3),
+            "confidence": confidence,
+            "precision": level,
+            "sampled_nodes": k,
+            "reference": "analytical",
+            "standard_error": {
+                "avg_clustering": sample_standard_error(node_clustering, n_nodes),
+                "avg_path_length": sample_standard_error(node_path_length, n_nodes)
+                if node_path_length is not None else None
+            }
+        }
+        if self._bootstrap is not None and node_path_length is not None:
+            motifs.update(self._bootstrap_motifs(node_clustering, node_path_length, random_clustering,
+                                                 random_path_length, network_type, avg_clustering,
+                                                 avg_path_length, sigma, confidence))
+
+        clustering = self._summarize_clustering(list(node_clustering), avg_clustering, n_nodes)
+        clustering["precision"] = full
+        clustering["sampled_nodes"] = k
+
+        scale = n_nodes / k / ((n_nodes - 1) * (n_nodes - 2)) if n_nodes > 2 and k else 0.0
+        betweenness = sample.betweenness * scale
+        with np.errstate(divide="ignore", invalid="ignore"):
+            closeness = np.where(distance_sum > 0,
+                                 reachable / distance_sum * (reachable / max(n_nodes - 1, 1)), 0.0)
+        max_betweenness = float(betweenness.max()) if n_nodes else 0.0
+        avg_closeness = float(closeness.mean()) if k else 0.0
+        information_flow = {
+            "information_bottlenecks": int(np.sum(betweenness > 0.1)),
+            "well_connected_nodes": int(round(float(np.mean(closeness > 0.6)) * n_nodes)) if k else 0,
+            "max_betweenness": round(max_betweenness, 3),
+            "avg_closeness": round(avg_closeness, 3),
+            "flow_efficiency": round(avg_closeness * (1 - min(max_betweenness, 0.5)), 3),
+            "precision": full,
+            "sampled_sources": k
+        }
+        return {"network_motifs": motifs, "clustering_analysis": clustering, "information_flow": information_flow}
+
+    def _analyze_fractal(self, network: nx.Graph) -> Dict[str, Any]:
+        from fractal_analyzer import FractalAnalyzer
+        return FractalAnalyzer(tracer=self.tracer).network_box_covering(network, seed=0)
     
     def _calculate_flow_efficiency(self, betweenness: Dict, closeness: Dict) -> float:
         """Calculate overall information flow efficiency"""
@@ -216,28 +597,196 @@ class NetworkXAnalyzer:
         
         return round(efficiency, 3)
 
+class _NetworkSample:
+    """
+    Per-node clustering and single-source shortest paths over a growing
+    random node sample (anytime mode)
+
+    Searches are unweighted, like the exact sections, and accumulate
+    Brandes betweenness from each sampled source.
+    """
+
+    def __init__(self, network: nx.Graph, seed: int = None):
+        from anytime import ProgressiveSample
+        from weighted_graph import WeightedGraph
+
+        self.network = network
+        self.nodes = list(network)
+        self.graph = WeightedGraph.from_networkx(network, weight=None, distance="weight")
+        self.order = ProgressiveSample(list(range(len(self.nodes))), seed, first_batch=4)
+        self.clustering: List[float] = []
+        self.distance_sum: List[float] = []
+        self.reachable: List[int] = []
+        self.betweenness = np.zeros(len(self.nodes))
+        self.clustering_seconds = 0.0
+        self.path_seconds = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.order.done
+
+    @property
+    def complete(self) -> bool:
+        return self.order.complete
+
+    @property
+    def fraction(self) -> float:
+        return self.order.fraction
+
+    @property
+    def clustering_cost(self) -> float:
+        """Measured seconds per node for the clustering coefficient"""
+        return self.clustering_seconds / self.done if self.done else float("inf")
+
+    @property
+    def path_cost(self) -> float:
+        """Measured seconds per source for the shortest-path search"""
+        return self.path_seconds / self.done if self.done else float("inf")
+
+    def refine(self, deadline=None, max_items: int = None) -> int:
+        return self.order.advance(self._process, deadline, max_items)
+
+    def _process(self, batch: List[int]):
+        t0 = time.perf_counter()
+        clustering = nx.clustering(self.network, [self.nodes[i] for i in batch])
+        self.clustering.extend(clustering[self.nodes[i]] for i in batch)
+        t1 = time.perf_counter()
+        paths = self.graph.shortest_paths(batch, betweenness=True)
+        self.distance_sum.extend(paths["distance_sum"][batch])
+        self.reachable.extend(paths["reachable"][batch])
+        self.betweenness += paths["betweenness"]
+        t2 = time.perf_counter()
+        self.clustering_seconds += t1 - t0
+        self.path_seconds += t2 - t1
+
+
 # Integration function for Filament
-def analyze_distributed_intelligence_networkx(data_snippet: str, signature_template: Dict) -> Dict[str, Any]:
+def analyze_distributed_intelligence_networkx(data_snippet: str, signature_template: Dict,
+                                              tracer=None, seed: int = None,
+                                              bootstrap_resamples: int = 0,
+                                              weighted: bool = False,
+                                              time_budget: float = None) -> Dict[str, Any]:
     """
     NetworkX-based analysis function to replace the stub in Filament
     """
-    analyzer = NetworkXAnalyzer()
+    analyzer = NetworkXAnalyzer(tracer=tracer, seed=seed, bootstrap_resamples=bootstrap_resamples,
+                                weighted=weighted, time_budget=time_budget)
     results = analyzer.detect_distributed_intelligence_patterns(data_snippet)
+    details = {
+        "network_motifs": results["network_motifs"],
+        "clustering_analysis": results["clustering_analysis"], 
+        "connectivity_patterns": results["connectivity_patterns"],
+        "information_flow": results["information_flow"]
+    }
+    for section in ("weighted_analysis", "anytime"):
+        if section in results:
+            details[section] = results[section]
     
     # Format results to match expected Filament output structure
     return {
         "pattern_found": True,
         "analysis_type": "networkx_real_analysis",
-        "details": {
-            "network_motifs": results["network_motifs"],
-            "clustering_analysis": results["clustering_analysis"], 
-            "connectivity_patterns": results["connectivity_patterns"],
-            "information_flow": results["information_flow"]
-        },
+        "details": details,
         "confidence": results["network_motifs"]["confidence"],
         "evidence": f"Clustering: {results['network_motifs']['avg_clustering']}, Path length: {results['network_motifs']['avg_path_length']}, Network type: {results['network_motifs']['type']}"
     }
 
+def run_signature_scanning(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analysis plugin for the pattern_matching_and_detection procedure
+
+    Registered in tools/analysis_registry.py and imported only when a SOP step
+    with this analytical procedure is dispatched for a supported EEP.
+
+    Args:
+        context: Analysis context with query_data and ler_retrieved_data, and
+            optionally shared_features["network"] computed once for several EEPs
+
+    Returns:
+        Analysis results in the FilamentEvent.analysis_results structure
+    """
+    shared_features = context.get("shared_features") or {}
+    if "network" in shared_features:
+        details = shared_features["network"]
+    else:
+        # In production, test_data and signature_template come from the context
+        test_data = "sample network data"
+        signature_template = {"type": "network_analysis"}
+
+        query_data = context.get("query_data", {})
+        networkx_results = analyze_distributed_intelligence_networkx(
+            test_data, signature_template, tracer=context.get("tracer"),
+            seed=query_data.get("random_seed"),
+            bootstrap_resamples=query_data.get("bootstrap_resamples", 0),
+            weighted=bool(query_data.get("weighted_analysis")),
+            # Seconds left of the event's budget, passed by FilamentEvent
+            time_budget=context.get("time_budget", query_data.get("time_budget_seconds")))
+        details = networkx_results["details"]
+
+    # Extract key metrics
+    network_motifs = details["network_motifs"]
+    clustering_analysis = details["clustering_analysis"]
+    connectivity_patterns = details["connectivity_patterns"]
+
+    # Format results
+    patterns = [
+        {
+            "name": "Network Motifs",
+            "type": network_motifs["type"],
+            "confidence": network_motifs["confidence"],
+            "evidence": f"Clustering: {network_motifs['avg_clustering']}, Path length: {network_motifs['avg_path_length']}, Nodes: {network_motifs['nodes']}"
+        },
+        {
+            "name": "Clustering Analysis",
+            "type": "clustering_structure",
+            "confidence": min(0.9, 0.5 + clustering_analysis["global_clustering"]),
+            "evidence": clustering_analysis['interpretation']
+        },
+        {
+            "name": "Connectivity Patterns",
+            "type": connectivity_patterns["connectivity_pattern"],
+            "confidence": connectivity_patterns["confidence"],
+            "evidence": f"Hubs: {connectivity_patterns['hub_nodes']}, Pattern: {connectivity_patterns['connectivity_pattern']}"
+        }
+    ]
+    intervals = [
+        network_motifs.get("intervals", {}).get("confidence"),
+        clustering_analysis.get("intervals", {}).get("structure_confidence"),
+        connectivity_patterns.get("intervals", {}).get("confidence")
+    ]
+    for pattern, interval in zip(patterns, intervals):
+        if interval:
+            pattern["confidence_interval"] = interval
+    if "classification_agreement" in connectivity_patterns:
+        patterns[2]["classification_agreement"] = connectivity_patterns["classification_agreement"]
+    anytime = details.get("anytime")
+    if anytime:
+        sections = (network_motifs, clustering_analysis, connectivity_patterns)
+        for pattern, section in zip(patterns, sections):
+            pattern["precision"] = section["precision"]
+
+    overall_confidence, overall_interval = weighted_confidence([p["confidence"] for p in patterns], intervals)
+
+    results = {
+        "patterns_found": len(patterns),
+        "overall_confidence": round(overall_confidence, 2),
+        "status": "real_networkx_analysis_complete",
+        "patterns": patterns
+    }
+    if anytime:
+        # Best result within the time budget, flagged with its precision
+        results["precision"] = anytime["precision"]
+        results["anytime"] = anytime
+        if anytime["precision"] != "exact":
+            results["status"] = "real_networkx_analysis_partial"
+    if overall_interval:
+        results["overall_confidence_interval"] = overall_interval
+    if "weighted_analysis" in details:
+        results["weighted_analysis"] = details["weighted_analysis"]
+    return results
+
+run_signature_scanning.supported_eeps = ["EEP_DISTRIBUTED_INTELLIGENCE"]
+
 if __name__ == "__main__":
     # Test the analyzer
     analyzer = NetworkXAnalyzer()
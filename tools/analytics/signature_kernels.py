@@ -0,0 +1,110 @@
+# Signature Detection Kernels
+# File: tools/analytics/signature_kernels.py
+
+import numpy as np
+from typing import Dict, Any
+
+# Kernels measure the quantities named in a signature pattern's typical_values
+# from raw observations. Every kernel takes the observation batch (dict of
+# arrays with the batch on axis 0) and returns {typical_values key: (B,) array}
+# for the quantities it can measure; missing inputs yield no entry.
+
+
+def _batch(observations: Dict[str, Any], key: str, ndim: int):
+    """Observation array as float64 with a leading batch axis, or None"""
+    if key not in observations:
+        return None
+    values = np.asarray(observations[key], dtype=np.float64)
+    while values.ndim < ndim:
+        values = values[None]
+    return values
+
+
+def snr_gain(observations: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    SNR improvement of a filter: SNR_out / SNR_in
+
+    Observations:
+        signal: (B, T) clean reference signal
+        input: (B, T) noisy filter input
+        output: (B, T) filter output
+
+    SNR is var(signal) / var(x - signal) for each of input and output.
+    """
+    signal = _batch(observations, "signal", 2)
+    x_in = _batch(observations, "input", 2)
+    x_out = _batch(observations, "output", 2)
+    if signal is None or x_in is None or x_out is None or x_in.shape[-1] != signal.shape[-1]:
+        return {}
+    noise_in = (x_in - signal).var(axis=-1)
+    noise_out = (x_out - signal).var(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain = noise_in / noise_out
+    gain[~np.isfinite(gain)] = np.nan
+    return {"range": gain}
+
+
+def threshold_adaptation(observations: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Rate and settling time of threshold(t+1) = threshold(t) + a (signal(t) - threshold(t))
+
+    Observations:
+        threshold: (B, T) threshold trajectory
+        signal: (B, T) driving signal strength
+
+    The rate a is the per-row least-squares slope of the threshold update on
+    the error. Settling time is the number of updates until the threshold
+    stays within 5% of its total excursion of the final value, in time
+    constants (1 / a updates).
+    """
+    threshold = _batch(observations, "threshold", 2)
+    signal = _batch(observations, "signal", 2)
+    if threshold is None or signal is None or threshold.shape[-1] < 3 or signal.shape != threshold.shape:
+        return {}
+    step = np.diff(threshold, axis=-1)
+    error = signal[:, :-1] - threshold[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (step * error).sum(axis=-1) / (error * error).sum(axis=-1)
+
+    deviation = np.abs(threshold - threshold[:, -1:])
+    excursion = deviation.max(axis=-1, keepdims=True)
+    outside = deviation > 0.05 * excursion
+    # Last index outside the band, +1; rows that never leave the band settle at 0
+    last_outside = threshold.shape[-1] - np.argmax(outside[:, ::-1], axis=-1)
+    settled = np.where(outside.any(axis=-1), last_outside, 0)
+    settling = settled * rate
+
+    results = {"adaptation_rate": rate, "settling_time": settling}
+    for values in results.values():
+        values[~np.isfinite(values)] = np.nan
+    return results
+
+
+def differential_response(observations: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Gain applied to attended and unattended inputs
+
+    Observations:
+        input: (B, K) per-channel input amplitudes
+        output: (B, K) per-channel output amplitudes
+        attended: optional (B, K) bool mask; without it, channels with a gain
+            above the row median count as attended
+
+    Returns the mean gain over attended (enhancement_factor) and unattended
+    (suppression_factor) channels.
+    """
+    x_in = _batch(observations, "input", 2)
+    x_out = _batch(observations, "output", 2)
+    if x_in is None or x_out is None or x_in.shape != x_out.shape:
+        return {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain = np.where(x_in != 0, x_out / x_in, np.nan)
+    if "attended" in observations:
+        attended = np.broadcast_to(np.asarray(observations["attended"], dtype=bool), gain.shape)
+    else:
+        attended = gain > np.nanmedian(gain, axis=-1, keepdims=True)
+    valid = np.isfinite(gain)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        enhanced = np.where(attended & valid, gain, 0.0).sum(axis=-1) / (attended & valid).sum(axis=-1)
+        suppressed = np.where(~attended & valid, gain, 0.0).sum(axis=-1) / (~attended & valid).sum(axis=-1)
+    return {"enhancement_factor": enhanced, "suppression_factor": suppressed}
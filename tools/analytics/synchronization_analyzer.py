@@ -0,0 +1,380 @@
+# Synchronization Analysis Module (Kuramoto order parameter)
+# File: tools/analytics/synchronization_analyzer.py
+
+import numpy as np
+import logging
+from contextlib import nullcontext
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+
+from bootstrap import Bootstrap
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # dense adjacency still works without SciPy
+    sparse = None
+
+
+def load_phase_memmap(path: str, n_timesteps: int, n_oscillators: int,
+                      dtype: str = "float32") -> np.memmap:
+    """Open a raw (n_timesteps, n_oscillators) phase file without reading it into RAM"""
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n_timesteps, n_oscillators))
+
+
+class SynchronizationAnalyzer:
+    """
+    Vectorized synchronization measures for coupled-oscillator time series
+
+    Phases are 2-D arrays shaped (n_timesteps, n_oscillators), in radians.
+    Every measure walks the time axis in chunks sized to a memory budget, so
+    NumPy memmaps of 10^4 oscillators x 10^5 timesteps are processed without
+    materializing the full array.
+    """
+
+    def __init__(self, max_chunk_bytes: int = 64 * 1024 * 1024, tracer=None,
+                 bootstrap_resamples: int = 0, seed: Optional[int] = None):
+        """
+        Args:
+            max_chunk_bytes: Upper bound for temporaries allocated per time chunk
+            tracer: Optional tracing.Tracer for per-measure spans
+            bootstrap_resamples: Block-bootstrap resamples of r(t) for intervals (0 disables)
+            seed: Seed for the bootstrap resamples
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_chunk_bytes = max_chunk_bytes
+        self.tracer = tracer
+        self.bootstrap_resamples = bootstrap_resamples
+        self.seed = seed
+
+    def _chunks(self, phases: np.ndarray, start: int = 0) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (offset, float64 chunk) pairs along the time axis"""
+        n_timesteps, n_oscillators = phases.shape
+        # cos, sin and the float64 copy of the chunk are alive at once
+        steps = max(1, self.max_chunk_bytes // (3 * 8 * max(n_oscillators, 1)))
+        for offset in range(start, n_timesteps, steps):
+            yield offset, np.asarray(phases[offset:offset + steps], dtype=np.float64)
+
+    def _span(self, name: str):
+        return self.tracer.span(name) if self.tracer else nullcontext()
+
+    def order_parameter(self, phases: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Global Kuramoto order parameter r(t) e^{i psi(t)} = (1/N) sum_j e^{i theta_j(t)}
+
+        Returns:
+            (r, psi) arrays of length n_timesteps
+        """
+        n_timesteps = phases.shape[0]
+        r = np.empty(n_timesteps)
+        psi = np.empty(n_timesteps)
+        for offset, chunk in self._chunks(phases):
+            re = np.cos(chunk).mean(axis=1)
+            im = np.sin(chunk).mean(axis=1)
+            r[offset:offset + len(chunk)] = np.hypot(re, im)
+            psi[offset:offset + len(chunk)] = np.arctan2(im, re)
+        return r, psi
+
+    def local_order_parameter(self, phases: np.ndarray, adjacency,
+                              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Local order parameter r_i(t) = |sum_j A_ij e^{i theta_j(t)}| / k_i on a network
+
+        Args:
+            phases: (n_timesteps, n_oscillators) phases
+            adjacency: (N, N) dense array, SciPy sparse matrix or NetworkX graph
+            out: Optional (n_timesteps, N) array/memmap receiving r_i(t)
+
+        Returns:
+            Time-averaged local order parameter per oscillator (N,)
+        """
+        A = self._adjacency(adjacency, phases.shape[1])
+        degree = np.asarray(A.sum(axis=1)).ravel()
+        degree[degree == 0] = 1.0
+
+        total = np.zeros(phases.shape[1])
+        for offset, chunk in self._chunks(phases):
+            # (N, N) @ (N, chunk) for the real and imaginary parts
+            re = (A @ np.cos(chunk).T).T
+            im = (A @ np.sin(chunk).T).T
+            local = np.hypot(re, im) / degree
+            if out is not None:
+                out[offset:offset + len(chunk)] = local
+            total += local.sum(axis=0)
+        return total / phases.shape[0]
+
+    def _adjacency(self, adjacency, n_oscillators: int):
+        """Normalize adjacency input to a dense array or CSR matrix"""
+        if hasattr(adjacency, "nodes") and hasattr(adjacency, "edges"):
+            import networkx as nx
+            if sparse is not None:
+                adjacency = nx.to_scipy_sparse_array(adjacency, nodelist=sorted(adjacency.nodes()),
+                                                     weight=None, format="csr")
+            else:
+                adjacency = nx.to_numpy_array(adjacency, nodelist=sorted(adjacency.nodes()), weight=None)
+        if sparse is not None and sparse.issparse(adjacency):
+            A = sparse.csr_matrix(adjacency, dtype=np.float64)
+        else:
+            A = np.asarray(adjacency, dtype=np.float64)
+        if A.shape != (n_oscillators, n_oscillators):
+            raise ValueError(f"Adjacency shape {A.shape} does not match {n_oscillators} oscillators")
+        return A
+
+    def phase_locking(self, phases: np.ndarray, pairs: Optional[List[Tuple[int, int]]] = None,
+                      psi: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Phase-locking values
+
+        Args:
+            phases: (n_timesteps, n_oscillators) phases
+            pairs: Optional oscillator index pairs for pairwise PLV
+            psi: Mean-field phase from order_parameter (computed if omitted)
+
+        Returns:
+            Dict with per-oscillator PLV to the mean field and optional pairwise PLVs
+        """
+        if psi is None:
+            _, psi = self.order_parameter(phases)
+        n_timesteps, n_oscillators = phases.shape
+
+        mf_re = np.zeros(n_oscillators)
+        mf_im = np.zeros(n_oscillators)
+        pair_idx = np.asarray(pairs, dtype=np.int64).reshape(-1, 2) if pairs else None
+        pair_re = np.zeros(len(pair_idx)) if pair_idx is not None else None
+        pair_im = np.zeros(len(pair_idx)) if pair_idx is not None else None
+
+        for offset, chunk in self._chunks(phases):
+            delta = chunk - psi[offset:offset + len(chunk), np.newaxis]
+            mf_re += np.cos(delta).sum(axis=0)
+            mf_im += np.sin(delta).sum(axis=0)
+            if pair_idx is not None:
+                diff = chunk[:, pair_idx[:, 0]] - chunk[:, pair_idx[:, 1]]
+                pair_re += np.cos(diff).sum(axis=0)
+                pair_im += np.sin(diff).sum(axis=0)
+
+        result = {"mean_field_plv": np.hypot(mf_re, mf_im) / n_timesteps}
+        if pair_idx is not None:
+            result["pairwise_plv"] = np.hypot(pair_re, pair_im) / n_timesteps
+        return result
+
+    def effective_frequencies(self, phases: np.ndarray, dt: float = 1.0) -> np.ndarray:
+        """
+        Mean angular velocity of each oscillator from wrapped phase increments
+
+        Returns:
+            (n_oscillators,) effective frequencies in radians per time unit
+        """
+        n_timesteps, n_oscillators = phases.shape
+        if n_timesteps < 2:
+            return np.zeros(n_oscillators)
+        advance = np.zeros(n_oscillators)
+        previous = None
+        for _, chunk in self._chunks(phases):
+            if previous is not None:
+                chunk = np.vstack([previous, chunk])
+            steps = np.diff(chunk, axis=0)
+            advance += ((steps + np.pi) % (2 * np.pi) - np.pi).sum(axis=0)
+            previous = chunk[-1:]
+        return advance / ((n_timesteps - 1) * dt)
+
+    def analyze(self, phases: np.ndarray, adjacency=None, dt: float = 1.0,
+                transient: int = 0, lock_tolerance: float = 0.05) -> Dict[str, Any]:
+        """
+        Full synchronization summary
+
+        Args:
+            phases: (n_timesteps, n_oscillators) phases
+            adjacency: Optional network for local order parameters
+            dt: Time step between samples
+            transient: Number of initial timesteps excluded from averages
+            lock_tolerance: Relative frequency tolerance for frequency locking
+
+        Returns:
+            Dict with order parameter statistics, locking and classification
+        """
+        if phases.ndim != 2:
+            raise ValueError(f"phases must be (n_timesteps, n_oscillators), got shape {phases.shape}")
+        if transient < 0 or phases.shape[0] - transient < 2:
+            raise ValueError(f"transient={transient} leaves fewer than 2 of {phases.shape[0]} timesteps")
+        steady = phases[transient:]
+        with self._span("order_parameter"):
+            r, psi = self.order_parameter(steady)
+        with self._span("phase_locking"):
+            plv = self.phase_locking(steady, psi=psi)["mean_field_plv"]
+        with self._span("effective_frequencies"):
+            omega = self.effective_frequencies(steady, dt)
+
+        spread = np.std(omega) if len(omega) else 0.0
+        collective = np.median(omega) if len(omega) else 0.0
+        scale = max(abs(collective), spread, 1e-12)
+        locked = np.abs(omega - collective) <= lock_tolerance * scale
+
+        results = {
+            "order_parameter": {
+                "mean": round(float(r.mean()), 4),
+                "std": round(float(r.std()), 4),
+                "final": round(float(r[-1]), 4),
+                "max": round(float(r.max()), 4)
+            },
+            "phase_locking": {
+                "mean_plv": round(float(plv.mean()), 4),
+                "locked_fraction": round(float(np.mean(plv > 0.9)), 4)
+            },
+            "frequency_locking": {
+                "collective_frequency": round(float(collective), 6),
+                "frequency_spread": round(float(spread), 6),
+                "locked_fraction": round(float(locked.mean()), 4)
+            },
+            "n_oscillators": int(phases.shape[1]),
+            "n_timesteps": int(steady.shape[0])
+        }
+        if adjacency is not None:
+            with self._span("local_order_parameter"):
+                local = self.local_order_parameter(steady, adjacency)
+            results["local_order_parameter"] = {
+                "mean": round(float(local.mean()), 4),
+                "min": round(float(local.min()), 4),
+                "max": round(float(local.max()), 4)
+            }
+
+        results["sync_state"] = self._classify_sync_state(results["order_parameter"]["mean"])
+        results["confidence"] = self._calculate_confidence(r)
+        if self.bootstrap_resamples and len(r):
+            with self._span("bootstrap"):
+                results.update(self._bootstrap_order_parameter(r, results["sync_state"], results["confidence"]))
+        return results
+
+    def _bootstrap_order_parameter(self, r: np.ndarray, sync_state: str, confidence: float) -> Dict[str, Any]:
+        """
+        Moving-block bootstrap intervals for mean r(t) and the confidence
+
+        r(t) is autocorrelated, so consecutive samples are resampled in
+        blocks; each resample is classified and scored like the observed series.
+        """
+        bootstrap = Bootstrap(self.bootstrap_resamples, seed=self.seed, max_block_bytes=self.max_chunk_bytes)
+        replicates = bootstrap.block_replicates(
+            {"r": r}, {"mean": lambda s: s["r"].mean(axis=1), "std": lambda s: s["r"].std(axis=1)})
+        means, stds = replicates["mean"], replicates["std"]
+        states = np.where(means > 0.8, "synchronized", np.where(means > 0.3, "partially_synchronized", "incoherent"))
+        return {
+            "state_agreement": round(float(np.mean(states == sync_state)), 3),
+            "intervals": {
+                "order_parameter_mean": bootstrap.interval(r.mean(), means, "block_bootstrap"),
+                "confidence": bootstrap.interval(confidence, self._confidence_from_moments(means, stds),
+                                                 "block_bootstrap")
+            }
+        }
+
+    def _classify_sync_state(self, mean_r: float) -> str:
+        """Classify the collective state from the mean order parameter"""
+        if mean_r > 0.8:
+            return "synchronized"
+        elif mean_r > 0.3:
+            return "partially_synchronized"
+        else:
+            return "incoherent"
+
+    def _calculate_confidence(self, r: np.ndarray) -> float:
+        """Confidence grows with stationarity of r(t) and distance from the class boundaries"""
+        if len(r) == 0:
+            return 0.0
+        return round(float(self._confidence_from_moments(r.mean(), r.std())), 3)
+
+    @staticmethod
+    def _confidence_from_moments(mean_r, std_r):
+        """_calculate_confidence from the mean and std of r(t); vectorized over replicates"""
+        margin = np.minimum(np.abs(mean_r - 0.3), np.abs(mean_r - 0.8))
+        stability = 1.0 - np.minimum(1.0, std_r / np.maximum(mean_r, 1e-6))
+        return np.minimum(0.95, 0.5 + 0.3 * stability + margin)
+
+    @staticmethod
+    def estimate_critical_coupling(coupling: np.ndarray, r: np.ndarray,
+                                   n_candidates: int = 512) -> Dict[str, Any]:
+        """
+        Fit r = sqrt(1 - Kc / K) for K > Kc (r = 0 below) over a coupling sweep
+
+        This is the exact steady state of the mean-field model with
+        Lorentzian frequencies, valid over the whole sweep rather than just
+        near Kc, so points far above Kc do not bias the estimate (a
+        sqrt(K - Kc) fit underestimates Kc by about a quarter on a 0-3Kc sweep).
+        Every candidate Kc is evaluated at once over a (candidates x sweep)
+        matrix.
+
+        Args:
+            coupling: Coupling strengths K of the sweep
+            r: Steady-state order parameter at each K
+
+        Returns:
+            Dict with critical_coupling and rms residual
+        """
+        K = np.asarray(coupling, dtype=np.float64)
+        r = np.asarray(r, dtype=np.float64)
+        candidates = np.linspace(K.min(), K.max(), n_candidates)
+
+        ratio = np.divide(candidates[:, np.newaxis], K[np.newaxis, :],
+                          out=np.full((len(candidates), len(K)), np.inf), where=K[np.newaxis, :] > 0)
+        model = np.sqrt(np.clip(1.0 - ratio, 0.0, None))
+        residual = ((model - r) ** 2).mean(axis=1)
+
+        best = int(np.argmin(residual))
+        return {
+            "critical_coupling": round(float(candidates[best]), 6),
+            "rms_residual": round(float(np.sqrt(residual[best])), 6)
+        }
+
+
+def simulate_kuramoto(n_oscillators: int, coupling: float, n_steps: int, dt: float = 0.05,
+                      frequency_width: float = 0.5, seed: Optional[int] = None,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Mean-field Kuramoto simulation (Euler) producing test data for the analyzer
+
+    Natural frequencies are Lorentzian with half-width frequency_width, so
+    the theoretical critical coupling is Kc = 2 * frequency_width.
+
+    Returns:
+        (n_steps, n_oscillators) float32 phases (written into out if given)
+    """
+    rng = np.random.default_rng(seed)
+    omega = frequency_width * np.tan(np.pi * (rng.random(n_oscillators) - 0.5))
+    theta = rng.uniform(-np.pi, np.pi, n_oscillators)
+    phases = out if out is not None else np.empty((n_steps, n_oscillators), dtype=np.float32)
+    for step in range(n_steps):
+        z = np.exp(1j * theta).mean()
+        theta = theta + dt * (omega + coupling * np.abs(z) * np.sin(np.angle(z) - theta))
+        phases[step] = np.angle(np.exp(1j * theta))
+    return phases
+
+
+# Integration function for Filament
+def analyze_synchronization(phases: np.ndarray, adjacency=None, dt: float = 1.0,
+                            transient: int = 0, tracer=None,
+                            bootstrap_resamples: int = 0,
+                            seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Synchronization analysis in the Filament pattern structure
+    """
+    analyzer = SynchronizationAnalyzer(tracer=tracer, bootstrap_resamples=bootstrap_resamples, seed=seed)
+    results = analyzer.analyze(phases, adjacency=adjacency, dt=dt, transient=transient)
+
+    return {
+        "pattern_found": results["sync_state"] != "incoherent",
+        "analysis_type": "kuramoto_order_parameter",
+        "details": results,
+        "confidence": results["confidence"],
+        "evidence": f"Order parameter r: {results['order_parameter']['mean']}, "
+                    f"Frequency-locked: {results['frequency_locking']['locked_fraction']}, "
+                    f"State: {results['sync_state']}"
+    }
+
+
+if __name__ == "__main__":
+    # Coupling sweep across Kc = 2 * 0.5 = 1.0
+    analyzer = SynchronizationAnalyzer()
+    couplings = np.linspace(0.0, 3.0, 13)
+    mean_r = []
+    for K in couplings:
+        phases = simulate_kuramoto(500, K, 2000, seed=1)
+        summary = analyzer.analyze(phases, dt=0.05, transient=1000)
+        mean_r.append(summary["order_parameter"]["mean"])
+        print(f"K={K:.2f}  r={summary['order_parameter']['mean']:.3f}  state={summary['sync_state']}")
+
+    print("\nCritical coupling estimate:", SynchronizationAnalyzer.estimate_critical_coupling(couplings, mean_r))
@@ -0,0 +1,342 @@
+# Weighted Graph Module (array-backed, Dijkstra-based metrics)
+# File: tools/analytics/weighted_graph.py
+
+import heapq
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # dense products are used for clustering without SciPy
+    sparse = None
+
+
+class WeightedGraph:
+    """
+    Undirected weighted graph in CSR arrays
+
+    Edge weights are connection strengths. Shortest paths run on distances
+    1 / weight (a strong connection is a short hop) unless distance="weight"
+    treats the weight itself as a length.
+
+    Attributes:
+        nodes: Node labels, in index order
+        indptr, indices: CSR neighbour structure
+        weights: Strength of each CSR entry
+        lengths: Path length of each CSR entry
+    """
+
+    def __init__(self, nodes: List[Any], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 distance: str = "inverse"):
+        if distance not in ("inverse", "weight"):
+            raise ValueError(f"Unknown distance: {distance}")
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        with np.errstate(divide="ignore"):
+            self.lengths = 1.0 / weights if distance == "inverse" else weights.copy()
+        self.distance = distance
+
+    @classmethod
+    def from_networkx(cls, network, weight: Optional[str] = "weight", distance: str = "inverse") -> "WeightedGraph":
+        """Build from a NetworkX graph; edges without the attribute (or every edge, with weight=None) get weight 1"""
+        nodes = list(network.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        rows, cols, values = [], [], []
+        for u, v, data in network.edges(data=True):
+            if u == v:
+                continue
+            w = float(data.get(weight, 1.0))
+            rows += [index[u], index[v]]
+            cols += [index[v], index[u]]
+            values += [w, w]
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.lexsort((cols, rows)) if len(rows) else np.array([], dtype=np.int64)
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.add.at(indptr, rows + 1, 1)
+        return cls(nodes, np.cumsum(indptr), np.asarray(cols, dtype=np.int64)[order],
+                   np.asarray(values, dtype=np.float64)[order], distance)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def strengths(self) -> np.ndarray:
+        """Node strength: sum of incident edge weights"""
+        rows = np.repeat(np.arange(self.n_nodes), self.degrees())
+        return np.bincount(rows, weights=self.weights, minlength=self.n_nodes)
+
+    def clustering(self) -> np.ndarray:
+        """
+        Weighted clustering coefficient per node (Onnela et al. 2005)
+
+        c_i = sum_jk (w_ij w_ik w_jk)^(1/3) / (k_i (k_i - 1)) with weights
+        normalized by the largest weight, i.e. diag(W^(1/3) cubed) / (k (k - 1)).
+        Matches networkx.clustering(G, weight=...).
+        """
+        n = self.n_nodes
+        degrees = self.degrees()
+        if not len(self.weights):
+            return np.zeros(n)
+        root = np.cbrt(self.weights / self.weights.max())
+        if sparse is not None:
+            W = sparse.csr_matrix((root, self.indices, self.indptr), shape=(n, n))
+            triangles = np.asarray((W @ W).multiply(W).sum(axis=1)).ravel()
+        else:
+            W = np.zeros((n, n))
+            W[np.repeat(np.arange(n), degrees), self.indices] = root
+            triangles = ((W @ W) * W).sum(axis=1)
+        pairs = degrees * (degrees - 1.0)
+        return np.divide(triangles, pairs, out=np.zeros(n), where=pairs > 0)
+
+    def _lists(self) -> Tuple[List[int], List[int], List[float]]:
+        """CSR as Python lists; element access in the heap loop is much faster on lists"""
+        return self.indptr.tolist(), self.indices.tolist(), self.lengths.tolist()
+
+    def shortest_paths(self, sources: Optional[List[int]] = None, betweenness: bool = True,
+                       n_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Heap-based Dijkstra from each source, with Brandes accumulation
+
+        Sources are split into blocks that run in parallel on a process pool
+        when n_workers > 1; each block returns partial sums, so only O(n)
+        arrays cross process boundaries.
+
+        Args:
+            sources: Source node indices (default: all nodes)
+            betweenness: Also accumulate shortest-path betweenness
+            n_workers: Worker processes
+
+        Returns:
+            Dict with per-node distance_sum and reachable counts (as sources)
+            and unnormalized betweenness (over the given sources)
+        """
+        sources = list(range(self.n_nodes)) if sources is None else list(sources)
+        if n_workers and n_workers > 1 and len(sources) > 1:
+            n_blocks = min(len(sources), 4 * n_workers)
+            blocks = [sources[i::n_blocks] for i in range(n_blocks)]
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self, betweenness)) as pool:
+                parts = list(pool.map(_source_block, blocks))
+        else:
+            _init_worker(self, betweenness)
+            parts = [_source_block(sources)]
+
+        result = {
+            "distance_sum": np.zeros(self.n_nodes),
+            "reachable": np.zeros(self.n_nodes, dtype=np.int64),
+            "betweenness": np.zeros(self.n_nodes)
+        }
+        for part in parts:
+            for key, values in part.items():
+                result[key] += values
+        return result
+
+    def metrics(self, n_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-node weighted metrics
+
+        Returns:
+            strength, clustering, closeness (Wasserman-Faust scaled for
+            disconnected graphs, like networkx), mean_distance to reachable
+            nodes, reachable counts and normalized betweenness
+        """
+        n = self.n_nodes
+        paths = self.shortest_paths(n_workers=n_workers)
+        reachable = paths["reachable"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_distance = np.where(reachable > 0, paths["distance_sum"] / reachable, np.nan)
+            closeness = np.where(paths["distance_sum"] > 0,
+                                 reachable / paths["distance_sum"] * (reachable / max(n - 1, 1)), 0.0)
+        # Undirected: every pair was counted from both ends
+        scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 0.0
+        return {
+            "strength": self.strengths(),
+            "clustering": self.clustering(),
+            "closeness": closeness,
+            "mean_distance": mean_distance,
+            "reachable": reachable,
+            "betweenness": paths["betweenness"] * scale
+        }
+
+
+# Per-process graph for the source pool
+_GRAPH: Optional[Tuple[List[int], List[int], List[float], int]] = None
+_BETWEENNESS = True
+# Every path length is 1: breadth-first search replaces Dijkstra
+_UNIT = False
+
+
+def _init_worker(graph: WeightedGraph, betweenness: bool):
+    global _GRAPH, _BETWEENNESS, _UNIT
+    indptr, indices, lengths = graph._lists()
+    _GRAPH = (indptr, indices, lengths, graph.n_nodes)
+    _BETWEENNESS = betweenness
+    _UNIT = bool(np.all(graph.lengths == 1.0))
+
+
+def _source_block(sources: List[int]) -> Dict[str, np.ndarray]:
+    """Dijkstra (and Brandes dependency accumulation) from a block of sources"""
+    if _UNIT:
+        return _bfs_source_block(sources)
+    indptr, indices, lengths, n = _GRAPH
+    distance_sum = np.zeros(n)
+    reachable = np.zeros(n, dtype=np.int64)
+    betweenness = [0.0] * n
+    inf = float("inf")
+
+    for source in sources:
+        dist = [inf] * n
+        sigma = [0.0] * n
+        preds: List[List[int]] = [[] for _ in range(n)] if _BETWEENNESS else []
+        settled = []
+        dist[source] = 0.0
+        sigma[source] = 1.0
+        heap = [(0.0, source)]
+        done = [False] * n
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            settled.append(u)
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                nd = d + lengths[e]
+                dv = dist[v]
+                if nd < dv - 1e-12 * nd:
+                    dist[v] = nd
+                    sigma[v] = sigma[u]
+                    if _BETWEENNESS:
+                        preds[v] = [u]
+                    heapq.heappush(heap, (nd, v))
+                elif _BETWEENNESS and not done[v] and abs(nd - dv) <= 1e-12 * nd:
+                    sigma[v] += sigma[u]
+                    preds[v].append(u)
+
+        total = sum(dist[v] for v in settled)
+        distance_sum[source] = total
+        reachable[source] = len(settled) - 1
+
+        if _BETWEENNESS:
+            delta = [0.0] * n
+            for w in reversed(settled):
+                coefficient = (1.0 + delta[w]) / sigma[w]
+                for v in preds[w]:
+                    delta[v] += sigma[v] * coefficient
+                if w != source:
+                    betweenness[w] += delta[w]
+
+    return {"distance_sum": distance_sum, "reachable": reachable, "betweenness": np.asarray(betweenness)}
+
+
+def _bfs_source_block(sources: List[int]) -> Dict[str, np.ndarray]:
+    """_source_block for unit lengths: breadth-first search, no heap"""
+    indptr, indices, _, n = _GRAPH
+    distance_sum = np.zeros(n)
+    reachable = np.zeros(n, dtype=np.int64)
+    betweenness = [0.0] * n
+
+    for source in sources:
+        dist = [-1] * n
+        sigma = [0.0] * n
+        dist[source] = 0
+        sigma[source] = 1.0
+        order = [source]
+        total = 0
+        # order doubles as the FIFO queue: it is consumed by index
+        for u in order:
+            du = dist[u] + 1
+            su = sigma[u]
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                if dist[v] < 0:
+                    dist[v] = du
+                    total += du
+                    order.append(v)
+                if dist[v] == du:
+                    sigma[v] += su
+        distance_sum[source] = total
+        reachable[source] = len(order) - 1
+
+        if _BETWEENNESS:
+            delta = [0.0] * n
+            for w in reversed(order):
+                coefficient = (1.0 + delta[w]) / sigma[w]
+                dw = dist[w] - 1
+                for v in indices[indptr[w]:indptr[w + 1]]:
+                    if dist[v] == dw:
+                        delta[v] += sigma[v] * coefficient
+                if w != source:
+                    betweenness[w] += delta[w]
+
+    return {"distance_sum": distance_sum, "reachable": reachable, "betweenness": np.asarray(betweenness)}
+
+
+def analyze_weighted_network(network, weight: str = "weight", distance: str = "inverse",
+                             n_workers: Optional[int] = None, bootstrap=None) -> Dict[str, Any]:
+    """
+    Weighted clustering, strength distribution, Dijkstra path lengths and centralities
+
+    Args:
+        network: NetworkX graph with edge weights (connection strengths)
+        weight: Edge attribute holding the weight
+        distance: "inverse" (path length 1/w) or "weight" (path length w)
+        n_workers: Worker processes for the shortest-path sources
+        bootstrap: Optional bootstrap.Bootstrap; adds node-resampled intervals
+
+    Returns:
+        Summary statistics in the NetworkXAnalyzer section format
+    """
+    logger = logging.getLogger(__name__)
+    graph = WeightedGraph.from_networkx(network, weight, distance)
+    if graph.n_nodes == 0:
+        return {"nodes": 0}
+    metrics = graph.metrics(n_workers)
+    strength, degrees = metrics["strength"], graph.degrees()
+
+    # Strength-degree scaling s ~ k^beta: beta > 1 means hubs also carry stronger links
+    mask = (degrees > 0) & (strength > 0)
+    beta = None
+    if mask.sum() > 2 and np.ptp(np.log(degrees[mask])) > 0:
+        beta = float(np.polyfit(np.log(degrees[mask]), np.log(strength[mask]), 1)[0])
+
+    mean_distance = metrics["mean_distance"]
+    connected = graph.n_nodes > 1 and bool(np.all(metrics["reachable"] == graph.n_nodes - 1))
+    strength_mean, strength_std = float(strength.mean()), float(strength.std())
+    hubs = int(np.sum(strength > strength_mean + 2 * strength_std))
+    logger.debug(f"Weighted analysis of {graph.n_nodes} nodes done")
+
+    results = {
+        "distance": distance,
+        "weighted_clustering": round(float(metrics["clustering"].mean()), 3),
+        "strength_distribution": {
+            "mean": round(strength_mean, 3),
+            "std": round(strength_std, 3),
+            "max": round(float(strength.max()), 3),
+            "min": round(float(strength.min()), 3),
+            "strength_degree_exponent": round(beta, 3) if beta is not None else None
+        },
+        "strength_hubs": hubs,
+        "avg_weighted_path_length": round(float(np.nanmean(mean_distance)), 3) if connected else "disconnected",
+        "max_weighted_betweenness": round(float(metrics["betweenness"].max()), 3),
+        "avg_weighted_closeness": round(float(metrics["closeness"].mean()), 3),
+        "weighted_flow_efficiency": round(float(metrics["closeness"].mean() *
+                                                (1 - min(float(metrics["betweenness"].max()), 0.5))), 3)
+    }
+    if bootstrap is not None:
+        replicates = bootstrap.node_replicates(
+            {"c": metrics["clustering"], "s": strength, "cl": metrics["closeness"]},
+            {"weighted_clustering": lambda s: s["c"].mean(axis=1),
+             "strength_mean": lambda s: s["s"].mean(axis=1),
+             "avg_weighted_closeness": lambda s: s["cl"].mean(axis=1)})
+        estimates = {"weighted_clustering": metrics["clustering"].mean(), "strength_mean": strength_mean,
+                     "avg_weighted_closeness": metrics["closeness"].mean()}
+        results["intervals"] = {name: bootstrap.interval(estimates[name], values)
+                                for name, values in replicates.items()}
+    return results
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Filament Benchmark Suite
+Scaling benchmarks for LER loading and queries, NetworkX analysis sections
+and end-to-end Filament events, with a JSON results format and a compare
+command that flags regressions
+
+Benchmarks:
+1. ler.startup_cold / ler.startup_warm - LERQueryEngine construction over
+   synthetic LER trees of 10 to 10^4 definitions, in a fresh interpreter and
+   in-process (modules already imported, files in the OS cache)
+2. ler.query.* - per-call latency of the engine's query methods on those trees
+3. network.* - each NetworkXAnalyzer section on synthetic small-world graphs
+   of 10^2 to 10^6 nodes
+4. filament.events_per_s - FilamentEvent throughput on the real LER
+
+Every series stops growing once a size exceeds (or is predicted, from the
+scaling seen so far, to exceed) the per-run time budget; those sizes are
+recorded as skipped rather than run.
+
+    python benchmark_suite.py run --output bench.json
+    python benchmark_suite.py compare baseline.json bench.json --threshold 0.25
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from tracing import percentile
+
+logger = logging.getLogger(__name__)
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_LER_ROOT = TOOLS_DIR.parent
+
+PROFILES = {
+    "quick": {"ler_sizes": [10, 100, 1000], "graph_sizes": [100, 1000, 10000], "events": 10},
+    "full": {"ler_sizes": [10, 100, 1000, 10000], "graph_sizes": [100, 1000, 10000, 100000, 1000000], "events": 50},
+}
+
+NETWORK_SECTIONS = {
+    "network_motifs": "_analyze_network_motifs",
+    "clustering_analysis": "_analyze_clustering",
+    "connectivity_patterns": "_analyze_connectivity",
+    "information_flow": "_analyze_information_flow",
+    "weighted_analysis": "_analyze_weighted",
+}
+
+_CATEGORIES = ["Information_Processing_Intelligence", "Structural_Organization", "Dynamic_Regulation",
+               "Collective_Behavior", "Adaptive_Response", "Energy_Flow", "Boundary_Dynamics", "Pattern_Formation"]
+_WORDS = ["signal", "noise", "network", "feedback", "boundary", "flow", "synchrony", "cascade", "threshold",
+          "coordination", "hierarchy", "adaptation", "resilience", "gradient", "memory", "selection"]
+
+
+# Synthetic inputs
+
+def make_synthetic_ler(root: Path, n_definitions: int, seed: int = 0) -> Path:
+    """
+    Write a synthetic LER tree of about n_definitions EEPs and SOPs
+
+    EEPs follow the shape of eep_definitions/information_filtering.yaml
+    (nested description, grouped signature patterns, metadata); one SOP per
+    ten EEPs targets five of them with five steps each.
+    """
+    import yaml
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    rng = random.Random(seed)
+
+    n_sops = max(1, n_definitions // 11)
+    n_eeps = max(1, n_definitions - n_sops)
+    for subdir in ("eep_definitions", "sops/characterization", "signature_patterns", "schemas"):
+        (root / subdir).mkdir(parents=True, exist_ok=True)
+    (root / "schemas" / "core_schema.yaml").write_text("schema_version: '1.0'\n", encoding="utf-8")
+
+    def phrase(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    eep_ids = [f"EEP_SYNTHETIC_{i:05d}" for i in range(n_eeps)]
+    for i, eep_id in enumerate(eep_ids):
+        definition = {
+            "eep_id": eep_id,
+            "eep_name" if i % 2 else "name": f"Synthetic {phrase(2).title()} {i}",
+            "category": _CATEGORIES[i % len(_CATEGORIES)],
+            "version": "1.0.0",
+            "status": "synthetic",
+            "description": {"universal_function": phrase(12), "core_mechanism": phrase(20),
+                            "key_characteristics": [phrase(6) for _ in range(4)]},
+            "signature_patterns": {
+                "quantitative": [{"pattern_id": f"{eep_id}_Q{j}", "pattern_name": phrase(3),
+                                  "mathematical_form": "y = a * x^b", "detection_method": phrase(5),
+                                  "typical_values": {"b": [1.5, 3.0]}, "evidence_indicators": [phrase(4)]}
+                                 for j in range(3)],
+                "qualitative": [{"pattern_id": f"{eep_id}_L{j}", "pattern_name": phrase(3),
+                                 "description": phrase(10), "detection_method": phrase(5),
+                                 "evidence_indicators": [phrase(4)]} for j in range(2)],
+            },
+            "research_gaps": [phrase(8) for _ in range(3)],
+            "metadata": {"created_date": "2024-05-26", "validation_status": "synthetic"},
+        }
+        with open(root / "eep_definitions" / f"{eep_id.lower()}.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(definition, f, Dumper=dumper, sort_keys=False)
+
+    for i in range(n_sops):
+        sop_id = f"SOP_SYNTHETIC_{i:05d}"
+        definition = {
+            "sop_id": sop_id,
+            "name": f"Synthetic Procedure {i}",
+            "version": "1.0.0",
+            "purpose": phrase(10),
+            "target_eeps": rng.sample(eep_ids, min(5, len(eep_ids))),
+            "steps": [{"step_id": f"STEP_{j}", "step_name": phrase(3).title(), "purpose": phrase(8),
+                       "analytical_procedure": "signature_scanning" if j == 1 else phrase(2).replace(" ", "_")}
+                      for j in range(5)],
+        }
+        with open(root / "sops" / "characterization" / f"{sop_id.lower()}.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(definition, f, Dumper=dumper, sort_keys=False)
+    return root
+
+
+def synthetic_graph(n_nodes: int, seed: int = 0):
+    """Weighted small-world graph like NetworkXAnalyzer._generate_test_network, at any size"""
+    import networkx as nx
+
+    network = nx.watts_strogatz_graph(n_nodes, 6, 0.3, seed=seed)
+    rng = random.Random(seed)
+    for u, v in network.edges():
+        network[u][v]['weight'] = rng.uniform(0.1, 1.0)
+    return network
+
+
+# Measurement
+
+def _time(fn: Callable[[], Any], repeats: int = 1) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return percentile(sorted(samples), 50)
+
+
+class BenchmarkRun:
+    """
+    Collects results keyed "<benchmark>[n=<size>]"
+
+    Each result holds value, unit and which direction is better; series()
+    applies the time budget across increasing sizes.
+    """
+
+    def __init__(self, budget_s: float = 30.0):
+        self.budget_ms = budget_s * 1000.0
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, name: str, value: float, unit: str = "ms", better: str = "lower", **extra):
+        self.results[name] = {"value": round(value, 4), "unit": unit, "better": better, **extra}
+
+    def series(self, name: str, sizes: List[int], measure: Callable[[int], Optional[float]]):
+        """
+        Run measure(size) for increasing sizes until the time budget is hit
+
+        measure returns the wall time in ms of the run used for the budget
+        (it records its own results); later sizes are predicted from the
+        log-log slope of the last two sizes (at least linear).
+        """
+        history = []
+        for size in sizes:
+            if history:
+                last_size, last_ms = history[-1]
+                slope = 1.0
+                if len(history) > 1 and history[-2][1] > 0 and last_ms > 0:
+                    slope = max(1.0, math.log(last_ms / history[-2][1]) / math.log(last_size / history[-2][0]))
+                predicted = last_ms * (size / last_size) ** slope
+                if last_ms > self.budget_ms or predicted > self.budget_ms:
+                    self.results[f"{name}[n={size}]"] = {"skipped": f"predicted {predicted / 1000.0:.1f}s over budget"}
+                    continue
+            try:
+                elapsed = measure(size)
+            except MemoryError:
+                self.results[f"{name}[n={size}]"] = {"skipped": "out of memory"}
+                break
+            if elapsed is not None:
+                history.append((size, elapsed))
+
+    def to_dict(self, profile: str) -> Dict[str, Any]:
+        import numpy
+        import networkx
+        return {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "profile": profile,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": numpy.__version__,
+                "networkx": networkx.__version__,
+            },
+            "results": self.results,
+        }
+
+
+def bench_ler(run: BenchmarkRun, sizes: List[int], work_dir: Path, seed: int, query_samples: int = 200):
+    """LERQueryEngine startup (cold and warm) and query latencies on synthetic trees"""
+    from ler_access import LERQueryEngine
+
+    cold_script = ("import sys, time; t0 = time.perf_counter(); sys.path.insert(0, sys.argv[1]); "
+                   "from ler_access import LERQueryEngine; LERQueryEngine(sys.argv[2]); "
+                   "print((time.perf_counter() - t0) * 1000.0)")
+
+    def measure(size: int) -> float:
+        root = make_synthetic_ler(work_dir / f"ler_{size}", size, seed)
+
+        cold = subprocess.run([sys.executable, "-c", cold_script, str(TOOLS_DIR), str(root)],
+                              capture_output=True, text=True, check=True)
+        run.record(f"ler.startup_cold[n={size}]", float(cold.stdout.strip().splitlines()[-1]))
+
+        holder = {}
+        warm = _time(lambda: holder.__setitem__("engine", LERQueryEngine(str(root))), repeats=3)
+        run.record(f"ler.startup_warm[n={size}]", warm)
+        engine = holder["engine"]
+
+        rng = random.Random(seed)
+        eep_ids = engine.list_available_eeps()
+        sop_ids = engine.list_available_sops()
+        queries = {
+            "get_eep_definition": lambda: engine.get_eep_definition(rng.choice(eep_ids)),
+            "get_sop_step_details": lambda: engine.get_sop_step_details(rng.choice(sop_ids), "STEP_1"),
+            "get_eeps_by_category": lambda: engine.get_eeps_by_category(rng.choice(_CATEGORIES)),
+            "find_sops_for_eep": lambda: engine.find_sops_for_eep(rng.choice(eep_ids)),
+            "search_eeps_by_function": lambda: engine.search_eeps_by_function(rng.choice(_WORDS)),
+        }
+        for query, call in queries.items():
+            samples = []
+            for _ in range(query_samples):
+                t0 = time.perf_counter()
+                call()
+                samples.append((time.perf_counter() - t0) * 1e6)
+            samples.sort()
+            run.record(f"ler.query.{query}[n={size}]", percentile(samples, 50), unit="us",
+                       p95=round(percentile(samples, 95), 3))
+        return warm
+
+    run.series("ler", sizes, measure)
+
+
+def bench_network(run: BenchmarkRun, sizes: List[int], seed: int):
+    """Each NetworkXAnalyzer section on synthetic graphs, each section its own budgeted series"""
+    from analysis_registry import ANALYTICS_DIR
+    if ANALYTICS_DIR not in sys.path:
+        sys.path.append(ANALYTICS_DIR)
+    from networkx_analyzer import NetworkXAnalyzer
+
+    analyzer = NetworkXAnalyzer(seed=seed)
+    graphs = {}
+
+    def graph(size: int):
+        if size not in graphs:
+            graphs.clear()  # keep one graph alive at a time
+            t0 = time.perf_counter()
+            graphs[size] = synthetic_graph(size, seed)
+            run.record(f"network.generate_network[n={size}]", (time.perf_counter() - t0) * 1000.0)
+        return graphs[size]
+
+    for section, method in NETWORK_SECTIONS.items():
+        def measure(size: int, method=method, section=section) -> float:
+            network = graph(size)
+            elapsed = _time(lambda: getattr(analyzer, method)(network), repeats=3 if size <= 1000 else 1)
+            run.record(f"network.{section}[n={size}]", elapsed)
+            return elapsed
+        run.series(f"network.{section}", sizes, measure)
+
+
+def bench_filament(run: BenchmarkRun, ler_root: str, n_events: int, seed: int):
+    """End-to-end FilamentEvent throughput on the real LER"""
+    from ler_access import LERQueryEngine
+    from filament_v001 import FilamentEvent, DEMO_QUERY
+
+    engine = LERQueryEngine(ler_root)
+    query = {**DEMO_QUERY, "random_seed": seed}
+
+    def event():
+        filament = FilamentEvent(engine)
+        filament.process_hardcoded_query(query)
+        filament.retrieve_ler_guidance()
+        filament.execute_stubbed_analysis()
+        filament.generate_output_projection()
+        filament.format_human_readable_output()
+        filament.cleanup_and_terminate()
+
+    event()  # first event pays for plugin imports
+    samples = sorted(_time(event) for _ in range(n_events))
+    run.record("filament.event_latency", percentile(samples, 50), p95=round(percentile(samples, 95), 3))
+    run.record("filament.events_per_s", 1000.0 * len(samples) / sum(samples), unit="events/s", better="higher")
+
+
+def run_suite(profile: str = "quick", ler_root: str = str(DEFAULT_LER_ROOT), seed: int = 0,
+              budget_s: float = 30.0, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark groups of a profile
+
+    Args:
+        profile: "quick" or "full" (see PROFILES)
+        ler_root: Real LER root for the end-to-end benchmark
+        seed: Seed for synthetic trees, graphs and query choice
+        budget_s: Per-run time budget for scaling series
+        only: Restrict to groups among "ler", "network", "filament"
+
+    Returns:
+        {"meta": {...}, "results": {name: {value, unit, better, ...} or {skipped}}}
+    """
+    settings = PROFILES[profile]
+    groups = only or ["ler", "network", "filament"]
+    run = BenchmarkRun(budget_s)
+
+    if "ler" in groups:
+        with tempfile.TemporaryDirectory(prefix="ler_bench_") as work_dir:
+            bench_ler(run, settings["ler_sizes"], Path(work_dir), seed)
+    if "network" in groups:
+        bench_network(run, settings["graph_sizes"], seed)
+    if "filament" in groups:
+        bench_filament(run, ler_root, settings["events"], seed)
+    return run.to_dict(profile)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.25,
+                    min_delta: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Compare two result files benchmark by benchmark
+
+    A benchmark regresses when it is worse than the baseline by more than
+    threshold (relative) and min_delta (absolute, in the benchmark's unit).
+
+    Returns:
+        Rows of {name, baseline, current, change, status} with status one of
+        ok, improved, regression, new, missing or skipped
+    """
+    rows = []
+    base_results, current_results = baseline.get("results", {}), current.get("results", {})
+    for name in sorted(set(base_results) | set(current_results)):
+        old, new = base_results.get(name), current_results.get(name)
+        row = {"name": name, "baseline": old and old.get("value"), "current": new and new.get("value"),
+               "change": None}
+        if new is None:
+            row["status"] = "missing"
+        elif old is None:
+            row["status"] = "new"
+        elif "value" not in old or "value" not in new:
+            row["status"] = "skipped"
+        else:
+            higher_better = new.get("better") == "higher"
+            worse = old["value"] - new["value"] if higher_better else new["value"] - old["value"]
+            row["change"] = round((new["value"] - old["value"]) / old["value"], 4) if old["value"] else None
+            relative = worse / old["value"] if old["value"] else (math.inf if worse > 0 else 0.0)
+            if relative > threshold and worse > min_delta:
+                row["status"] = "regression"
+            elif -relative > threshold:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'status':<11} {'baseline':>12} {'current':>12} {'change':>8}  benchmark", "-" * 90]
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+        baseline = "-" if row["baseline"] is None else f"{row['baseline']:.3f}"
+        current = "-" if row["current"] is None else f"{row['current']:.3f}"
+        change = "-" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(f"{row['status']:<11} {baseline:>12} {current:>12} {change:>8}  {row['name']}")
+    lines.append("-" * 90)
+    lines.append(", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+    return "\n".join(lines)
+
+
+def format_results(data: Dict[str, Any]) -> str:
+    lines = [f"{'benchmark':<58} {'value':>12} unit"]
+    for name, result in data["results"].items():
+        if "value" in result:
+            lines.append(f"{name:<58} {result['value']:>12.3f} {result['unit']}")
+        else:
+            lines.append(f"{name:<58} {'skipped':>12} {result['skipped']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LER loading, queries, network analysis and Filament events")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    run_parser.add_argument("--only", nargs="+", choices=["ler", "network", "filament"])
+    run_parser.add_argument("--ler-root", default=str(DEFAULT_LER_ROOT), help="LER root for the end-to-end benchmark")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--budget-s", type=float, default=30.0,
+                            help="Skip larger sizes of a series once a run takes (or would take) longer")
+    run_parser.add_argument("--output", metavar="PATH", help="Write results as JSON to PATH")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+                                help="Relative slowdown reported as a regression")
+    compare_parser.add_argument("--min-delta", type=float, default=0.0,
+                                help="Ignore regressions smaller than this (in each benchmark's unit)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "run":
+        data = run_suite(args.profile, args.ler_root, args.seed, args.budget_s, args.only)
+        print(format_results(data))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold, args.min_delta)
+    print(format_comparison(rows))
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Constellation Characterization
+Characterize several EEPs against one dataset in a single pass
+
+Shared graph and interaction features are computed once per dataset. Each
+target EEP is then scored against that feature set, either by its registered
+analysis plugin or by matching its signature patterns to the shared features,
+and the per-EEP results are combined into one constellation fingerprint.
+"""
+
+import sys
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from ler_access import LERQueryEngine
+from analysis_registry import AnalysisRegistry, ANALYTICS_DIR, get_default_registry
+from tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+# Keywords in a signature pattern's id, name or detection method that link it
+# to a shared feature: keyword -> (feature group, feature name)
+FEATURE_KEYWORDS = [
+    ("threshold", ("interactions", "threshold_activation")),
+    ("cascade", ("interactions", "cascade_propagation")),
+    ("propagation", ("interactions", "cascade_propagation")),
+    ("collective", ("interactions", "collective_decision")),
+    ("consensus", ("interactions", "collective_decision")),
+    ("decision", ("interactions", "collective_decision")),
+    ("cluster", ("network", "global_clustering")),
+    ("modular", ("network", "global_clustering")),
+    ("small_world", ("network", "small_world_coefficient")),
+    ("bottleneck", ("network", "max_betweenness")),
+    ("flow", ("network", "flow_efficiency")),
+    ("hub", ("network", "hub_fraction")),
+    ("connectivity", ("network", "density")),
+    ("network", ("network", "density")),
+    ("spatial", ("spatial", "pattern_strength")),
+    ("wavelength", ("spatial", "pattern_strength")),
+    ("symmetry", ("spatial", "symmetry_order")),
+    ("coherence", ("spatial", "temporal_coherence")),
+]
+
+
+def _feature_strength(group: str, name: str, features: Dict[str, Any]) -> Optional[float]:
+    """Map a shared feature to a 0-1 evidence strength"""
+    values = features.get("scalars", {}).get(group, {})
+    value = values.get(name)
+    if value is None:
+        return None
+    if group == "interactions":
+        # Share of all observed interactions
+        return float(value)
+    if name == "small_world_coefficient":
+        return min(1.0, max(0.0, (value - 1.0) / 2.0))
+    return min(1.0, max(0.0, float(value)))
+
+
+def score_signature_patterns(patterns: List[Dict[str, Any]], features: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Score signature patterns against a shared feature set
+
+    Args:
+        patterns: Flat list of signature pattern definitions
+        features: Output of ConstellationEvent.compute_shared_features
+
+    Returns:
+        Pattern results in the FilamentEvent pattern structure, for patterns
+        with at least one matching feature
+    """
+    results = []
+    for pattern in patterns:
+        text = " ".join(str(pattern.get(k, "")) for k in ("pattern_id", "pattern_name", "detection_method")).lower()
+        matched = {}
+        for keyword, (group, name) in FEATURE_KEYWORDS:
+            if keyword in text and (group, name) not in matched:
+                strength = _feature_strength(group, name, features)
+                if strength is not None:
+                    matched[(group, name)] = strength
+        if not matched:
+            continue
+
+        strength = sum(matched.values()) / len(matched)
+        evidence = ", ".join(f"{name}={value:.2f}" for (_, name), value in matched.items())
+        results.append({
+            "name": pattern.get("pattern_name") or pattern.get("pattern_id", "Unnamed Pattern"),
+            "type": pattern.get("pattern_id", "signature_pattern"),
+            "confidence": round(0.4 + 0.5 * strength, 3),
+            "evidence": f"Shared features: {evidence}"
+        })
+    return results
+
+
+class ConstellationEvent:
+    """
+    A single Filament pass characterizing a set of EEPs on one dataset
+
+    Represents: Dataset -> Shared Features (once) -> Per-EEP Scoring -> Combined Fingerprint
+    """
+
+    def __init__(self, ler_engine: LERQueryEngine, eep_ids: Optional[List[str]] = None,
+                 sop_id: str = "SOP_BASIC_EEP_FINGERPRINTING",
+                 step_id: str = "STEP_2_SIGNATURE_SCANNING",
+                 registry: Optional[AnalysisRegistry] = None,
+                 tracer: Optional[Tracer] = None,
+                 fingerprint_index=None, similar_cases: int = 3,
+                 seed: Optional[int] = None, time_budget: Optional[float] = None,
+                 bootstrap_resamples: int = 0):
+        """
+        Args:
+            ler_engine: LER query engine
+            eep_ids: EEPs to characterize (defaults to the SOP's target_eeps)
+            sop_id: SOP guiding the analysis
+            step_id: SOP step whose analytical procedure is run for each EEP
+            registry: Analysis plugin registry
+            tracer: Optional tracer for per-stage timings
+            fingerprint_index: Optional fingerprint_index.FingerprintIndex; when
+                given, the most similar reference cases are added to the fingerprint
+            similar_cases: Number of similar reference cases to report
+            seed: Random seed for reproducible feature extraction
+            time_budget: Optional seconds for the shared network analysis (anytime mode)
+            bootstrap_resamples: Node resamples for network confidence intervals (0 disables)
+        """
+        self.ler = ler_engine
+        self.registry = registry or get_default_registry()
+        self.tracer = tracer or Tracer()
+        self.fingerprint_index = fingerprint_index
+        self.similar_cases = similar_cases
+        self.seed = seed
+        self.time_budget = time_budget
+        self.bootstrap_resamples = bootstrap_resamples
+        self.constellation_id = f"filament_constellation_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        self.start_time = datetime.now()
+
+        self.sop_definition = self.ler.get_sop_definition(sop_id)
+        if not self.sop_definition:
+            raise ValueError(f"SOP definition not found: {sop_id}")
+        self.step_details = self.ler.get_sop_step_details(sop_id, step_id)
+        if not self.step_details:
+            raise ValueError(f"SOP step not found: {step_id} in {sop_id}")
+
+        self.eep_ids = list(eep_ids or self.sop_definition.target_eeps)
+        self.shared_features = None
+        self.fingerprint = None
+
+    def compute_shared_features(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute the features every EEP is scored against, exactly once
+
+        Args:
+            input_data: Dataset in the query test_data structure
+
+        Returns:
+            Dict with full "network" analysis sections, interaction frequencies,
+            the "spatial" field analysis when field_data is given, and
+            normalized scalar features used for pattern scoring
+        """
+        with self.tracer.span("shared_features"):
+            if ANALYTICS_DIR not in sys.path:
+                sys.path.append(ANALYTICS_DIR)
+            from networkx_analyzer import NetworkXAnalyzer
+
+            network = NetworkXAnalyzer(tracer=self.tracer, seed=self.seed,
+                                       bootstrap_resamples=self.bootstrap_resamples,
+                                       time_budget=self.time_budget
+                                       ).detect_distributed_intelligence_patterns(input_data.get("network_data"))
+
+            interactions = {}
+            for record in input_data.get("interaction_patterns", []):
+                interactions[record["type"]] = interactions.get(record["type"], 0) + record.get("frequency", 0)
+            total = sum(interactions.values())
+
+            motifs = network["network_motifs"]
+            connectivity = network["connectivity_patterns"]
+            flow = network["information_flow"]
+            self.shared_features = {
+                "network": network,
+                "interaction_frequencies": interactions,
+                "scalars": {
+                    "network": {
+                        "density": motifs["density"],
+                        "global_clustering": network["clustering_analysis"]["global_clustering"],
+                        "small_world_coefficient": motifs["small_world_coefficient"],
+                        "hub_fraction": connectivity["hub_nodes"] / motifs["nodes"] if motifs["nodes"] else 0.0,
+                        "max_betweenness": flow["max_betweenness"],
+                        "flow_efficiency": flow["flow_efficiency"]
+                    },
+                    "interactions": {k: v / total for k, v in interactions.items()} if total else {}
+                }
+            }
+            field = input_data.get("field_data")
+            if field is not None:
+                self._add_spatial_features(field)
+            observations = input_data.get("signature_observations")
+            if observations:
+                import numpy as np
+
+                # Typical-value matches for every EEP's compiled patterns, averaged over the batch
+                scores = self.ler.signature_matchers.score_by_eep(observations)
+                self.shared_features["signature_scores"] = {
+                    eep_id: {pattern_id: float(np.nanmean(values)) for pattern_id, values in patterns.items()}
+                    for eep_id, patterns in scores.items()
+                }
+        return self.shared_features
+
+    def _add_spatial_features(self, field):
+        """
+        FFT pattern analysis of 2-D/3-D field data (or time stacks of it)
+
+        field_data is an array, a .npy path, or a dict with "values" or
+        "path"/"shape"/"dtype" plus optional "spacing", "dt", "spatial_dims"
+        and "window"; raw and .npy files are memory-mapped.
+        """
+        from spatial_pattern_analyzer import SpatialPatternAnalyzer
+
+        options = field if isinstance(field, dict) else {}
+        with self.tracer.span("spatial_pattern"):
+            spatial = SpatialPatternAnalyzer(spacing=options.get("spacing", 1.0),
+                                             spatial_dims=options.get("spatial_dims", 2),
+                                             window=options.get("window"), tracer=self.tracer
+                                             ).analyze(field, dt=options.get("dt", 1.0))
+        self.shared_features["spatial"] = spatial
+        if "power_spectrum" in spatial:
+            scalars = {"pattern_strength": spatial["power_spectrum"]["pattern_strength"]}
+            if "symmetry" in spatial:
+                scalars["symmetry_order"] = 1.0 - spatial["symmetry"]["isotropy"]
+            if "temporal_coherence" in spatial:
+                scalars["temporal_coherence"] = spatial["temporal_coherence"]["persistence"]
+            self.shared_features["scalars"]["spatial"] = scalars
+
+    def _score_eep(self, eep_id: str) -> Tuple[str, Dict[str, Any]]:
+        """Score one EEP against the shared features"""
+        eep = self.ler.get_eep_definition(eep_id)
+        if not eep:
+            return eep_id, {"status": "eep_not_found", "patterns_found": 0,
+                            "overall_confidence": 0.0, "patterns": []}
+
+        procedure = self.step_details.analytical_procedure or ''
+        plugin = self.registry.resolve(procedure, eep_id) if procedure else None
+        if plugin:
+            results = plugin.load()({
+                "query_data": {"target_eep": eep_id, "random_seed": self.seed},
+                "ler_retrieved_data": {"eep_definition": eep, "step_details": self.step_details},
+                "shared_features": self.shared_features,
+                "tracer": self.tracer
+            })
+        else:
+            patterns = score_signature_patterns(list(eep.patterns), self.shared_features)
+            matched = self.shared_features.get("signature_scores", {}).get(eep_id, {})
+            if matched:
+                # Measured typical-value matches replace keyword evidence for the same pattern
+                patterns = [p for p in patterns if p["type"] not in matched]
+                names = {p.pattern_id: p.name for p in eep.patterns}
+                patterns.extend({
+                    "name": names.get(pattern_id) or pattern_id,
+                    "type": pattern_id,
+                    "confidence": round(0.4 + 0.5 * score, 3),
+                    "evidence": f"Typical-value match: {score:.2f}"
+                } for pattern_id, score in matched.items())
+            confidence = sum(p["confidence"] for p in patterns) / len(patterns) if patterns else 0.0
+            results = {
+                "patterns_found": len(patterns),
+                "overall_confidence": round(confidence, 2),
+                "status": "shared_feature_scoring_complete" if patterns else "no_matching_signatures",
+                "patterns": patterns
+            }
+
+        results = dict(results)
+        results["eep_name"] = eep.name or eep_id
+        results["category"] = eep.category or 'Unknown'
+        return eep_id, results
+
+    def characterize(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the full constellation pass
+
+        Args:
+            input_data: Dataset in the query test_data structure
+
+        Returns:
+            Combined constellation fingerprint
+        """
+        self.compute_shared_features(input_data)
+
+        eep_results = {}
+        with self.tracer.span("score_eeps"):
+            for eep_id in self.eep_ids:
+                with self.tracer.span(eep_id):
+                    eep_id, results = self._score_eep(eep_id)
+                eep_results[eep_id] = results
+
+        fingerprint = {eep_id: r["overall_confidence"] for eep_id, r in eep_results.items()}
+        dominant = max(fingerprint, key=fingerprint.get) if fingerprint else None
+
+        self.fingerprint = {
+            "constellation_id": self.constellation_id,
+            "timestamp": datetime.now().isoformat(),
+            "analysis_method": {
+                "sop_used": self.sop_definition.name,
+                "step_executed": self.step_details.step_name
+            },
+            "eeps_analyzed": eep_results,
+            "fingerprint": fingerprint,
+            "dominant_eep": dominant,
+            "shared_features": self.shared_features["scalars"],
+            "processing_metadata": {
+                "processing_time_seconds": (datetime.now() - self.start_time).total_seconds(),
+                "shared_feature_passes": 1,
+                "eeps_scored": len(eep_results),
+                "timing_breakdown": self.tracer.breakdown()
+            }
+        }
+        if self.fingerprint_index is not None:
+            with self.tracer.span("similar_reference_cases"):
+                self.fingerprint["similar_reference_cases"] = self.fingerprint_index.query_output(
+                    self.fingerprint, k=self.similar_cases)
+        logger.debug(f"Constellation {self.constellation_id} characterized {len(eep_results)} EEPs")
+        return self.fingerprint
+
+    def format_human_readable_output(self) -> str:
+        """Generate human-readable summary of the constellation fingerprint"""
+        if not self.fingerprint:
+            return "No output available - constellation not characterized"
+
+        lines = ["=" * 60, "FILAMENT CONSTELLATION RESULT", "=" * 60]
+        lines.append(f"Constellation ID: {self.fingerprint['constellation_id']}")
+        lines.append(f"Analysis Method: {self.fingerprint['analysis_method']['sop_used']}")
+        lines.append(f"Step Executed: {self.fingerprint['analysis_method']['step_executed']}")
+        lines.append("")
+        lines.append("EEP FINGERPRINT:")
+        for eep_id, results in self.fingerprint["eeps_analyzed"].items():
+            lines.append(f"  • {results.get('eep_name', eep_id)} ({eep_id})")
+            lines.append(f"    Confidence: {results['overall_confidence']}  "
+                         f"Patterns: {results['patterns_found']}  Status: {results['status']}")
+        lines.append("")
+        lines.append(f"Dominant EEP: {self.fingerprint['dominant_eep']}")
+        if "similar_reference_cases" in self.fingerprint:
+            lines.append("")
+            lines.append("RESEMBLES REFERENCE CASES:")
+            for match in self.fingerprint["similar_reference_cases"]:
+                lines.append(f"  • {match['name']} (similarity {match['similarity']:.3f})")
+        metadata = self.fingerprint["processing_metadata"]
+        lines.append(f"Processing Time: {metadata['processing_time_seconds']:.2f} seconds "
+                     f"({metadata['shared_feature_passes']} shared feature pass)")
+        lines.append("=" * 60)
+        return "\n".join(lines)
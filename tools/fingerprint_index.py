@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Fingerprint Vectors and Reference-Case Similarity Index
+Answers "which known phenomena does this system resemble?" for SOP step 4
+
+Characterizations in validation/reference_cases and Filament outputs are both
+encoded into one fixed-length vector. Tokens from each section (EEPs,
+quantitative signatures, network topology, fractal/temporal dynamics,
+classification tags) are feature-hashed into that section's block of the
+vector, weighted by their stated confidence. Vectors are unit-normalized, so
+cosine similarity is one matrix product against the whole index.
+
+Filament pattern types ("threshold_function") and reference-case signature
+types ("critical_value") come from different vocabularies; both encoders map
+them onto the shared concepts of SIGNATURE_VOCABULARY before hashing.
+"""
+
+import re
+import sys
+import json
+import zlib
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (block name, width); widths sum to the fingerprint dimension
+FINGERPRINT_BLOCKS = [
+    ("eeps", 96),
+    ("signatures", 64),
+    ("topology", 32),
+    ("dynamics", 48),
+    ("tags", 16),
+]
+
+# Relative weight of each block in the final vector
+BLOCK_WEIGHTS = {"eeps": 1.0, "signatures": 0.8, "topology": 0.5, "dynamics": 0.6, "tags": 0.4}
+
+CONFIDENCE_WEIGHTS = {"high": 1.0, "medium": 0.66, "low": 0.33}
+
+# Shared signature concepts: concept -> alias phrases. A label maps to every
+# concept with an alias whose words all occur in it; labels matching no
+# concept keep their own word tokens.
+SIGNATURE_VOCABULARY = {
+    "power_law": ("power_law", "scaling", "scale_free", "heavy_tail", "exponent"),
+    "critical_threshold": ("critical", "threshold", "phase_transition", "onset", "bifurcation", "tipping_point"),
+    "order_parameter": ("order_parameter", "synchronization", "synchrony", "coherence", "phase_locking"),
+    "small_world": ("small_world",),
+    "clustering": ("clustering", "cluster", "modularity", "community"),
+    "hub_structure": ("hub", "heterogeneous", "degree_distribution"),
+    "cascade": ("cascade", "avalanche", "contagion", "propagation"),
+    "self_similarity": ("fractal", "self_similarity", "self_similar", "recursive_structure"),
+    "oscillation": ("oscillation", "periodic", "limit_cycle"),
+    "pattern_selection": ("wavenumber", "wavelength", "pattern_selection"),
+    "signal_filtering": ("snr", "filtering", "selective", "bottleneck"),
+}
+
+STOPWORDS = {"the", "and", "for", "with", "from", "into", "eep", "of", "to", "in", "on", "a", "an", "or"}
+
+DEFAULT_REFERENCE_DIR = Path(__file__).resolve().parent.parent / "validation" / "reference_cases"
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Normalize a name or label into word tokens
+
+    EEP ids and display names meet on the same tokens:
+    "EEP_PATTERN_FORMATION" and "Pattern Formation / Novelty Generation"
+    both yield "pattern" and "formation".
+    """
+    words = re.split(r"[^a-z0-9]+", str(text).lower())
+    return [w for w in words if len(w) > 2 and w not in STOPWORDS]
+
+
+_CONCEPT_ALIASES = [(concept, [set(tokenize(alias)) for alias in aliases])
+                    for concept, aliases in SIGNATURE_VOCABULARY.items()]
+
+
+def signature_concepts(label: Any, *context: Any) -> List[str]:
+    """
+    Map a signature label onto SIGNATURE_VOCABULARY concepts
+
+    Args:
+        label: Signature or pattern type
+        context: Further labels (e.g. the display name) searched for concepts
+            but not used as fallback tokens
+
+    Returns:
+        Matching concept names, or the word tokens of label if none match
+    """
+    words = set(tokenize(label))
+    for text in context:
+        words.update(tokenize(text))
+    concepts = [concept for concept, aliases in _CONCEPT_ALIASES
+                if any(alias and alias <= words for alias in aliases)]
+    return concepts or tokenize(label)
+
+
+def confidence_weight(value: Any, default: float = 0.5) -> float:
+    """Map a "High"/"Medium"/"Low" label or a numeric confidence to a weight"""
+    if isinstance(value, dict):
+        value = value.get("level")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return CONFIDENCE_WEIGHTS.get(value.strip().lower().split()[0] if value.strip() else "", default)
+    return default
+
+
+def find_section(document: Any, key: str) -> Any:
+    """
+    Depth-first search for the first value stored under key
+
+    Reference cases place the same sections at different depths (e.g. under
+    mathematical_enhancement_data or directly under phenomenon_characterization).
+    """
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        children = document.values()
+    elif isinstance(document, list):
+        children = document
+    else:
+        return None
+    for child in children:
+        found = find_section(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+class FingerprintEncoder:
+    """Encodes characterizations and Filament outputs into fingerprint vectors"""
+
+    def __init__(self, blocks: List[Tuple[str, int]] = None):
+        self.blocks = list(blocks or FINGERPRINT_BLOCKS)
+        self.offsets = {}
+        offset = 0
+        for name, width in self.blocks:
+            self.offsets[name] = (offset, width)
+            offset += width
+        self.dimension = offset
+
+    def _add(self, vector: np.ndarray, block: str, text: Any, weight: float = 1.0):
+        """Signed feature hashing of every token of text into a block"""
+        self._add_tokens(vector, block, tokenize(text), weight)
+
+    def _add_tokens(self, vector: np.ndarray, block: str, tokens: Iterable[str], weight: float = 1.0):
+        offset, width = self.offsets[block]
+        for token in tokens:
+            h = zlib.crc32(f"{block}:{token}".encode("utf-8"))
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            vector[offset + h % width] += sign * weight
+
+    def _finish(self, vector: np.ndarray) -> np.ndarray:
+        """Normalize each block, apply block weights, then normalize the whole vector"""
+        for name, (offset, width) in self.offsets.items():
+            block = vector[offset:offset + width]
+            norm = np.linalg.norm(block)
+            if norm > 0:
+                block *= BLOCK_WEIGHTS.get(name, 1.0) / norm
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm > 0 else vector).astype(np.float32)
+
+    def encode_characterization(self, document: Dict[str, Any]) -> np.ndarray:
+        """
+        Encode a reference-case characterization document
+
+        Uses individual_eep_characterizations, quantitative_signatures_detected,
+        network_topology_preliminary, fractal_patterns_detected,
+        temporal_dynamics_captured, the order of emergence and classification_tags.
+        """
+        vector = np.zeros(self.dimension)
+
+        for eep in find_section(document, "individual_eep_characterizations") or []:
+            if isinstance(eep, dict):
+                self._add(vector, "eeps", eep.get("eep_name", ""),
+                          confidence_weight(eep.get("confidence_in_identification")))
+
+        for signature in find_section(document, "quantitative_signatures_detected") or []:
+            if isinstance(signature, dict):
+                self._add_tokens(vector, "signatures", signature_concepts(signature.get("signature_type", "")),
+                                 confidence_weight(signature.get("confidence")))
+
+        topology = find_section(document, "network_topology_preliminary") or {}
+        assessment = topology.get("topology_assessment", {}) if isinstance(topology, dict) else {}
+        for field in ("connectivity_pattern", "modularity_estimate", "network_size_estimate"):
+            if assessment.get(field):
+                self._add(vector, "topology", f"{field} {assessment[field]}")
+        for relationship in topology.get("eep_relationships", []) if isinstance(topology, dict) else []:
+            if isinstance(relationship, dict):
+                self._add(vector, "topology", relationship.get("relationship_type", ""), 0.5)
+
+        for pattern in find_section(document, "fractal_patterns_detected") or []:
+            if isinstance(pattern, dict):
+                self._add(vector, "dynamics", pattern.get("pattern_type", ""),
+                          confidence_weight(pattern.get("confidence")))
+        for dynamic in find_section(document, "temporal_dynamics_captured") or []:
+            if isinstance(dynamic, dict):
+                self._add(vector, "dynamics", dynamic.get("dynamic_type", ""),
+                          confidence_weight(dynamic.get("confidence")))
+
+        for tag in find_section(document, "classification_tags") or []:
+            self._add(vector, "tags", tag)
+        order = find_section(document, "primary_order")
+        if order:
+            self._add(vector, "tags", order)
+
+        return self._finish(vector)
+
+    def encode_filament_output(self, output: Dict[str, Any]) -> np.ndarray:
+        """
+        Encode a FilamentEvent final output or a ConstellationEvent fingerprint
+        """
+        vector = np.zeros(self.dimension)
+
+        if "eeps_analyzed" in output:
+            for eep_id, results in output["eeps_analyzed"].items():
+                weight = results.get("overall_confidence", 0.0)
+                self._add(vector, "eeps", results.get("eep_name", eep_id), weight)
+                for pattern in results.get("patterns", []):
+                    self._add_tokens(vector, "signatures",
+                                     signature_concepts(pattern.get("type", ""), pattern.get("name", "")),
+                                     pattern.get("confidence", 0.5))
+            network = output.get("shared_features", {}).get("network", {})
+            if network.get("hub_fraction", 0.0) > 0.05:
+                self._add(vector, "topology", "connectivity_pattern hub_and_spoke")
+            if network.get("small_world_coefficient", 0.0) > 1.5:
+                self._add(vector, "topology", "connectivity_pattern small_world")
+            if network.get("global_clustering", 0.0) > 0.4:
+                self._add(vector, "topology", "modularity_estimate high")
+        else:
+            eep = output.get("eep_analyzed", {})
+            summary = output.get("results", {}).get("signature_detection_summary", {})
+            self._add(vector, "eeps", eep.get("eep_name") or eep.get("eep_id", ""),
+                      summary.get("overall_confidence", 0.5))
+            for name, signature in output.get("results", {}).get("detected_signatures", {}).items():
+                self._add_tokens(vector, "signatures", signature_concepts(signature.get("type", ""), name),
+                                 signature.get("confidence", 0.5))
+
+        return self._finish(vector)
+
+
+def load_reference_cases(directory: Path = DEFAULT_REFERENCE_DIR) -> List[Tuple[Path, Dict[str, Any]]]:
+    """
+    Parse every reference-case YAML file in a directory
+
+    Documents are read section by section (lazy_yaml), so a syntax error
+    costs only the second-level section containing it; that section is logged
+    and left out. Files with no readable section are skipped.
+    """
+    import yaml
+    from lazy_yaml import LazyYAMLDocument
+
+    cases = []
+    for path in sorted(Path(directory).glob("*.yaml")):
+        lazy = LazyYAMLDocument(path)
+        document = {}
+        try:
+            sections = lazy.sections()
+        except (OSError, yaml.YAMLError) as e:
+            logger.warning(f"Skipping unreadable reference case {path.name}: {e}")
+            continue
+        for section in sections:
+            try:
+                document[section] = lazy.get(section)
+                continue
+            except yaml.YAMLError:
+                pass
+            document[section] = {}
+            for subsection in lazy.subsections(section):
+                try:
+                    document[section][subsection] = lazy.get_path(section, subsection)
+                except yaml.YAMLError as e:
+                    logger.warning(f"{path.name}: skipping unreadable section {section}.{subsection}: "
+                                   f"{str(e).splitlines()[0]}")
+        if any(document.values()):
+            cases.append((path, document))
+    return cases
+
+
+class FingerprintIndex:
+    """
+    Persisted matrix of unit fingerprint vectors with batched top-k cosine queries
+
+    Vectors are float32 rows of one matrix; a query batch is scored against
+    the index in row blocks bounded by max_block_bytes, and the k best rows
+    per query are taken with argpartition, so tens of thousands of cases cost
+    one GEMM per block.
+    """
+
+    def __init__(self, encoder: Optional[FingerprintEncoder] = None,
+                 max_block_bytes: int = 64 * 1024 * 1024):
+        self.encoder = encoder or FingerprintEncoder()
+        self.max_block_bytes = max_block_bytes
+        self.vectors = np.zeros((0, self.encoder.dimension), dtype=np.float32)
+        self.case_ids: List[str] = []
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.case_ids)
+
+    def add_batch(self, case_ids: Iterable[str], names: Iterable[str], vectors: np.ndarray):
+        """Append cases; an existing case id is replaced, and within the batch the last row wins"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape[1] != self.encoder.dimension:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index "
+                             f"dimension {self.encoder.dimension}")
+        case_ids, names = list(case_ids), list(names)
+        last_rows = {case_id: i for i, case_id in enumerate(case_ids)}
+        if len(last_rows) < len(case_ids):
+            rows = sorted(last_rows.values())
+            vectors = vectors[rows]
+            case_ids = [case_ids[i] for i in rows]
+            names = [names[i] for i in rows]
+        replaced = set(case_ids)
+        keep = [i for i, case_id in enumerate(self.case_ids) if case_id not in replaced]
+        if len(keep) < len(self.case_ids):
+            self.vectors = self.vectors[keep]
+            self.case_ids = [self.case_ids[i] for i in keep]
+            self.names = [self.names[i] for i in keep]
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.case_ids.extend(case_ids)
+        self.names.extend(names)
+
+    def add(self, case_id: str, name: str, vector: np.ndarray):
+        self.add_batch([case_id], [name], vector[np.newaxis, :])
+
+    def add_reference_cases(self, directory: Path = DEFAULT_REFERENCE_DIR) -> int:
+        """
+        Encode and add every parsable reference case in a directory
+
+        Returns:
+            Number of cases added
+        """
+        cases = load_reference_cases(directory)
+        ids, names, vectors = [], [], []
+        for path, document in cases:
+            metadata = document.get("characterization_metadata", {})
+            ids.append(str(metadata.get("characterization_id") or path.stem))
+            names.append(str(metadata.get("phenomenon_name_processed") or path.stem))
+            vectors.append(self.encoder.encode_characterization(document))
+        if vectors:
+            self.add_batch(ids, names, np.vstack(vectors))
+        return len(vectors)
+
+    def query(self, vectors: np.ndarray, k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Top-k most similar cases for each query vector
+
+        Args:
+            vectors: (dimension,) or (n_queries, dimension) fingerprint vectors
+            k: Matches returned per query
+
+        Returns:
+            One list of {case_id, name, similarity} per query, best first
+        """
+        Q = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(Q, axis=1, keepdims=True)
+        Q = Q / np.where(norms > 0, norms, 1.0)
+        n = len(self)
+        k = min(k, n)
+        if k == 0:
+            return [[] for _ in range(len(Q))]
+
+        best_scores = np.full((len(Q), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(Q), 0), dtype=np.int64)
+        block = max(k, self.max_block_bytes // (4 * max(len(Q), 1)))
+        for start in range(0, n, block):
+            scores = Q @ self.vectors[start:start + block].T
+            rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            scores = np.hstack([best_scores, scores])
+            rows = np.hstack([best_rows, rows])
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                rows = np.take_along_axis(rows, top, axis=1)
+            best_scores, best_rows = scores, rows
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [[{"case_id": self.case_ids[row], "name": self.names[row], "similarity": round(float(score), 4)}
+                 for row, score in zip(rows, scores)]
+                for rows, scores in zip(best_rows, best_scores)]
+
+    def query_output(self, output: Dict[str, Any], k: int = 5) -> List[Dict[str, Any]]:
+        """Top-k reference cases resembling a Filament output"""
+        return self.query(self.encoder.encode_filament_output(output), k)[0]
+
+    def save(self, path: str):
+        """Write the index as a compressed .npz archive"""
+        np.savez_compressed(path, vectors=self.vectors,
+                            case_ids=np.array(self.case_ids, dtype=str),
+                            names=np.array(self.names, dtype=str),
+                            blocks=json.dumps(self.encoder.blocks))
+
+    @classmethod
+    def load(cls, path: str) -> "FingerprintIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            index = cls(FingerprintEncoder([tuple(b) for b in json.loads(str(data["blocks"]))]))
+            index.vectors = data["vectors"].astype(np.float32)
+            index.case_ids = data["case_ids"].tolist()
+            index.names = data["names"].tolist()
+        return index
+
+
+_default_index: Optional[FingerprintIndex] = None
+
+
+def get_default_index() -> FingerprintIndex:
+    """Process-wide index built from validation/reference_cases on first use"""
+    global _default_index
+    if _default_index is None:
+        _default_index = FingerprintIndex()
+        _default_index.add_reference_cases()
+    return _default_index
+
+
+def run_fingerprint_synthesis(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analysis plugin for SOP step fingerprint_synthesis_and_integration
+
+    Encodes the Filament output in the context (a FilamentEvent final output
+    or constellation fingerprint under "filament_output") and reports the
+    most similar reference cases as patterns.
+    """
+    index = context.get("fingerprint_index") or get_default_index()
+    output = context.get("filament_output")
+    if output is None:
+        eep = context.get("ler_retrieved_data", {}).get("eep_definition", {})
+        output = {"eep_analyzed": {"eep_id": eep.get("eep_id"), "eep_name": eep.get("name") or eep.get("eep_name")}}
+
+    matches = index.query_output(output, k=context.get("top_k", 3))
+    patterns = [{
+        "name": f"Resembles {match['name']}",
+        "type": "reference_case_similarity",
+        "confidence": max(0.0, match["similarity"]),
+        "evidence": f"Cosine similarity {match['similarity']} to reference case {match['case_id']}"
+    } for match in matches]
+
+    return {
+        "patterns_found": len(patterns),
+        "overall_confidence": patterns[0]["confidence"] if patterns else 0.0,
+        "status": "fingerprint_synthesis_complete" if patterns else "no_reference_cases",
+        "patterns": patterns,
+        "similar_reference_cases": matches
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query the reference-case fingerprint index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Encode reference cases into an index file")
+    build.add_argument("--reference-dir", default=str(DEFAULT_REFERENCE_DIR))
+    build.add_argument("--output", required=True, help="Index file (.npz)")
+
+    query = subparsers.add_parser("query", help="Find reference cases similar to a Filament output JSON")
+    query.add_argument("output_json", help="FilamentEvent or constellation output JSON file")
+    query.add_argument("--index", help="Index file (defaults to encoding reference cases on the fly)")
+    query.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    if args.command == "build":
+        index = FingerprintIndex()
+        count = index.add_reference_cases(Path(args.reference_dir))
+        index.save(args.output)
+        print(f"Indexed {count} reference cases ({index.encoder.dimension} dimensions) -> {args.output}")
+        return 0
+
+    index = FingerprintIndex.load(args.index) if args.index else get_default_index()
+    with open(args.output_json, "r", encoding="utf-8") as f:
+        output = json.load(f)
+    for match in index.query_output(output, k=args.k):
+        print(f"{match['similarity']:.4f}  {match['name']}  ({match['case_id']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Interaction Log Ingestion
+Chunked streaming of timestamped interaction-event logs
+
+Event logs are read from CSV, JSONL or a fixed-width binary record file in
+chunks of a fixed number of events. Each chunk is decoded into typed NumPy
+arrays (float64 timestamps, int32 type codes) and folded into incremental
+statistics, so memory use depends on the chunk size and the number of event
+types, never on the length of the log.
+
+Binary logs use EVENT_DTYPE records with the type vocabulary stored in a
+"<path>.types.json" sidecar; convert_to_binary() produces them from CSV/JSONL.
+"""
+
+import csv
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Record layout of binary interaction logs
+EVENT_DTYPE = np.dtype([('timestamp', '<f8'), ('type', '<i4')])
+
+FORMAT_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".bin": "binary",
+    ".events": "binary",
+}
+
+
+def _parse_timestamps(values: List[Any]) -> np.ndarray:
+    """Decode timestamps given as epoch seconds or ISO-8601 strings"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([_parse_timestamp(v) for v in values], dtype=np.float64)
+
+
+def _parse_timestamp(value: Any) -> float:
+    """Decode one timestamp; numeric strings such as "1.5" are epoch seconds"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+class EventChunk:
+    """One decoded chunk of events"""
+
+    __slots__ = ('timestamps', 'type_codes')
+
+    def __init__(self, timestamps: np.ndarray, type_codes: np.ndarray):
+        self.timestamps = timestamps
+        self.type_codes = type_codes
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class InteractionLogReader:
+    """
+    Streams an interaction-event log in fixed-size chunks
+
+    Type names are mapped to stable integer codes as they are first seen; the
+    mapping is available as vocabulary / type_names.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, chunk_size: int = 1_000_000,
+                 timestamp_field: str = "timestamp", type_field: str = "type",
+                 type_names: Optional[List[str]] = None):
+        """
+        Args:
+            path: Log file path
+            fmt: "csv", "jsonl" or "binary" (inferred from the suffix if omitted)
+            chunk_size: Events per chunk
+            timestamp_field: Column/key holding the event time
+            type_field: Column/key holding the interaction type
+            type_names: Known type vocabulary (binary logs read the sidecar otherwise)
+        """
+        self.path = Path(path)
+        self.fmt = fmt or FORMAT_SUFFIXES.get(self.path.suffix.lower())
+        if self.fmt not in ("csv", "jsonl", "binary"):
+            raise ValueError(f"Cannot determine log format for {path}; pass fmt='csv'|'jsonl'|'binary'")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.timestamp_field = timestamp_field
+        self.type_field = type_field
+        self.type_names: List[str] = list(type_names or [])
+        self.vocabulary: Dict[str, int] = {name: i for i, name in enumerate(self.type_names)}
+
+        if self.fmt == "binary" and not self.type_names:
+            sidecar = Path(str(self.path) + ".types.json")
+            if sidecar.exists():
+                self.type_names = json.loads(sidecar.read_text(encoding='utf-8'))
+                self.vocabulary = {name: i for i, name in enumerate(self.type_names)}
+
+    def _encode_types(self, names: List[Any]) -> np.ndarray:
+        """Map type names to codes, vectorized over the chunk's distinct names"""
+        unique, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+        lookup = np.empty(len(unique), dtype=np.int32)
+        for i, name in enumerate(unique.tolist()):
+            code = self.vocabulary.get(name)
+            if code is None:
+                code = len(self.type_names)
+                self.vocabulary[name] = code
+                self.type_names.append(name)
+            lookup[i] = code
+        return lookup[inverse]
+
+    def _iter_csv(self) -> Iterator[EventChunk]:
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            try:
+                ts_col = header.index(self.timestamp_field)
+                type_col = header.index(self.type_field)
+            except ValueError:
+                raise ValueError(f"CSV header must contain '{self.timestamp_field}' and '{self.type_field}'")
+            while True:
+                rows = list(islice(reader, self.chunk_size))
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                yield EventChunk(_parse_timestamps(list(columns[ts_col])),
+                                 self._encode_types(list(columns[type_col])))
+
+    def _iter_jsonl(self) -> Iterator[EventChunk]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            while True:
+                lines = list(islice(f, self.chunk_size))
+                if not lines:
+                    break
+                timestamps, types = [], []
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    timestamps.append(record[self.timestamp_field])
+                    types.append(record[self.type_field])
+                if timestamps:
+                    yield EventChunk(_parse_timestamps(timestamps), self._encode_types(types))
+
+    def _iter_binary(self) -> Iterator[EventChunk]:
+        with open(self.path, 'rb') as f:
+            while True:
+                records = np.fromfile(f, dtype=EVENT_DTYPE, count=self.chunk_size)
+                if len(records) == 0:
+                    break
+                yield EventChunk(records['timestamp'].astype(np.float64, copy=False),
+                                 records['type'].astype(np.int32, copy=False))
+
+    def iter_chunks(self) -> Iterator[EventChunk]:
+        """Yield decoded chunks until the log is exhausted"""
+        if self.fmt == "csv":
+            return self._iter_csv()
+        if self.fmt == "jsonl":
+            return self._iter_jsonl()
+        return self._iter_binary()
+
+
+class InteractionStatistics:
+    """
+    Incremental per-type frequencies, inter-event intervals and windowed counts
+
+    Timestamps are expected to be non-decreasing across the log. Chunks that
+    are internally out of order are sorted. Events older than the last
+    timestamp of the previous chunks are only counted in out_of_order_events:
+    they are left out of total_events, type_counts, the interval statistics
+    and the windows, which have already moved past them.
+    """
+
+    # Log-spaced interval histogram edges (seconds)
+    INTERVAL_BINS = np.logspace(-6, 9, 91)
+
+    def __init__(self, window_seconds: float = 60.0, recent_windows: int = 1024):
+        """
+        Args:
+            window_seconds: Width of the rolling count windows
+            recent_windows: Number of most recent non-empty windows kept verbatim
+        """
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        self.window_seconds = float(window_seconds)
+        self.total_events = 0
+        self.out_of_order_events = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+        self.type_counts = np.zeros(0, dtype=np.int64)
+        self._last_by_type = np.zeros(0, dtype=np.float64)
+        # Per-type interval accumulators: count, sum, sum of squares, min, max
+        self._iv_count = np.zeros(0, dtype=np.int64)
+        self._iv_sum = np.zeros(0, dtype=np.float64)
+        self._iv_sumsq = np.zeros(0, dtype=np.float64)
+        self._iv_min = np.zeros(0, dtype=np.float64)
+        self._iv_max = np.zeros(0, dtype=np.float64)
+        self.interval_histogram = np.zeros(len(self.INTERVAL_BINS) + 1, dtype=np.int64)
+
+        # Rolling windows: one open window plus summaries of completed ones
+        self._window_origin = None
+        self._open_window = None
+        self._open_counts = np.zeros(0, dtype=np.int64)
+        self._first_window = None
+        self._last_closed_window = None
+        self._win_sum = np.zeros(0, dtype=np.float64)
+        self._win_sumsq = np.zeros(0, dtype=np.float64)
+        self._win_max = np.zeros(0, dtype=np.int64)
+        self._win_total_max = 0
+        self.recent_window_counts = deque(maxlen=recent_windows)
+
+    def _ensure_types(self, n_types: int):
+        """Grow per-type arrays when new type codes appear"""
+        current = len(self.type_counts)
+        if n_types <= current:
+            return
+        grow = n_types - current
+        self.type_counts = np.concatenate([self.type_counts, np.zeros(grow, dtype=np.int64)])
+        self._last_by_type = np.concatenate([self._last_by_type, np.full(grow, np.nan)])
+        self._iv_count = np.concatenate([self._iv_count, np.zeros(grow, dtype=np.int64)])
+        self._iv_sum = np.concatenate([self._iv_sum, np.zeros(grow)])
+        self._iv_sumsq = np.concatenate([self._iv_sumsq, np.zeros(grow)])
+        self._iv_min = np.concatenate([self._iv_min, np.full(grow, np.inf)])
+        self._iv_max = np.concatenate([self._iv_max, np.full(grow, -np.inf)])
+        self._open_counts = np.concatenate([self._open_counts, np.zeros(grow, dtype=np.int64)])
+        self._win_sum = np.concatenate([self._win_sum, np.zeros(grow)])
+        self._win_sumsq = np.concatenate([self._win_sumsq, np.zeros(grow)])
+        self._win_max = np.concatenate([self._win_max, np.zeros(grow, dtype=np.int64)])
+
+    def update(self, chunk: EventChunk):
+        """Fold one chunk into the running statistics"""
+        if len(chunk) == 0:
+            return
+        ts, codes = chunk.timestamps, chunk.type_codes
+        if np.any(ts[1:] < ts[:-1]):
+            order = np.argsort(ts, kind='stable')
+            ts, codes = ts[order], codes[order]
+        if self.last_timestamp is not None and ts[0] < self.last_timestamp:
+            late = ts < self.last_timestamp
+            self.out_of_order_events += int(late.sum())
+            ts, codes = ts[~late], codes[~late]
+            if len(ts) == 0:
+                return
+
+        n_types = int(codes.max()) + 1
+        self._ensure_types(n_types)
+        n_types = len(self.type_counts)
+        self.type_counts += np.bincount(codes, minlength=n_types)
+        self.total_events += len(ts)
+
+        # Global inter-event intervals
+        if self.last_timestamp is not None:
+            intervals = np.diff(ts, prepend=self.last_timestamp)
+        else:
+            intervals = np.diff(ts)
+            self.first_timestamp = float(ts[0])
+        self.interval_histogram += np.bincount(np.searchsorted(self.INTERVAL_BINS, intervals),
+                                               minlength=len(self.interval_histogram))
+        self.last_timestamp = float(ts[-1])
+
+        self._update_type_intervals(ts, codes)
+        self._update_windows(ts, codes)
+
+    def _update_type_intervals(self, ts: np.ndarray, codes: np.ndarray):
+        """Per-type intervals: group by type, diff within groups, bridge from the previous chunk"""
+        order = np.argsort(codes, kind='stable')
+        sorted_codes, sorted_ts = codes[order], ts[order]
+        previous = np.empty_like(sorted_ts)
+        previous[1:] = sorted_ts[:-1]
+        group_start = np.ones(len(sorted_codes), dtype=bool)
+        group_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+        previous[group_start] = self._last_by_type[sorted_codes[group_start]]
+
+        intervals = sorted_ts - previous
+        valid = ~np.isnan(intervals)
+        iv, iv_codes = intervals[valid], sorted_codes[valid]
+        n_types = len(self.type_counts)
+        self._iv_count += np.bincount(iv_codes, minlength=n_types)
+        self._iv_sum += np.bincount(iv_codes, weights=iv, minlength=n_types)
+        self._iv_sumsq += np.bincount(iv_codes, weights=iv * iv, minlength=n_types)
+        np.minimum.at(self._iv_min, iv_codes, iv)
+        np.maximum.at(self._iv_max, iv_codes, iv)
+
+        group_end = np.ones(len(sorted_codes), dtype=bool)
+        group_end[:-1] = group_start[1:]
+        self._last_by_type[sorted_codes[group_end]] = sorted_ts[group_end]
+
+    def _close_windows(self, indices: np.ndarray, counts: np.ndarray):
+        """Fold completed windows (rows of per-type counts) into the summaries"""
+        if len(indices) == 0:
+            return
+        self._win_sum += counts.sum(axis=0)
+        self._win_sumsq += (counts.astype(np.float64) ** 2).sum(axis=0)
+        self._win_max = np.maximum(self._win_max, counts.max(axis=0))
+        totals = counts.sum(axis=1)
+        self._win_total_max = max(self._win_total_max, int(totals.max()))
+        keep = self.recent_window_counts.maxlen or len(totals)
+        for index, total in zip(indices[-keep:].tolist(), totals[-keep:].tolist()):
+            self.recent_window_counts.append((self._window_origin + index * self.window_seconds, total))
+        self._last_closed_window = int(indices[-1])
+
+    def _update_windows(self, ts: np.ndarray, codes: np.ndarray):
+        if self._window_origin is None:
+            self._window_origin = float(ts[0])
+            self._first_window = 0
+        window_idx = np.floor((ts - self._window_origin) / self.window_seconds).astype(np.int64)
+        indices, inverse = np.unique(window_idx, return_inverse=True)
+        n_types = len(self.type_counts)
+        counts = np.bincount(inverse * n_types + codes,
+                             minlength=len(indices) * n_types).reshape(len(indices), n_types)
+
+        if self._open_window is not None:
+            if indices[0] == self._open_window:
+                counts[0] += self._open_counts
+            else:
+                self._close_windows(np.array([self._open_window]), self._open_counts[np.newaxis, :])
+
+        self._close_windows(indices[:-1], counts[:-1])
+        self._open_window = int(indices[-1])
+        self._open_counts = counts[-1].copy()
+
+    def finalize(self):
+        """Close the open window; call once after the last chunk"""
+        if self._open_window is not None:
+            self._close_windows(np.array([self._open_window]), self._open_counts[np.newaxis, :])
+            self._open_window = None
+            self._open_counts = np.zeros_like(self._open_counts)
+
+    def summary(self, type_names: List[str]) -> Dict[str, Any]:
+        """
+        Summarize the statistics gathered so far
+
+        Args:
+            type_names: Names for type codes (InteractionLogReader.type_names)
+
+        Returns:
+            Dict with totals, per-type frequencies, intervals and window counts
+        """
+        n_windows = 0
+        if self._last_closed_window is not None:
+            n_windows = self._last_closed_window - self._first_window + 1
+        span = (self.last_timestamp - self.first_timestamp) if self.total_events else 0.0
+
+        per_type = {}
+        for code, name in enumerate(type_names[:len(self.type_counts)]):
+            n_iv = int(self._iv_count[code])
+            mean_iv = float(self._iv_sum[code] / n_iv) if n_iv else None
+            per_type[name] = {
+                "frequency": int(self.type_counts[code]),
+                "rate_per_second": round(float(self.type_counts[code] / span), 6) if span > 0 else None,
+                "inter_event_interval": {
+                    "count": n_iv,
+                    "mean": round(mean_iv, 6) if n_iv else None,
+                    "std": round(float(np.sqrt(max(self._iv_sumsq[code] / n_iv - mean_iv ** 2, 0.0))), 6) if n_iv else None,
+                    "min": round(float(self._iv_min[code]), 6) if n_iv else None,
+                    "max": round(float(self._iv_max[code]), 6) if n_iv else None
+                },
+                "window_counts": {
+                    "mean": round(float(self._win_sum[code] / n_windows), 4) if n_windows else None,
+                    "std": round(float(np.sqrt(max(self._win_sumsq[code] / n_windows - (self._win_sum[code] / n_windows) ** 2, 0.0))), 4) if n_windows else None,
+                    "max": int(self._win_max[code])
+                }
+            }
+
+        return {
+            "total_events": self.total_events,
+            "out_of_order_events": self.out_of_order_events,
+            "time_span_seconds": span,
+            "window_seconds": self.window_seconds,
+            "windows": n_windows,
+            "max_window_count": self._win_total_max,
+            "interval_histogram": {
+                "bin_edges_seconds": self.INTERVAL_BINS.tolist(),
+                "counts": self.interval_histogram.tolist()
+            },
+            "per_type": per_type
+        }
+
+
+def ingest_interaction_log(path: str, fmt: Optional[str] = None, chunk_size: int = 1_000_000,
+                           window_seconds: float = 60.0, **reader_kwargs) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Stream a log and compute its interaction statistics
+
+    Args:
+        path: Log file path
+        fmt: Log format (inferred from the suffix if omitted)
+        chunk_size: Events per chunk
+        window_seconds: Rolling window width
+
+    Returns:
+        (summary, interaction_patterns) where interaction_patterns uses the
+        [{type, frequency}] structure of the Filament query test_data
+    """
+    reader = InteractionLogReader(path, fmt, chunk_size, **reader_kwargs)
+    stats = InteractionStatistics(window_seconds)
+    chunks = 0
+    for chunk in reader.iter_chunks():
+        stats.update(chunk)
+        chunks += 1
+    stats.finalize()
+    logger.debug(f"Ingested {stats.total_events} events from {path} in {chunks} chunks")
+
+    summary = stats.summary(reader.type_names)
+    summary["chunks"] = chunks
+    patterns = [{"type": name, "frequency": info["frequency"]}
+                for name, info in summary["per_type"].items()]
+    return summary, patterns
+
+
+def convert_to_binary(source: str, destination: str, fmt: Optional[str] = None,
+                      chunk_size: int = 1_000_000, **reader_kwargs) -> int:
+    """
+    Convert a CSV/JSONL log to EVENT_DTYPE records plus a type sidecar
+
+    Returns:
+        Number of events written
+    """
+    reader = InteractionLogReader(source, fmt, chunk_size, **reader_kwargs)
+    written = 0
+    with open(destination, 'wb') as out:
+        for chunk in reader.iter_chunks():
+            records = np.empty(len(chunk), dtype=EVENT_DTYPE)
+            records['timestamp'] = chunk.timestamps
+            records['type'] = chunk.type_codes
+            records.tofile(out)
+            written += len(chunk)
+    Path(str(destination) + ".types.json").write_text(json.dumps(reader.type_names), encoding='utf-8')
+    return written
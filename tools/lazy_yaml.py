@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Section-Lazy YAML Loading
+Parse only the parts of a large characterization document a consumer asks for
+
+On first access a document's top-level and second-level section offsets are
+indexed by a byte-level line scan (no YAML parsing). Reading a section seeks
+to its byte range and feeds only those bytes to the YAML parser (the libyaml
+C parser when available); parsed sections are cached on the document. Indexes
+are cached per (path, mtime, size) for the process, and optionally on disk,
+so listing or filtering a corpus by characterization_metadata never parses
+the bulky bodies.
+
+Documents the line scan cannot index safely (top-level sequences, multiple
+documents, anchors/aliases) are loaded whole on first access instead.
+"""
+
+import re
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Callable
+
+logger = logging.getLogger(__name__)
+
+# A plain or quoted mapping key at the start of a line's content
+_KEY_RE = re.compile(rb'(?:"((?:[^"\\]|\\.)*)"|\'((?:[^\']|\'\')*)\'|([^\s#\'"\-?:,\[\]{}&*!|>%@`][^#]*?))\s*:(?:\s|$)')
+# Value part that opens a block scalar (| or >, optional indicators)
+_BLOCK_SCALAR_RE = re.compile(rb':\s+[|>][-+0-9]*\s*(?:#.*)?$')
+# Anchor definitions; aliases to them could cross section boundaries
+_ANCHOR_RE = re.compile(rb'(?:^|[\s\[{,])&[A-Za-z0-9_-]+(?:\s|$)', re.MULTILINE)
+
+# (path, mtime_ns, size) -> index
+_INDEX_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _yaml_loader():
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _key_text(match) -> str:
+    double, single, plain = match.groups()
+    if double is not None:
+        return double.decode("utf-8")
+    if single is not None:
+        return single.decode("utf-8").replace("''", "'")
+    return plain.decode("utf-8").strip()
+
+
+def index_sections(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Index top-level and second-level mapping keys of a block-style YAML document
+
+    Args:
+        data: Raw document bytes
+
+    Returns:
+        {"sections": {key: {"start", "end", "children": {key: {"start", "end"}}}}}
+        with byte offsets of whole lines, or None if the document needs a full parse
+    """
+    if _ANCHOR_RE.search(data):
+        return None
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    current = None          # top-level section being scanned
+    child = None            # second-level entry being scanned
+    child_indent = None     # indentation of current's child keys
+    block_indent = None     # inside a block scalar opened at this indentation
+    offset = 0
+
+    for raw in data.splitlines(keepends=True):
+        start, offset = offset, offset + len(raw)
+        line = raw.rstrip(b"\r\n")
+        content = line.lstrip(b" ")
+        if not content.strip() or content.startswith(b"#"):
+            continue
+        indent = len(line) - len(content)
+
+        if block_indent is not None:
+            if indent > block_indent:
+                continue
+            block_indent = None
+
+        if indent == 0:
+            if content.startswith((b"---", b"...", b"%", b"-", b"\t")):
+                if content.startswith(b"---") and not sections:
+                    continue  # leading document marker
+                return None
+            match = _KEY_RE.match(content)
+            if not match:
+                return None
+            if current:
+                current["end"] = start
+            if child:
+                child["end"] = start
+            current = {"start": start, "end": None, "children": {}}
+            sections[_key_text(match)] = current
+            child, child_indent = None, None
+            if _BLOCK_SCALAR_RE.search(content):
+                block_indent = 0
+            continue
+
+        if current is None:
+            return None
+        if child_indent is None:
+            child_indent = indent
+        if indent == child_indent:
+            match = _KEY_RE.match(content)
+            if match:
+                if child:
+                    child["end"] = start
+                child = {"start": start, "end": None}
+                current["children"][_key_text(match)] = child
+                if _BLOCK_SCALAR_RE.search(content):
+                    block_indent = indent
+        elif indent < child_indent:
+            return None
+
+    if current:
+        current["end"] = offset
+    if child:
+        child["end"] = offset
+    return {"sections": sections}
+
+
+class LazyYAMLDocument:
+    """
+    A YAML document whose sections are parsed on demand
+
+    Top-level sections are read with get()/[]; second-level sections with
+    get_path(). Values are cached, so each byte range is parsed at most once.
+    """
+
+    def __init__(self, path, index_dir: Optional[str] = None):
+        """
+        Args:
+            path: YAML file
+            index_dir: Optional directory for persisted section indexes
+        """
+        self.path = Path(path)
+        self.index_dir = Path(index_dir) if index_dir else None
+        self._index = None
+        self._full = None
+        self._sections: Dict[str, Any] = {}
+        self._children: Dict[Tuple[str, str], Any] = {}
+        self.bytes_parsed = 0
+
+    # Indexing
+
+    def _cache_key(self) -> Tuple[str, int, int]:
+        stat = self.path.stat()
+        return (str(self.path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def _index_file(self, key: Tuple[str, int, int]) -> Path:
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()[:32]
+        return self.index_dir / f"{digest}.json"
+
+    def _ensure_index(self):
+        if self._index is not None or self._full is not None:
+            return
+        key = self._cache_key()
+        index = _INDEX_CACHE.get(key)
+        if index is None and self.index_dir:
+            try:
+                with open(self._index_file(key), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+        if index is None:
+            with open(self.path, "rb") as f:
+                index = index_sections(f.read()) or {"sections": None}
+            if self.index_dir:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                with open(self._index_file(key), "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+        _INDEX_CACHE[key] = index
+
+        if index["sections"] is None:
+            logger.debug(f"{self.path.name}: not indexable, loading whole document")
+            self._full = self._parse_range(0, None) or {}
+        else:
+            self._index = index["sections"]
+
+    def _parse_range(self, start: int, end: Optional[int]) -> Any:
+        import yaml
+
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+        self.bytes_parsed += len(data)
+        return yaml.load(data.decode("utf-8"), Loader=_yaml_loader())
+
+    # Access
+
+    def sections(self) -> List[str]:
+        """Top-level keys, without parsing any values"""
+        self._ensure_index()
+        if self._full is not None:
+            return list(self._full)
+        return list(self._index)
+
+    keys = sections
+
+    def subsections(self, section: str) -> List[str]:
+        """Second-level keys of a top-level section, without parsing any values"""
+        self._ensure_index()
+        if self._full is not None:
+            value = self._full.get(section)
+            return list(value) if isinstance(value, dict) else []
+        entry = self._index.get(section)
+        return list(entry["children"]) if entry else []
+
+    def __contains__(self, section: str) -> bool:
+        return section in self.sections()
+
+    def get(self, section: str, default: Any = None) -> Any:
+        """Parsed value of a top-level section"""
+        self._ensure_index()
+        if self._full is not None:
+            return self._full.get(section, default)
+        if section in self._sections:
+            return self._sections[section]
+        entry = self._index.get(section)
+        if entry is None:
+            return default
+        parsed = self._parse_range(entry["start"], entry["end"]) or {}
+        value = parsed.get(section)
+        self._sections[section] = value
+        return value
+
+    def __getitem__(self, section: str) -> Any:
+        if section not in self:
+            raise KeyError(section)
+        return self.get(section)
+
+    def get_path(self, section: str, subsection: str, default: Any = None) -> Any:
+        """Parsed value of a second-level section, parsing only its byte range"""
+        self._ensure_index()
+        if self._full is not None or section in self._sections:
+            parent = self.get(section)
+            return parent.get(subsection, default) if isinstance(parent, dict) else default
+        if (section, subsection) in self._children:
+            return self._children[(section, subsection)]
+        entry = self._index.get(section, {}).get("children", {}).get(subsection)
+        if entry is None:
+            return default
+        parsed = self._parse_range(entry["start"], entry["end"]) or {}
+        value = parsed.get(subsection) if isinstance(parsed, dict) else None
+        self._children[(section, subsection)] = value
+        return value
+
+    def load_all(self) -> Dict[str, Any]:
+        """The whole document, assembled from (cached) sections"""
+        return {section: self.get(section) for section in self.sections()}
+
+
+class LazyCorpus:
+    """
+    A directory of characterization documents listed and filtered by metadata
+
+    Only the metadata section of each document is parsed for listing and
+    filtering; other sections are parsed when a consumer reads them.
+    """
+
+    def __init__(self, directory, pattern: str = "*.yaml",
+                 metadata_section: str = "characterization_metadata",
+                 index_dir: Optional[str] = None):
+        self.directory = Path(directory)
+        self.metadata_section = metadata_section
+        self.documents = [LazyYAMLDocument(path, index_dir)
+                          for path in sorted(self.directory.glob(pattern))]
+
+    def __iter__(self) -> Iterator[LazyYAMLDocument]:
+        return iter(self.documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def metadata(self, document: LazyYAMLDocument) -> Dict[str, Any]:
+        """A document's metadata section ({} if missing or unparsable)"""
+        try:
+            return document.get(self.metadata_section) or {}
+        except Exception as e:
+            logger.warning(f"Unreadable metadata in {document.path.name}: {e}")
+            return {}
+
+    def list(self) -> List[Tuple[Path, Dict[str, Any]]]:
+        """(path, metadata) for every document"""
+        return [(document.path, self.metadata(document)) for document in self.documents]
+
+    def filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[LazyYAMLDocument]:
+        """Documents whose metadata satisfies predicate"""
+        return [document for document in self.documents if predicate(self.metadata(document))]
+
+    def where(self, **criteria) -> List[LazyYAMLDocument]:
+        """
+        Documents whose metadata fields match every criterion
+
+        A criterion matches a list field if the value is an element of the
+        list, and a string field if it equals the value (case-insensitive).
+        """
+        def matches(metadata: Dict[str, Any]) -> bool:
+            for field, expected in criteria.items():
+                value = metadata.get(field)
+                if isinstance(value, list):
+                    if expected not in value:
+                        return False
+                elif str(value).lower() != str(expected).lower():
+                    return False
+            return True
+        return self.filter(matches)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List a characterization corpus by metadata without parsing bodies")
+    parser.add_argument("directory", help="Directory of characterization YAML files")
+    parser.add_argument("--where", action="append", default=[], metavar="FIELD=VALUE",
+                        help="Only list documents whose metadata FIELD matches VALUE")
+    parser.add_argument("--section", metavar="KEY[.SUBKEY]",
+                        help="Print one section of each listed document as JSON")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    corpus = LazyCorpus(args.directory)
+    criteria = dict(item.split("=", 1) for item in args.where)
+    documents = corpus.where(**criteria) if criteria else list(corpus)
+    for document in documents:
+        metadata = corpus.metadata(document)
+        print(f"{document.path.name}: {metadata.get('phenomenon_name_processed', '?')} "
+              f"[{metadata.get('characterization_status', '?')}] "
+              f"sections={document.sections()} parsed={document.bytes_parsed}B")
+        if args.section:
+            section, _, subsection = args.section.partition(".")
+            value = document.get_path(section, subsection) if subsection else document.get(section)
+            print(json.dumps(value, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
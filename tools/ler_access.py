@@ -1,11 +1,13 @@
 import os
-import yaml
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from ler_records import EEPRecord, SOPRecord, StepRecord
+from metrics import get_default_metrics
+
+# Logging is configured by the entry point (see __main__ below), not at import
 logger = logging.getLogger(__name__)
 
 class LERQueryEngine:
@@ -14,34 +16,132 @@ class LERQueryEngine:
     Provides programmatic interface to EEP definitions, SOPs, and patterns
     """
     
-    def __init__(self, ler_root_path: str = ".."):
+    def __init__(self, ler_root_path: str = "..", sqlite_path: Optional[str] = None):
         """
         Initialize the LER Query Engine
         
         Args:
             ler_root_path: Path to the root of the LER repository
+            sqlite_path: Optional SQLite store (see ler_sqlite_store). When given,
+                the store is brought up to date with the YAML tree and queries
+                run against its indexes instead of loading every definition into memory
         """
         self.ler_root = Path(ler_root_path)
         self.eep_definitions = {}
         self.sop_definitions = {}
         self.signature_patterns = {}
         self.schema = {}
+        # definition id -> source YAML path, and path -> (mtime_ns, size, sha256)
+        self.definition_sources = {}
+        self._content_hashes = {}
+        self.store = None
+        self._signature_matchers = None
+        self._snapshot = None
         
         # Verify LER structure exists
         if not self.ler_root.exists():
             raise FileNotFoundError(f"LER root directory not found: {ler_root_path}")
         
+        if sqlite_path:
+            self._open_store(sqlite_path)
+            return
+        
         # Load all content
-        self._load_schema()
-        self._load_eep_definitions()
-        self._load_sop_definitions()
-        self._load_signature_patterns()
+        with get_default_metrics().timer("ler.load_ms", source="yaml"):
+            self._load_schema()
+            self._load_eep_definitions()
+            self._load_sop_definitions()
+            self._load_signature_patterns()
+            self._signature_matchers = self._compile_signature_matchers()
         
         logger.info(f"LER Query Engine initialized with {len(self.eep_definitions)} EEPs, "
                    f"{len(self.sop_definitions)} SOPs")
 
+    def _open_store(self, sqlite_path: str):
+        """Compile the LER into the SQLite store and expose it through the usual attributes"""
+        from ler_sqlite_store import LERSqliteStore, StoreMapping, SourceMapping
+        
+        self.store = LERSqliteStore(sqlite_path)
+        with get_default_metrics().timer("ler.load_ms", source="sqlite"):
+            self.store.compile(self.ler_root, load_yaml=self._load_yaml_file)
+        self.eep_definitions = StoreMapping(self.store, "eep", EEPRecord.from_dict)
+        self.sop_definitions = StoreMapping(self.store, "sop", SOPRecord.from_dict)
+        self.signature_patterns = StoreMapping(self.store, "pattern")
+        self.definition_sources = SourceMapping(self.store)
+        self.schema = self.store.get_meta("core_schema") or {}
+        
+        logger.info(f"LER Query Engine initialized from {sqlite_path} with "
+                   f"{len(self.eep_definitions)} EEPs, {len(self.sop_definitions)} SOPs")
+
+    def _compile_signature_matchers(self):
+        """Parse every EEP's quantitative signature patterns into vectorized matchers"""
+        from signature_matchers import compile_signature_matchers
+        
+        matchers = compile_signature_matchers(self.eep_definitions)
+        logger.debug(f"Compiled {len(matchers)} signature pattern matchers")
+        return matchers
+
+    @property
+    def signature_matchers(self):
+        """
+        SignatureMatcherSet over all EEPs (see signature_matchers)
+        
+        Compiled at load for YAML trees; with a SQLite store, on first access
+        so opening the store does not decode every definition.
+        """
+        if self._signature_matchers is None:
+            self._signature_matchers = self._compile_signature_matchers()
+        return self._signature_matchers
+
+    def snapshot(self):
+        """
+        Content-addressed snapshot of the LER tree (see ler_snapshot)
+        
+        Rebuilt on each call from the previous one, so only files changed
+        since the last call are read and re-hashed.
+        """
+        from ler_snapshot import LERSnapshot
+        
+        self._snapshot = LERSnapshot.build(self.ler_root, previous=self._snapshot, load_yaml=self._load_yaml_file)
+        return self._snapshot
+
+    @property
+    def ler_version(self) -> str:
+        """Root hash of the current LER snapshot; equal versions mean identical definitions"""
+        return self.snapshot().version
+
+    def apply_source_changes(self, upserts: Dict[str, Dict[str, Tuple[Dict, Path]]],
+                             removed: Dict[str, List[str]]):
+        """
+        Bring loaded definitions up to date with re-read source files
+        
+        Used by ler_sync_server, which detects changed files itself, so a
+        refresh re-parses only those files instead of reloading the LER.
+        
+        Args:
+            upserts: kind ("eep"/"sop") -> definition id -> (document, source path)
+            removed: kind -> ids of definitions whose source disappeared
+        """
+        if self.store is not None:
+            # The store re-reads changed files itself and its mappings are live views
+            self.store.compile(self.ler_root, load_yaml=self._load_yaml_file)
+            self._signature_matchers = None
+            return
+        
+        loaded = {"eep": (self.eep_definitions, EEPRecord), "sop": (self.sop_definitions, SOPRecord)}
+        for kind, (definitions, record) in loaded.items():
+            for definition_id in removed.get(kind, ()):
+                definitions.pop(definition_id, None)
+                self.definition_sources.pop(definition_id, None)
+            for definition_id, (document, path) in upserts.get(kind, {}).items():
+                definitions[definition_id] = record.from_dict(document)
+                self.definition_sources[definition_id] = path
+        if upserts.get("eep") or removed.get("eep"):
+            self._signature_matchers = self._compile_signature_matchers()
+
     def _load_yaml_file(self, file_path: Path) -> Optional[Dict]:
         """Load and parse a YAML file safely"""
+        import yaml  # deferred so importing this module stays cheap
         try:
             if file_path.exists():
                 with open(file_path, 'r', encoding='utf-8') as f:
@@ -68,11 +168,16 @@ class LERQueryEngine:
             logger.warning(f"EEP definitions directory not found: {eep_dir}")
             return
         
+        # Per-file lines only when debug logging is on; counts go to the metrics stream
+        verbose = logger.isEnabledFor(logging.DEBUG)
         for eep_file in eep_dir.glob("*.yaml"):
             eep_data = self._load_yaml_file(eep_file)
             if eep_data and 'eep_id' in eep_data:
-                self.eep_definitions[eep_data['eep_id']] = eep_data
-                logger.debug(f"Loaded EEP: {eep_data['eep_id']}")
+                self.eep_definitions[eep_data['eep_id']] = EEPRecord.from_dict(eep_data)
+                self.definition_sources[eep_data['eep_id']] = eep_file
+                if verbose:
+                    logger.debug(f"Loaded EEP: {eep_data['eep_id']}")
+        get_default_metrics().incr("ler.definitions_loaded", len(self.eep_definitions), kind="eep")
 
     def _load_sop_definitions(self):
         """Load all SOP definition files recursively"""
@@ -81,11 +186,15 @@ class LERQueryEngine:
             logger.warning(f"SOPs directory not found: {sop_dir}")
             return
         
+        verbose = logger.isEnabledFor(logging.DEBUG)
         for sop_file in sop_dir.rglob("*.yaml"):
             sop_data = self._load_yaml_file(sop_file)
             if sop_data and 'sop_id' in sop_data:
-                self.sop_definitions[sop_data['sop_id']] = sop_data
-                logger.debug(f"Loaded SOP: {sop_data['sop_id']}")
+                self.sop_definitions[sop_data['sop_id']] = SOPRecord.from_dict(sop_data)
+                self.definition_sources[sop_data['sop_id']] = sop_file
+                if verbose:
+                    logger.debug(f"Loaded SOP: {sop_data['sop_id']}")
+        get_default_metrics().incr("ler.definitions_loaded", len(self.sop_definitions), kind="sop")
 
     def _load_signature_patterns(self):
         """Load signature pattern definitions"""
@@ -100,6 +209,7 @@ class LERQueryEngine:
                 # Signature patterns might be stored differently
                 pattern_name = pattern_file.stem
                 self.signature_patterns[pattern_name] = pattern_data
+        get_default_metrics().incr("ler.definitions_loaded", len(self.signature_patterns), kind="pattern")
 
     # Core Query Methods
     
@@ -111,7 +221,7 @@ class LERQueryEngine:
             eep_id: EEP identifier (e.g., 'EEP_DISTRIBUTED_INTELLIGENCE')
             
         Returns:
-            Complete EEP definition dict or None if not found
+            EEPRecord or None if not found
         """
         return self.eep_definitions.get(eep_id)
 
@@ -123,7 +233,7 @@ class LERQueryEngine:
             sop_id: SOP identifier (e.g., 'SOP_BASIC_EEP_FINGERPRINTING')
             
         Returns:
-            Complete SOP definition dict or None if not found
+            SOPRecord or None if not found
         """
         return self.sop_definitions.get(sop_id)
 
@@ -136,17 +246,14 @@ class LERQueryEngine:
             step_id: Step identifier within the SOP
             
         Returns:
-            Step definition dict or None if not found
+            StepRecord or None if not found
         """
-        sop = self.get_sop_definition(sop_id)
-        if not sop or 'steps' not in sop:
-            return None
-        
-        for step in sop['steps']:
-            if step.get('step_id') == step_id:
-                return step
+        if self.store is not None:
+            step = self.store.get_sop_step(sop_id, step_id)
+            return StepRecord.from_dict(step) if step is not None else None
         
-        return None
+        sop = self.get_sop_definition(sop_id)
+        return sop.step(step_id) if sop else None
 
     def get_eep_signature_patterns(self, eep_id: str) -> List[Dict]:
         """
@@ -164,12 +271,12 @@ class LERQueryEngine:
         return []
 
     def list_available_eeps(self) -> List[str]:
-        """Return list of all available EEP IDs"""
-        return list(self.eep_definitions.keys())
+        """Return sorted list of all available EEP IDs"""
+        return sorted(self.eep_definitions.keys())
 
     def list_available_sops(self) -> List[str]:
-        """Return list of all available SOP IDs"""
-        return list(self.sop_definitions.keys())
+        """Return sorted list of all available SOP IDs"""
+        return sorted(self.sop_definitions.keys())
 
     def get_eeps_by_category(self, category: str) -> List[Dict]:
         """
@@ -179,8 +286,10 @@ class LERQueryEngine:
             category: EEP category name
             
         Returns:
-            List of EEP definitions in the category
+            List of EEPRecords in the category
         """
+        if self.store is not None:
+            return [EEPRecord.from_dict(eep) for eep in self.store.eeps_by_category(category)]
         return [eep for eep in self.eep_definitions.values() 
                 if eep.get('category') == category]
 
@@ -192,8 +301,11 @@ class LERQueryEngine:
             eep_id: EEP identifier
             
         Returns:
-            List of SOP definitions that target this EEP
+            List of SOPRecords that target this EEP
         """
+        if self.store is not None:
+            return [SOPRecord.from_dict(sop) for sop in self.store.sops_for_eep(eep_id)]
+        
         matching_sops = []
         for sop in self.sop_definitions.values():
             target_eeps = sop.get('target_eeps', [])
@@ -250,17 +362,55 @@ class LERQueryEngine:
             search_term: Term to search for in function descriptions
             
         Returns:
-            List of matching EEP definitions
+            List of matching EEP definitions, ordered by EEP id
         """
         matches = []
         search_lower = search_term.lower()
+        candidates = self.eep_definitions.values()
+        if self.store is not None and search_term.strip() and search_term.isascii():
+            # A LIKE scan narrows to EEPs containing the term anywhere, as the
+            # in-memory check does; the full-text index only matches word
+            # prefixes, so it would miss terms that start inside a word
+            hits = self.store.search(search_term, kind="eep", field="universal_function",
+                                     limit=len(self.eep_definitions), substring=True)
+            candidates = [self.eep_definitions[hit["id"]] for hit in hits]
         
-        for eep in self.eep_definitions.values():
+        for eep in candidates:
             universal_function = eep.get('universal_function', '').lower()
             if search_lower in universal_function:
                 matches.append(eep)
         
-        return matches
+        return sorted(matches, key=lambda eep: eep.eep_id or "")
+
+    def get_definition_content_hash(self, definition_id: str) -> Optional[str]:
+        """
+        Get a content hash of the YAML file an EEP or SOP was loaded from
+        
+        The hash reflects the file on disk now, so edits made after the engine
+        was initialized are detected. Hashes are reused while the file's
+        modification time and size are unchanged.
+        
+        Args:
+            definition_id: EEP or SOP identifier
+            
+        Returns:
+            Hex SHA-256 of the file contents or None if the definition is unknown
+        """
+        source = self.definition_sources.get(definition_id)
+        if source is None:
+            return None
+        try:
+            stat = source.stat()
+        except OSError:
+            return None
+        
+        cached = self._content_hashes.get(source)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        self._content_hashes[source] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
 
     def get_system_info(self) -> Dict[str, Any]:
         """
@@ -271,12 +421,13 @@ class LERQueryEngine:
         """
         return {
             "ler_root": str(self.ler_root),
+            "ler_version": self.ler_version,
             "total_eeps": len(self.eep_definitions),
             "total_sops": len(self.sop_definitions),
             "total_patterns": len(self.signature_patterns),
             "schema_loaded": bool(self.schema),
-            "available_eeps": list(self.eep_definitions.keys()),
-            "available_sops": list(self.sop_definitions.keys())
+            "available_eeps": self.list_available_eeps(),
+            "available_sops": self.list_available_sops()
         }
 
 
@@ -322,4 +473,5 @@ def example_usage():
 
 
 if __name__ == "__main__":
-    example_usage()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    example_usage()
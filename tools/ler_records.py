@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+LER Definition Records
+Compact, immutable record types for EEP, SOP, step and signature pattern definitions
+
+Each record keeps the fields the engine reads on every event in __slots__
+(strings interned, so ids, categories and procedure names shared across
+definitions are stored once) and keeps every other section as a pickled blob
+that is decoded on first access. Field-name drift in the YAML is normalized
+at construction: EEPs expose `name` whether the file says `name` or
+`eep_name`, and `universal_function` whether it is top-level or under
+`description`; signature patterns expose `name` for `pattern_name`.
+
+Records are read-only Mappings as well, so code written against the raw
+definition dicts (`eep.get('name')`, `step['step_name']`) keeps working.
+to_dict() returns a plain, mutable copy.
+"""
+
+import sys
+import pickle
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class DefinitionRecord(Mapping):
+    """
+    Base class: slotted scalar fields plus lazily decoded sections
+
+    Subclasses declare:
+        _FIELDS: scalar fields held in slots
+        _ALIASES: YAML key -> field name, for keys that name the same field
+        _ID_FIELD: field used for hashing and repr
+    """
+
+    __slots__ = ("_sections", "_decoded")
+
+    _FIELDS: Tuple[str, ...] = ()
+    _ALIASES: Dict[str, str] = {}
+    _ID_FIELD = ""
+
+    def __init__(self, **fields):
+        for field in self._FIELDS:
+            object.__setattr__(self, field, _intern(fields.pop(field, None)))
+        sections = tuple((sys.intern(str(key)), pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                         for key, value in fields.items())
+        object.__setattr__(self, "_sections", sections)
+        object.__setattr__(self, "_decoded", None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DefinitionRecord":
+        """Build a record from a parsed YAML definition"""
+        fields: Dict[str, Any] = {}
+        for key, value in data.items():
+            field = cls._ALIASES.get(key, key)
+            if field in cls._FIELDS and fields.get(field) is not None:
+                continue  # the canonical key wins over an alias
+            fields[field] = value
+        return cls(**fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), self.to_dict()))
+
+    # Sections
+
+    def section(self, key: str, default: Any = None) -> Any:
+        """A non-slot section, decoded on first access and cached"""
+        decoded = self._decoded
+        if decoded is not None and key in decoded:
+            return decoded[key]
+        for name, blob in self._sections:
+            if name == key:
+                if decoded is None:
+                    decoded = {}
+                    object.__setattr__(self, "_decoded", decoded)
+                decoded[key] = pickle.loads(blob)
+                return decoded[key]
+        return default
+
+    def section_keys(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self._sections)
+
+    # Mapping interface
+
+    def __getitem__(self, key: str) -> Any:
+        field = self._ALIASES.get(key, key)
+        if field in self._FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                return value
+            raise KeyError(key)
+        missing = object()
+        value = self.section(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        yield from self.section_keys()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        field = self._ALIASES.get(key, key)
+        if field in self._FIELDS:
+            return getattr(self, field) is not None
+        return any(name == key for name, _ in self._sections)
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, getattr(self, self._ID_FIELD)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DefinitionRecord):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        return Mapping.__eq__(self, other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy (canonical field names, sections decoded)"""
+        return {key: _plain(self[key]) for key in self}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._ID_FIELD}={getattr(self, self._ID_FIELD)!r})"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, DefinitionRecord):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _rebuild(cls, data: Dict[str, Any]) -> DefinitionRecord:
+    return cls.from_dict(data)
+
+
+class SignaturePatternRecord(DefinitionRecord):
+    """One signature pattern; pattern_kind is set for patterns grouped by kind"""
+
+    __slots__ = ("pattern_id", "name", "pattern_kind", "detection_method", "mathematical_form", "description")
+
+    _FIELDS = __slots__
+    _ALIASES = {"pattern_name": "name"}
+    _ID_FIELD = "pattern_id"
+
+
+class StepRecord(DefinitionRecord):
+    """One SOP step"""
+
+    __slots__ = ("step_id", "step_name", "purpose", "analytical_procedure", "stub_implementation")
+
+    _FIELDS = __slots__
+    _ID_FIELD = "step_id"
+
+
+class EEPRecord(DefinitionRecord):
+    """An EEP definition"""
+
+    __slots__ = ("eep_id", "name", "category", "version", "status", "universal_function", "_patterns")
+
+    _FIELDS = ("eep_id", "name", "category", "version", "status", "universal_function")
+    _ALIASES = {"eep_name": "name"}
+    _ID_FIELD = "eep_id"
+
+    def __init__(self, **fields):
+        description = fields.get("description")
+        if fields.get("universal_function") is None and isinstance(description, dict):
+            fields["universal_function"] = description.get("universal_function")
+        super().__init__(**fields)
+        object.__setattr__(self, "_patterns", None)
+
+    @property
+    def patterns(self) -> Tuple[SignaturePatternRecord, ...]:
+        """
+        The signature_patterns section as a flat tuple of records
+
+        Patterns grouped by kind (quantitative/qualitative) carry that kind
+        in pattern_kind. Built on first access.
+        """
+        if self._patterns is None:
+            section = self.section("signature_patterns")
+            records = []
+            if isinstance(section, list):
+                records = [SignaturePatternRecord.from_dict(p) for p in section if isinstance(p, dict)]
+            elif isinstance(section, dict):
+                for kind, patterns in section.items():
+                    for pattern in patterns or []:
+                        if isinstance(pattern, dict):
+                            records.append(SignaturePatternRecord.from_dict({**pattern, "pattern_kind": kind}))
+            object.__setattr__(self, "_patterns", tuple(records))
+        return self._patterns
+
+
+class SOPRecord(DefinitionRecord):
+    """An SOP definition; steps are StepRecords, target_eeps a tuple"""
+
+    __slots__ = ("sop_id", "name", "version", "purpose", "target_eeps", "steps")
+
+    _FIELDS = __slots__
+    _ID_FIELD = "sop_id"
+
+    def __init__(self, **fields):
+        fields["target_eeps"] = tuple(sys.intern(str(eep_id)) for eep_id in fields.get("target_eeps") or ())
+        fields["steps"] = tuple(step if isinstance(step, StepRecord) else StepRecord.from_dict(step)
+                                for step in fields.get("steps") or () if isinstance(step, Mapping))
+        super().__init__(**fields)
+
+    def step(self, step_id: str) -> Optional[StepRecord]:
+        """The step with this id, or None"""
+        for step in self.steps:
+            if step.step_id == step_id:
+                return step
+        return None
+
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+LER Snapshots
+Content-addressed, versioned snapshots of the LER with Merkle-tree diffing
+
+Every definition (EEP, SOP, signature pattern, reference case) is hashed
+from its canonical JSON encoding, so formatting or comment edits do not
+change it. Leaves are grouped into buckets by a prefix of the hashed id,
+buckets into one node per kind, and kinds into the root:
+
+    root = H(kind_1: H(bucket hashes) | kind_2: ... )
+
+The root hash is the LER version: two trees with the same root hold the
+same definitions. diff() walks only the subtrees whose hashes differ, and
+build() reuses the leaves of files whose modification time and size are
+unchanged, re-hashing only the buckets they touch. Checking whether a
+cached analysis is still valid is a leaf (or root) comparison.
+
+The version-history fields inside the YAML files are not consulted; the
+snapshot tracks what the files actually contain.
+"""
+
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from ler_sqlite_store import SOURCES, definition_id_for
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+# Hex digits of H(id) that pick a leaf's bucket (256 buckets per kind)
+BUCKET_PREFIX = 2
+
+
+def canonical_bytes(document: Any) -> bytes:
+    """Canonical JSON encoding hashed for a definition's leaf"""
+    return json.dumps(document, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def content_hash(document: Any) -> str:
+    """Leaf hash of a parsed definition"""
+    return hashlib.sha256(canonical_bytes(document)).hexdigest()
+
+
+def _bucket(definition_id: str) -> str:
+    return hashlib.sha256(definition_id.encode("utf-8")).hexdigest()[:BUCKET_PREFIX]
+
+
+def _node_hash(children: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(children):
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(children[name].encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class LERSnapshot:
+    """
+    Merkle tree over the definitions of one LER state
+
+    Attributes:
+        root: Root hash, the LER version
+        kinds: kind -> kind node hash
+        buckets: kind -> bucket prefix -> bucket hash
+        leaves: kind -> bucket prefix -> definition id -> leaf hash
+        sources: resolved source path -> (mtime_ns, size, kind, definition id)
+    """
+
+    def __init__(self):
+        self.root = _node_hash({})
+        self.kinds: Dict[str, str] = {}
+        self.buckets: Dict[str, Dict[str, str]] = {}
+        self.leaves: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.sources: Dict[str, Tuple[int, int, str, Optional[str]]] = {}
+
+    @property
+    def version(self) -> str:
+        return self.root
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for buckets in self.leaves.values() for bucket in buckets.values())
+
+    def leaf(self, kind: str, definition_id: str) -> Optional[str]:
+        """Leaf hash of one definition, or None"""
+        return self.leaves.get(kind, {}).get(_bucket(definition_id), {}).get(definition_id)
+
+    def find(self, definition_id: str) -> Optional[Tuple[str, str]]:
+        """(kind, leaf hash) of a definition id in any kind"""
+        prefix = _bucket(definition_id)
+        for kind, buckets in self.leaves.items():
+            leaf = buckets.get(prefix, {}).get(definition_id)
+            if leaf is not None:
+                return kind, leaf
+        return None
+
+    # Building
+
+    @classmethod
+    def build(cls, ler_root, previous: Optional["LERSnapshot"] = None,
+              load_yaml: Optional[Callable[[Path], Any]] = None) -> "LERSnapshot":
+        """
+        Snapshot the LER tree under ler_root
+
+        Args:
+            ler_root: LER repository root
+            previous: Earlier snapshot of the same tree; files whose mtime and
+                size are unchanged keep their leaves without being read
+            load_yaml: Callable(Path) -> parsed document (defaults to yaml.safe_load)
+
+        Returns:
+            A new snapshot (previous is not modified)
+        """
+        root = Path(ler_root)
+        if load_yaml is None:
+            import yaml
+
+            def load_yaml(path: Path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return yaml.safe_load(f)
+
+        snapshot = cls()
+        if previous is not None:
+            snapshot.kinds = dict(previous.kinds)
+            snapshot.buckets = {kind: dict(buckets) for kind, buckets in previous.buckets.items()}
+            # Buckets are copied on write below; untouched ones stay shared
+            snapshot.leaves = {kind: dict(buckets) for kind, buckets in previous.leaves.items()}
+            snapshot.sources = dict(previous.sources)
+
+        dirty = set()
+        copied = set()
+
+        def set_leaf(kind: str, definition_id: str, leaf: Optional[str]):
+            prefix = _bucket(definition_id)
+            buckets = snapshot.leaves.setdefault(kind, {})
+            if (kind, prefix) not in copied:
+                buckets[prefix] = dict(buckets.get(prefix, {}))
+                copied.add((kind, prefix))
+            if leaf is None:
+                buckets[prefix].pop(definition_id, None)
+            else:
+                buckets[prefix][definition_id] = leaf
+            dirty.add((kind, prefix))
+
+        seen = set()
+        for kind, (subdir, pattern, recursive, _) in SOURCES.items():
+            directory = root / subdir
+            if not directory.exists():
+                continue
+            for path in (directory.rglob(pattern) if recursive else directory.glob(pattern)):
+                key = str(path.resolve())
+                seen.add(key)
+                stat = path.stat()
+                known = snapshot.sources.get(key)
+                if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                try:
+                    document = load_yaml(path)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable {kind} file {path}: {e}")
+                    document = None
+                definition_id = definition_id_for(kind, path, document) if isinstance(document, dict) else None
+                if known and known[3] is not None and known[3] != definition_id:
+                    set_leaf(kind, known[3], None)
+                if definition_id is not None:
+                    definition_id = str(definition_id)
+                    set_leaf(kind, definition_id, content_hash(document))
+                snapshot.sources[key] = (stat.st_mtime_ns, stat.st_size, kind, definition_id)
+
+        for key in set(snapshot.sources) - seen:
+            _, _, kind, definition_id = snapshot.sources.pop(key)
+            if definition_id is not None:
+                set_leaf(kind, definition_id, None)
+
+        snapshot._rehash(dirty)
+        return snapshot
+
+    def _rehash(self, dirty):
+        """Recompute the dirty buckets and every node above them"""
+        for kind, prefix in dirty:
+            bucket = self.leaves[kind].get(prefix)
+            buckets = self.buckets.setdefault(kind, {})
+            if bucket:
+                buckets[prefix] = _node_hash(bucket)
+            else:
+                self.leaves[kind].pop(prefix, None)
+                buckets.pop(prefix, None)
+        for kind in {kind for kind, _ in dirty}:
+            if self.buckets.get(kind):
+                self.kinds[kind] = _node_hash(self.buckets[kind])
+            else:
+                self.kinds.pop(kind, None)
+                self.buckets.pop(kind, None)
+                self.leaves.pop(kind, None)
+        self.root = _node_hash(self.kinds)
+
+    # Comparison
+
+    def diff(self, other: "LERSnapshot") -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Definitions that differ from `other` (the older state)
+
+        Only subtrees whose hashes differ are visited, so the cost grows with
+        the number of changed definitions rather than the size of the LER.
+
+        Returns:
+            {"added": [(kind, id)], "removed": [...], "changed": [...]}
+        """
+        result = {"added": [], "removed": [], "changed": []}
+        if self.root == other.root:
+            return result
+        for kind in sorted(set(self.kinds) | set(other.kinds)):
+            if self.kinds.get(kind) == other.kinds.get(kind):
+                continue
+            mine, theirs = self.buckets.get(kind, {}), other.buckets.get(kind, {})
+            for prefix in sorted(set(mine) | set(theirs)):
+                if mine.get(prefix) == theirs.get(prefix):
+                    continue
+                new = self.leaves.get(kind, {}).get(prefix, {})
+                old = other.leaves.get(kind, {}).get(prefix, {})
+                for definition_id in sorted(set(new) | set(old)):
+                    if definition_id not in old:
+                        result["added"].append((kind, definition_id))
+                    elif definition_id not in new:
+                        result["removed"].append((kind, definition_id))
+                    elif new[definition_id] != old[definition_id]:
+                        result["changed"].append((kind, definition_id))
+        return result
+
+    # Persistence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "root": self.root,
+            "kinds": self.kinds,
+            "buckets": self.buckets,
+            "leaves": self.leaves,
+            "sources": {key: list(value) for key, value in self.sources.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LERSnapshot":
+        if data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {data.get('format')}")
+        snapshot = cls()
+        snapshot.root = data["root"]
+        snapshot.kinds = data["kinds"]
+        snapshot.buckets = data["buckets"]
+        snapshot.leaves = data["leaves"]
+        snapshot.sources = {key: tuple(value) for key, value in data.get("sources", {}).items()}
+        return snapshot
+
+    def save(self, path: str):
+        Path(path).write_text(json.dumps(self.to_dict(), sort_keys=True), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str) -> "LERSnapshot":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed LER snapshots")
+    parser.add_argument("--ler-root", default="..", help="Path to the LER repository root")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Snapshot the LER and print its version")
+    build.add_argument("--output", default=None, help="Save the snapshot to this JSON file")
+    build.add_argument("--previous", default=None, help="Earlier snapshot to reuse unchanged leaves from")
+
+    diff = commands.add_parser("diff", help="Definitions changed between two snapshots")
+    diff.add_argument("old", help="Older snapshot file")
+    diff.add_argument("new", nargs="?", default=None, help="Newer snapshot file (default: the current tree)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "build":
+        previous = LERSnapshot.load(args.previous) if args.previous else None
+        snapshot = LERSnapshot.build(args.ler_root, previous)
+        if args.output:
+            snapshot.save(args.output)
+        print(f"LER version {snapshot.version} ({len(snapshot)} definitions)")
+        for kind, node in sorted(snapshot.kinds.items()):
+            print(f"  {kind:<18} {node[:16]}  {sum(len(b) for b in snapshot.leaves[kind].values())} definitions")
+        return 0
+
+    old = LERSnapshot.load(args.old)
+    new = LERSnapshot.load(args.new) if args.new else LERSnapshot.build(args.ler_root, old)
+    changes = new.diff(old)
+    print(f"{old.version[:16]} -> {new.version[:16]}")
+    for status in ("added", "removed", "changed"):
+        for kind, definition_id in changes[status]:
+            print(f"  {status:<8} {kind:<18} {definition_id}")
+    return 1 if any(changes.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
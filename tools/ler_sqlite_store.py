@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+SQLite LER Store
+Compiles the LER YAML tree into a local SQLite database for indexed queries
+
+Definitions are stored as JSON documents with their id, kind, name and
+category in indexed columns. SOP target EEPs and steps get their own indexed
+tables, and descriptive text is searchable through an FTS5 table (LIKE
+scans are used when the SQLite build lacks FTS5). Compilation is
+incremental: files whose modification time and size are unchanged are
+skipped. The database runs in WAL mode so many processes can read it while
+one recompiles.
+
+LERQueryEngine(ler_root, sqlite_path=...) uses this store in place of its
+in-memory dictionaries.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Tables dropped and rebuilt from the YAML tree when the stored schema version differs
+_TABLES = ("definitions", "sources", "sop_targets", "sop_steps", "definitions_fts", "meta")
+
+# kind -> (directory relative to the LER root, glob, recursive, id field)
+SOURCES = {
+    "eep": ("eep_definitions", "*.yaml", False, "eep_id"),
+    "sop": ("sops", "*.yaml", True, "sop_id"),
+    "pattern": ("signature_patterns", "*.yaml", False, None),
+    "characterization": (os.path.join("validation", "reference_cases"), "*.yaml", False, None),
+}
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS definitions (
+    id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT,
+    category TEXT,
+    source TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS idx_definitions_id ON definitions (id);
+CREATE INDEX IF NOT EXISTS idx_definitions_kind_category ON definitions (kind, category);
+CREATE INDEX IF NOT EXISTS idx_definitions_source ON definitions (source);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sop_targets (sop_id TEXT NOT NULL, eep_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_sop_targets_eep ON sop_targets (eep_id);
+CREATE INDEX IF NOT EXISTS idx_sop_targets_sop ON sop_targets (sop_id);
+CREATE TABLE IF NOT EXISTS sop_steps (
+    sop_id TEXT NOT NULL,
+    step_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (sop_id, step_id)
+);
+"""
+
+_FTS_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS definitions_fts USING fts5(
+    id UNINDEXED, kind UNINDEXED, name, universal_function, text
+);
+"""
+
+
+def definition_id_for(kind: str, path: Path, document: Dict[str, Any]) -> Optional[str]:
+    """Id of the definition a source file holds (id field, characterization id or file stem)"""
+    id_field = SOURCES[kind][3]
+    if id_field:
+        return document.get(id_field)
+    if kind == "characterization":
+        metadata = document.get("characterization_metadata") or {}
+        return str(metadata.get("characterization_id") or path.stem)
+    return path.stem
+
+
+def _flatten_text(value: Any) -> Iterator[str]:
+    """Every string in a nested definition"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten_text(item)
+
+
+def _universal_function(definition: Dict[str, Any]) -> str:
+    """universal_function at the top level or under description"""
+    value = definition.get("universal_function")
+    if value is None and isinstance(definition.get("description"), dict):
+        value = definition["description"].get("universal_function")
+    return value if isinstance(value, str) else ""
+
+
+# universal_function at the top level or under description (see _universal_function)
+_UNIVERSAL_FUNCTION_SQL = ("coalesce(json_extract(body, '$.universal_function'), "
+                           "json_extract(body, '$.description.universal_function'))")
+
+
+def _like_pattern(text: str) -> str:
+    """LIKE pattern matching text anywhere, with wildcards in text escaped (ESCAPE '\\')"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_query(text: str) -> str:
+    """Quote each term as an FTS5 prefix phrase so user input is never parsed as syntax"""
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+class LERSqliteStore:
+    """
+    SQLite-backed LER definitions with indexed lookups and full-text search
+
+    One connection per thread; each process opens its own.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = str(db_path)
+        self._local = threading.local()
+        self.fts_enabled = self._init_schema()
+
+    # Connection and schema
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> bool:
+        with self.conn:
+            has_meta = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone()
+            version = has_meta and self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if has_meta and (not version or version[0] != str(SCHEMA_VERSION)):
+                # The store is derived from the YAML tree: rebuild rather than migrate
+                logger.info(f"LER store schema changed, rebuilding {self.db_path}")
+                for table in _TABLES:
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.executescript(_DDL)
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            try:
+                self.conn.executescript(_FTS_DDL)
+                return True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"FTS5 unavailable, text search falls back to LIKE: {e}")
+                return False
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Compilation
+
+    def compile(self, ler_root: str, load_yaml=None) -> Dict[str, int]:
+        """
+        Bring the database up to date with the YAML files under ler_root
+
+        Args:
+            ler_root: LER repository root
+            load_yaml: Callable(Path) -> parsed document (defaults to yaml.safe_load)
+
+        Returns:
+            Counts of updated, unchanged and removed source files
+        """
+        root = Path(ler_root)
+        if load_yaml is None:
+            import yaml
+
+            def load_yaml(path: Path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return yaml.safe_load(f)
+
+        known = {path: (mtime, size) for path, mtime, size in
+                 self.conn.execute("SELECT path, mtime_ns, size FROM sources")}
+        seen = set()
+        counts = {"updated": 0, "unchanged": 0, "removed": 0}
+
+        with self.conn:
+            for kind, (subdir, pattern, recursive, _) in SOURCES.items():
+                directory = root / subdir
+                if not directory.exists():
+                    continue
+                files = directory.rglob(pattern) if recursive else directory.glob(pattern)
+                for path in sorted(files):
+                    key = str(path.resolve())
+                    seen.add(key)
+                    stat = path.stat()
+                    if known.get(key) == (stat.st_mtime_ns, stat.st_size):
+                        counts["unchanged"] += 1
+                        continue
+                    try:
+                        document = load_yaml(path)
+                    except Exception as e:
+                        logger.warning(f"Skipping unreadable {kind} file {path}: {e}")
+                        continue
+                    self._remove_source(key)
+                    if isinstance(document, dict):
+                        self._store(kind, path, key, document)
+                    self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                                      (key, stat.st_mtime_ns, stat.st_size,
+                                       hashlib.sha256(path.read_bytes()).hexdigest()))
+                    counts["updated"] += 1
+
+            for key in set(known) - seen:
+                self._remove_source(key)
+                self.conn.execute("DELETE FROM sources WHERE path = ?", (key,))
+                counts["removed"] += 1
+
+            schema_path = root / "schemas" / "core_schema.yaml"
+            if schema_path.exists():
+                try:
+                    schema = load_yaml(schema_path) or {}
+                except Exception:
+                    schema = {}
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('core_schema', ?)",
+                                  (json.dumps(schema, default=str),))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('ler_root', ?)", (str(root.resolve()),))
+
+        logger.info(f"LER store compiled: {counts}")
+        return counts
+
+    def _store(self, kind: str, path: Path, key: str, document: Dict[str, Any]):
+        definition_id = definition_id_for(kind, path, document)
+        if not definition_id:
+            return
+        if kind == "characterization":
+            metadata = document.get("characterization_metadata") or {}
+            name = metadata.get("phenomenon_name_processed")
+        else:
+            name = document.get("name") or document.get("eep_name")
+        category = document.get("category")
+        body = json.dumps(document, default=str)
+        self.conn.execute("INSERT OR REPLACE INTO definitions VALUES (?, ?, ?, ?, ?, ?)",
+                          (definition_id, kind, str(name) if name else None,
+                           category if isinstance(category, str) else None, key, body))
+
+        if kind == "sop":
+            self.conn.executemany("INSERT INTO sop_targets VALUES (?, ?)",
+                                  [(definition_id, eep_id) for eep_id in document.get("target_eeps") or []])
+            self.conn.executemany("INSERT OR REPLACE INTO sop_steps VALUES (?, ?, ?)",
+                                  [(definition_id, step.get("step_id"), json.dumps(step, default=str))
+                                   for step in document.get("steps") or [] if isinstance(step, dict)])
+
+        if self.fts_enabled:
+            self.conn.execute("INSERT INTO definitions_fts VALUES (?, ?, ?, ?, ?)",
+                              (definition_id, kind, str(name or ""), _universal_function(document),
+                               " ".join(_flatten_text(document))))
+
+    def _remove_source(self, key: str):
+        rows = self.conn.execute("SELECT kind, id FROM definitions WHERE source = ?", (key,)).fetchall()
+        for kind, definition_id in rows:
+            if kind == "sop":
+                self.conn.execute("DELETE FROM sop_targets WHERE sop_id = ?", (definition_id,))
+                self.conn.execute("DELETE FROM sop_steps WHERE sop_id = ?", (definition_id,))
+            if self.fts_enabled:
+                self.conn.execute("DELETE FROM definitions_fts WHERE id = ? AND kind = ?", (definition_id, kind))
+        self.conn.execute("DELETE FROM definitions WHERE source = ?", (key,))
+
+    # Queries
+
+    def get(self, kind: str, definition_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT body FROM definitions WHERE id = ? AND kind = ?",
+                                (definition_id, kind)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def contains(self, kind: str, definition_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM definitions WHERE id = ? AND kind = ?",
+                                 (definition_id, kind)).fetchone() is not None
+
+    def ids(self, kind: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT id FROM definitions WHERE kind = ? ORDER BY id", (kind,))]
+
+    def count(self, kind: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM definitions WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def iter_definitions(self, kind: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (id, definition) pairs without materializing the whole kind"""
+        cursor = self.conn.execute("SELECT id, body FROM definitions WHERE kind = ? ORDER BY id", (kind,))
+        for definition_id, body in cursor:
+            yield definition_id, json.loads(body)
+
+    def source(self, definition_id: str, kind: Optional[str] = None) -> Optional[Path]:
+        if kind:
+            row = self.conn.execute("SELECT source FROM definitions WHERE id = ? AND kind = ?",
+                                    (definition_id, kind)).fetchone()
+        else:
+            row = self.conn.execute("SELECT source FROM definitions WHERE id = ? ORDER BY kind LIMIT 1",
+                                    (definition_id,)).fetchone()
+        return Path(row[0]) if row else None
+
+    def get_sop_step(self, sop_id: str, step_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT body FROM sop_steps WHERE sop_id = ? AND step_id = ?",
+                                (sop_id, step_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def eeps_by_category(self, category: str) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in self.conn.execute(
+            "SELECT body FROM definitions WHERE kind = 'eep' AND category IS ? ORDER BY id", (category,))]
+
+    def sops_for_eep(self, eep_id: str) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in self.conn.execute(
+            "SELECT d.body FROM sop_targets t JOIN definitions d ON d.kind = 'sop' AND d.id = t.sop_id "
+            "WHERE t.eep_id = ? ORDER BY d.id", (eep_id,))]
+
+    def search(self, text: str, kind: Optional[str] = None, field: Optional[str] = None,
+               limit: int = 50, substring: bool = False) -> List[Dict[str, Any]]:
+        """
+        Full-text search over descriptive text, best matches first
+
+        Args:
+            text: Search terms (each matched as a word prefix)
+            kind: Restrict to "eep", "sop", "pattern" or "characterization"
+            field: Restrict to "name" or "universal_function"
+            limit: Maximum results
+            substring: Match text as one string anywhere, including inside
+                words (LIKE scan, case-insensitive for ASCII), instead of
+                as word prefixes through the full-text index
+
+        Returns:
+            List of {id, kind, name} dicts
+        """
+        if not text.strip():
+            return []
+        if self.fts_enabled and not substring:
+            query = _fts_query(text)
+            if field:
+                query = f"{field} : ({query})"
+            sql = "SELECT id, kind, name FROM definitions_fts WHERE definitions_fts MATCH ?"
+            params: List[Any] = [query]
+            if kind:
+                sql += " AND kind = ?"
+                params.append(kind)
+            sql += " ORDER BY bm25(definitions_fts) LIMIT ?"
+        else:
+            column = _UNIVERSAL_FUNCTION_SQL if field == "universal_function" else \
+                "name" if field == "name" else "body"
+            sql = f"SELECT id, kind, name FROM definitions WHERE {column} LIKE ? ESCAPE '\\'"
+            params = [_like_pattern(text)]
+            if kind:
+                sql += " AND kind = ?"
+                params.append(kind)
+            sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        return [{"id": i, "kind": k, "name": n} for i, k, n in self.conn.execute(sql, params)]
+
+    def get_meta(self, key: str) -> Optional[Any]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return row[0]
+
+
+class StoreMapping:
+    """
+    Read-only dict view of one definition kind in an LERSqliteStore
+
+    Lets code written against LERQueryEngine.eep_definitions and friends
+    keep working; lookups are single indexed queries and iteration streams rows.
+    Values are passed through factory (e.g. a record constructor) if given.
+    """
+
+    def __init__(self, store: LERSqliteStore, kind: str, factory: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self.store = store
+        self.kind = kind
+        self.factory = factory or (lambda definition: definition)
+
+    def __getitem__(self, definition_id: str) -> Any:
+        definition = self.store.get(self.kind, definition_id)
+        if definition is None:
+            raise KeyError(definition_id)
+        return self.factory(definition)
+
+    def get(self, definition_id: str, default: Any = None) -> Any:
+        definition = self.store.get(self.kind, definition_id)
+        return default if definition is None else self.factory(definition)
+
+    def __contains__(self, definition_id: str) -> bool:
+        return self.store.contains(self.kind, definition_id)
+
+    def __len__(self) -> int:
+        return self.store.count(self.kind)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.ids(self.kind))
+
+    def keys(self) -> List[str]:
+        return self.store.ids(self.kind)
+
+    def values(self) -> Iterator[Any]:
+        return (self.factory(definition) for _, definition in self.store.iter_definitions(self.kind))
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((definition_id, self.factory(definition))
+                for definition_id, definition in self.store.iter_definitions(self.kind))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class SourceMapping:
+    """Read-only view of definition id -> source YAML path"""
+
+    def __init__(self, store: LERSqliteStore):
+        self.store = store
+
+    def get(self, definition_id: str, default: Any = None) -> Any:
+        source = self.store.source(definition_id)
+        return default if source is None else source
+
+    def __getitem__(self, definition_id: str) -> Path:
+        source = self.store.source(definition_id)
+        if source is None:
+            raise KeyError(definition_id)
+        return source
+
+    def __contains__(self, definition_id: str) -> bool:
+        return self.store.source(definition_id) is not None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile and query the SQLite LER store")
+    parser.add_argument("--db", default="ler.sqlite", help="Database file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="Compile the LER YAML tree into the database")
+    compile_parser.add_argument("--ler-root", default="..")
+
+    search = subparsers.add_parser("search", help="Full-text search over definitions")
+    search.add_argument("text")
+    search.add_argument("--kind", choices=sorted(SOURCES))
+    search.add_argument("--field", choices=["name", "universal_function"])
+    search.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+
+    store = LERSqliteStore(args.db)
+    if args.command == "compile":
+        counts = store.compile(args.ler_root)
+        print(f"{args.db}: {counts['updated']} updated, {counts['unchanged']} unchanged, "
+              f"{counts['removed']} removed; " + ", ".join(f"{kind}s: {store.count(kind)}" for kind in SOURCES))
+        return 0
+
+    for result in store.search(args.text, args.kind, args.field, args.limit):
+        print(f"{result['kind']:<17} {result['id']:<45} {result['name'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+LER Sync Server
+Local JSON API serving LER content to the eep-ler-ui desktop client incrementally
+
+LERSyncIndex sits on top of LERQueryEngine and keeps, for every EEP, SOP and
+reference case, its serialized JSON payload and an ETag (SHA-256 of that
+payload). refresh() stats the source directories and re-reads only files
+whose modification time or size changed; each refresh that changes anything
+bumps the sync version and appends to a change log.
+
+Endpoints (all GET, JSON):
+    /v1/info                          sync version and counts per kind
+    /v1/<kind>?page_size=&page_token= paginated id/name/etag listing
+    /v1/<kind>/<id>                   one definition; honors If-None-Match (304)
+    /v1/changes?since=V               upserts and deletes after version V
+
+<kind> is eeps, sops or reference_cases. A client keeps the version from its
+last sync and asks for changes since then; when the log no longer reaches
+back that far the response says full_resync and the client re-lists.
+Payloads are serialized once per content change, so unchanged requests are
+answered from bytes already in memory.
+"""
+
+import sys
+import time
+import base64
+import bisect
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+from ler_access import LERQueryEngine
+from ler_sqlite_store import SOURCES, definition_id_for
+from ler_snapshot import canonical_bytes
+
+logger = logging.getLogger(__name__)
+
+# URL collection -> source kind (see ler_sqlite_store.SOURCES)
+COLLECTIONS = {
+    "eeps": "eep",
+    "sops": "sop",
+    "reference_cases": "characterization",
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class SyncEntry:
+    """Serialized payload of one definition"""
+
+    __slots__ = ("kind", "definition_id", "name", "source", "payload", "etag", "version")
+
+    def __init__(self, kind: str, definition_id: str, name: Optional[str], source: str,
+                 payload: bytes, version: int):
+        self.kind = kind
+        self.definition_id = definition_id
+        self.name = name
+        self.source = source
+        self.payload = payload
+        self.etag = '"' + hashlib.sha256(payload).hexdigest() + '"'
+        self.version = version
+
+    def summary(self) -> Dict[str, Any]:
+        return {"id": self.definition_id, "name": self.name, "etag": self.etag, "version": self.version}
+
+
+def _encode(document: Dict[str, Any]) -> bytes:
+    # Same encoding as snapshot leaves, so an ETag is the definition's leaf hash
+    return canonical_bytes(document)
+
+
+def _page_token(definition_id: str) -> str:
+    return base64.urlsafe_b64encode(definition_id.encode("utf-8")).decode("ascii")
+
+
+def _after_token(token: str) -> str:
+    """Decode a page token; anything _page_token() could not have produced raises ValueError"""
+    definition_id = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+    # urlsafe_b64decode silently drops characters outside the alphabet
+    if not definition_id or _page_token(definition_id) != token:
+        raise ValueError(f"Invalid page_token: {token!r}")
+    return definition_id
+
+
+class LERSyncIndex:
+    """
+    Versioned payload index over the LER source tree
+
+    Thread-safe: refresh() and the read methods share one lock, and reads
+    only hand out immutable entries and bytes.
+    """
+
+    def __init__(self, engine: LERQueryEngine, max_log: int = 10000):
+        """
+        Args:
+            engine: Query engine kept in sync with the files this index re-reads
+            max_log: Change-log entries retained for delta requests
+        """
+        self.engine = engine
+        self.max_log = max_log
+        self.version = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, SyncEntry]] = {kind: {} for kind in COLLECTIONS.values()}
+        self._sorted_ids: Dict[str, Optional[List[str]]] = {kind: None for kind in COLLECTIONS.values()}
+        # source path -> (mtime_ns, size, kind, definition id)
+        self._files: Dict[str, Tuple[int, int, str, Optional[str]]] = {}
+        # (version, kind, id, op, etag), oldest first
+        self._log: List[Tuple[int, str, str, str, Optional[str]]] = []
+        self._log_floor = 0
+        self.refresh()
+
+    def _scan(self) -> Dict[str, Tuple[Path, str]]:
+        """Current source files: path key -> (path, kind)"""
+        files = {}
+        for kind in COLLECTIONS.values():
+            subdir, pattern, recursive, _ = SOURCES[kind]
+            directory = self.engine.ler_root / subdir
+            if not directory.exists():
+                continue
+            for path in (directory.rglob(pattern) if recursive else directory.glob(pattern)):
+                files[str(path.resolve())] = (path, kind)
+        return files
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Re-read changed source files and record what changed
+
+        Returns:
+            Counts of upserted, deleted and unchanged definitions
+        """
+        with self._lock:
+            counts = {"upserted": 0, "deleted": 0, "unchanged": 0}
+            version = self.version + 1
+            changes = []
+            upserts: Dict[str, Dict[str, Tuple[Dict, Path]]] = {}
+            removed: Dict[str, List[str]] = {}
+
+            current = self._scan()
+            for key in set(self._files) - set(current):
+                _, _, kind, definition_id = self._files.pop(key)
+                if definition_id is not None and self._entries[kind].pop(definition_id, None) is not None:
+                    changes.append((version, kind, definition_id, "delete", None))
+                    removed.setdefault(kind, []).append(definition_id)
+
+            for key, (path, kind) in current.items():
+                stat = path.stat()
+                known = self._files.get(key)
+                if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                    counts["unchanged"] += 1
+                    continue
+                document = self.engine._load_yaml_file(path)
+                previous_id = known[3] if known else None
+                if document is None:
+                    # Unreadable (e.g. saved mid-edit): keep serving the last good version
+                    self._files[key] = (stat.st_mtime_ns, stat.st_size, kind, previous_id)
+                    continue
+                definition_id = definition_id_for(kind, path, document) if isinstance(document, dict) else None
+                self._files[key] = (stat.st_mtime_ns, stat.st_size, kind, definition_id)
+
+                if previous_id is not None and previous_id != definition_id:
+                    # The file now holds a different definition (or none)
+                    if self._entries[kind].pop(previous_id, None) is not None:
+                        changes.append((version, kind, previous_id, "delete", None))
+                        removed.setdefault(kind, []).append(previous_id)
+                if definition_id is None:
+                    continue
+
+                if kind == "characterization":
+                    metadata = document.get("characterization_metadata") or {}
+                    name = metadata.get("phenomenon_name_processed")
+                else:
+                    name = document.get("name") or document.get("eep_name")
+                entry = SyncEntry(kind, str(definition_id), str(name) if name else None, key,
+                                  _encode(document), version)
+                existing = self._entries[kind].get(entry.definition_id)
+                if existing is not None and existing.etag == entry.etag:
+                    counts["unchanged"] += 1  # touched or reformatted, same content
+                    continue
+                self._entries[kind][entry.definition_id] = entry
+                changes.append((version, kind, entry.definition_id, "upsert", entry.etag))
+                upserts.setdefault(kind, {})[entry.definition_id] = (document, path)
+
+            for _, kind, _, op, _ in changes:
+                counts["upserted" if op == "upsert" else "deleted"] += 1
+                self._sorted_ids[kind] = None
+            if changes:
+                self.version = version
+                self._log.extend(changes)
+                if len(self._log) > self.max_log:
+                    dropped = self._log[:len(self._log) - self.max_log]
+                    self._log = self._log[len(dropped):]
+                    self._log_floor = dropped[-1][0]
+                if version > 1:
+                    # The initial build loaded the engine already
+                    self.engine.apply_source_changes(upserts, removed)
+                logger.info(f"LER sync version {version}: {counts}")
+            return counts
+
+    # Reads
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "ler_version": self.engine.ler_version,
+                "ler_root": str(self.engine.ler_root),
+                "counts": {collection: len(self._entries[kind]) for collection, kind in COLLECTIONS.items()}
+            }
+
+    def get(self, kind: str, definition_id: str) -> Optional[SyncEntry]:
+        with self._lock:
+            return self._entries[kind].get(definition_id)
+
+    def list(self, kind: str, page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of definitions in id order
+
+        The page token encodes the last id served (keyset pagination), so
+        pages stay consistent while definitions are added or removed.
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        with self._lock:
+            ids = self._sorted_ids[kind]
+            if ids is None:
+                ids = self._sorted_ids[kind] = sorted(self._entries[kind])
+            start = bisect.bisect_right(ids, _after_token(page_token)) if page_token else 0
+            page = ids[start:start + page_size]
+            entries = self._entries[kind]
+            return {
+                "version": self.version,
+                "items": [entries[definition_id].summary() for definition_id in page],
+                "next_page_token": _page_token(page[-1]) if start + page_size < len(ids) else None
+            }
+
+    def changes_since(self, since: int) -> Dict[str, Any]:
+        """
+        Changes after version `since`, the latest operation per definition
+
+        Returns full_resync when the retained log starts after `since`.
+        """
+        with self._lock:
+            if since < self._log_floor or since > self.version:
+                return {"version": self.version, "full_resync": True, "changes": []}
+            latest: Dict[Tuple[str, str], Tuple[int, str, str, str, Optional[str]]] = {}
+            for change in self._log:
+                if change[0] > since:
+                    latest[(change[1], change[2])] = change
+            changes = [{"version": v, "kind": kind, "id": definition_id, "op": op, "etag": etag}
+                       for v, kind, definition_id, op, etag in sorted(latest.values())]
+            return {"version": self.version, "full_resync": False, "changes": changes}
+
+
+class LERSyncHandler(BaseHTTPRequestHandler):
+    """Routes /v1 requests to the server's LERSyncIndex"""
+
+    server_version = "LERSync/1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, status: int, document: Dict[str, Any]):
+        self._send(status, _encode(document))
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+        server.maybe_refresh()
+        index: LERSyncIndex = server.index
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+
+        try:
+            if parts[:1] != ["v1"] or len(parts) < 2:
+                return self._json(404, {"error": "not_found", "path": url.path})
+            if parts[1:] == ["info"]:
+                return self._json(200, index.info())
+            if parts[1:] == ["changes"]:
+                return self._json(200, index.changes_since(int(query.get("since", 0))))
+
+            kind = COLLECTIONS.get(parts[1])
+            if kind is None:
+                return self._json(404, {"error": "unknown_collection", "collection": parts[1]})
+            if len(parts) == 2:
+                page = index.list(kind, int(query.get("page_size", DEFAULT_PAGE_SIZE)), query.get("page_token"))
+                return self._json(200, page)
+            if len(parts) == 3:
+                entry = index.get(kind, parts[2])
+                if entry is None:
+                    return self._json(404, {"error": "not_found", "id": parts[2]})
+                headers = {"ETag": entry.etag, "X-LER-Version": str(entry.version)}
+                if entry.etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+                    return self._send(304, headers=headers)
+                return self._send(200, entry.payload, headers)
+            return self._json(404, {"error": "not_found", "path": url.path})
+        except ValueError as e:
+            return self._json(400, {"error": "bad_request", "detail": str(e)})
+
+
+class LERSyncServer(ThreadingHTTPServer):
+    """HTTP server that refreshes its index at most once per refresh_interval_s"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], index: LERSyncIndex, refresh_interval_s: float = 2.0):
+        super().__init__(address, LERSyncHandler)
+        self.index = index
+        self.refresh_interval_s = refresh_interval_s
+        self._last_refresh = time.monotonic()
+        self._refresh_lock = threading.Lock()
+
+    def maybe_refresh(self):
+        if self.refresh_interval_s is None or time.monotonic() - self._last_refresh < self.refresh_interval_s:
+            return
+        # One request refreshes; concurrent ones serve the current version
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                self.index.refresh()
+                self._last_refresh = time.monotonic()
+            finally:
+                self._refresh_lock.release()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve LER content to the eep-ler-ui client with incremental sync")
+    parser.add_argument("--ler-root", default="..", help="Path to the LER repository root")
+    parser.add_argument("--ler-db", default=None, help="Back the query engine with this SQLite store")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--refresh-interval", type=float, default=2.0,
+                        help="Minimum seconds between source-tree rescans")
+    parser.add_argument("--log-level", default="INFO", help="Logging level")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    engine = LERQueryEngine(args.ler_root, sqlite_path=args.ler_db)
+    index = LERSyncIndex(engine)
+    server = LERSyncServer((args.host, args.port), index, args.refresh_interval)
+    logger.info(f"Serving LER version {index.version} on http://{args.host}:{server.server_address[1]}/v1/info")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Filament Metrics
+Counters, timers and sampled event records as a compact line stream
+
+Counters, gauges and timers are aggregated in memory and written as one line
+per series when the emitter flushes; event records are kept at sample_rate
+and carry that rate so a reader can re-weight them. Every line is a compact
+JSON object:
+
+    {"ts":1718000000.12,"k":"c","n":"filament.events","v":20}
+    {"ts":1718000000.12,"k":"t","n":"filament.stage_ms","c":20,"sum":81.4,"min":3.1,"max":9.8,"t":{"stage":"execute_stubbed_analysis"}}
+    {"ts":1718000000.12,"k":"e","n":"filament.event","rate":0.1,"f":{"eep":"EEP_DISTRIBUTED_INTELLIGENCE","patterns":3}}
+
+Lines go to a local file (appended) or, as datagrams, to udp://host:port or
+unix:///path. An emitter without a target is disabled and every call on it
+returns immediately, so instrumented code never has to check.
+"""
+
+import sys
+import json
+import time
+import atexit
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+logger = logging.getLogger('Metrics')
+
+# Datagrams stay below common loopback/MTU-safe limits
+MAX_DATAGRAM_BYTES = 8192
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def _series_key(name: str, tags: Dict[str, Any]) -> SeriesKey:
+    return name, tuple(sorted(tags.items())) if tags else ()
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(',', ':'), default=str)
+
+
+class _FileSink:
+    """Appends lines to a local file"""
+
+    def __init__(self, path: str):
+        self.f = open(path, 'a', encoding='utf-8')
+
+    def write(self, lines: List[str]):
+        self.f.write("\n".join(lines) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class _DatagramSink:
+    """Sends lines to a UDP or Unix datagram socket, packed up to MAX_DATAGRAM_BYTES"""
+
+    def __init__(self, family_name: str, address):
+        import socket
+
+        family = socket.AF_UNIX if family_name == "unix" else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.address = address
+        self.failures = 0
+
+    def write(self, lines: List[str]):
+        packet: List[bytes] = []
+        size = 0
+        for line in lines:
+            data = line.encode('utf-8')
+            if packet and size + len(data) + 1 > MAX_DATAGRAM_BYTES:
+                self._send(b"\n".join(packet))
+                packet, size = [], 0
+            packet.append(data)
+            size += len(data) + 1
+        if packet:
+            self._send(b"\n".join(packet))
+
+    def _send(self, payload: bytes):
+        # Nobody listening is not an error for the instrumented process
+        try:
+            self.sock.sendto(payload, self.address)
+        except OSError as e:
+            self.failures += 1
+            if self.failures == 1:
+                logger.warning(f"Metrics datagram to {self.address} failed: {e}")
+
+    def close(self):
+        self.sock.close()
+
+
+def parse_target(target: str) -> Tuple[str, Any]:
+    """
+    Split a metrics target into its kind and address
+
+    Args:
+        target: File path, udp://host:port or unix:///path/to/socket
+
+    Returns:
+        ("file", path), ("udp", (host, port)) or ("unix", path)
+    """
+    if target.startswith("udp://"):
+        host, _, port = target[len("udp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid UDP metrics target (expected udp://host:port): {target}")
+        return "udp", (host.strip("[]"), int(port))
+    if target.startswith("unix://"):
+        return "unix", target[len("unix://"):]
+    return "file", target
+
+
+def _open_sink(target: str):
+    kind, address = parse_target(target)
+    if kind == "file":
+        return _FileSink(address)
+    return _DatagramSink(kind, address)
+
+
+class MetricsEmitter:
+    """
+    Structured metrics for one process
+
+    Recording is a dictionary update under a lock; nothing is formatted or
+    written until flush(), which runs every flush_interval seconds, whenever
+    flush_lines event records are buffered, and on close().
+    """
+
+    def __init__(self, target: Optional[str] = None, sample_rate: float = 1.0,
+                 flush_interval: float = 10.0, flush_lines: int = 256, seed: Optional[int] = None):
+        """
+        Args:
+            target: File path, udp://host:port or unix:///path; None disables the emitter
+            sample_rate: Fraction of event records kept (0-1); counters and timers are never sampled
+            flush_interval: Seconds between automatic flushes
+            flush_lines: Buffered event records that trigger a flush
+            seed: Seed for the event sampler, for reproducible streams
+        """
+        self.target = target
+        self.enabled = target is not None
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self.events_seen = 0
+        self.events_kept = 0
+        self._lock = threading.Lock()
+        self._counters: Dict[SeriesKey, float] = {}
+        self._gauges: Dict[SeriesKey, float] = {}
+        self._timers: Dict[SeriesKey, List[float]] = {}
+        self._events: List[str] = []
+        self._sink = None
+        self._rng = None
+        self._last_flush = time.monotonic()
+        if self.enabled:
+            import random
+
+            self._rng = random.Random(seed)
+            self._sink = _open_sink(target)
+
+    def incr(self, name: str, value: float = 1, **tags):
+        """Add value to a counter"""
+        if not self.enabled:
+            return
+        key = _series_key(name, tags)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def gauge(self, name: str, value: float, **tags):
+        """Set a gauge to its latest value"""
+        if not self.enabled:
+            return
+        key = _series_key(name, tags)
+        with self._lock:
+            self._gauges[key] = value
+        self._maybe_flush()
+
+    def timing(self, name: str, ms: float, **tags):
+        """Record one duration in milliseconds"""
+        if not self.enabled:
+            return
+        key = _series_key(name, tags)
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = [1, ms, ms, ms]
+            else:
+                stats[0] += 1
+                stats[1] += ms
+                stats[2] = min(stats[2], ms)
+                stats[3] = max(stats[3], ms)
+        self._maybe_flush()
+
+    @contextmanager
+    def timer(self, name: str, **tags) -> Iterator[None]:
+        """Time the enclosed block into a timer"""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, (time.perf_counter() - t0) * 1000.0, **tags)
+
+    def event(self, name: str, **fields) -> bool:
+        """
+        Record a structured event, kept with probability sample_rate
+
+        Returns:
+            True when the record was kept
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            self.events_seen += 1
+            if self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate:
+                return False
+            self.events_kept += 1
+            self._events.append(_encode({"ts": round(time.time(), 3), "k": "e", "n": name,
+                                         "rate": self.sample_rate, "f": fields}))
+            full = len(self._events) >= self.flush_lines
+        if full:
+            self.flush()
+        else:
+            self._maybe_flush()
+        return True
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events and the aggregates since the last flush"""
+        if not self.enabled:
+            return
+        with self._lock:
+            lines = self._events
+            counters, gauges, timers = self._counters, self._gauges, self._timers
+            self._events, self._counters, self._gauges, self._timers = [], {}, {}, {}
+            self._last_flush = time.monotonic()
+        ts = round(time.time(), 3)
+        for (name, tags), value in counters.items():
+            lines.append(_encode(self._series_record(ts, "c", name, tags, v=value)))
+        for (name, tags), value in gauges.items():
+            lines.append(_encode(self._series_record(ts, "g", name, tags, v=value)))
+        for (name, tags), (count, total, low, high) in timers.items():
+            lines.append(_encode(self._series_record(ts, "t", name, tags, c=count, sum=round(total, 3),
+                                                     min=round(low, 3), max=round(high, 3))))
+        if lines:
+            self._sink.write(lines)
+
+    @staticmethod
+    def _series_record(ts: float, kind: str, name: str, tags, **values) -> Dict[str, Any]:
+        record = {"ts": ts, "k": kind, "n": name}
+        record.update(values)
+        if tags:
+            record["t"] = dict(tags)
+        return record
+
+    def close(self):
+        """Flush and release the target; the emitter is disabled afterwards"""
+        if not self.enabled:
+            return
+        self.flush()
+        self.enabled = False
+        self._sink.close()
+
+
+_default_metrics: Optional[MetricsEmitter] = None
+
+
+def get_default_metrics() -> MetricsEmitter:
+    """Return the process-wide emitter (disabled until configure_metrics is called)"""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = MetricsEmitter()
+    return _default_metrics
+
+
+def configure_metrics(target: Optional[str], sample_rate: float = 1.0, **options) -> MetricsEmitter:
+    """
+    Replace the process-wide emitter; it is flushed and closed at exit
+
+    Args:
+        target: File path, udp://host:port or unix:///path; None disables metrics
+        sample_rate: Fraction of event records kept
+        **options: Further MetricsEmitter arguments
+
+    Returns:
+        The new default emitter
+    """
+    global _default_metrics
+    if _default_metrics is not None:
+        _default_metrics.close()
+    _default_metrics = MetricsEmitter(target, sample_rate, **options)
+    atexit.register(_default_metrics.close)
+    return _default_metrics
+
+
+def summarize_lines(lines) -> Dict[str, Any]:
+    """
+    Fold a metrics stream back into totals
+
+    Counters are summed, gauges keep their last value, timers are merged and
+    event counts are re-weighted by their sample rate.
+
+    Args:
+        lines: Iterable of metric lines
+
+    Returns:
+        Dict with counters, gauges, timers and events, keyed by series
+    """
+    summary = {"counters": {}, "gauges": {}, "timers": {}, "events": {}}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        tags = record.get("t")
+        series = record["n"] + ("{" + ",".join(f"{k}={v}" for k, v in tags.items()) + "}" if tags else "")
+        kind = record["k"]
+        if kind == "c":
+            summary["counters"][series] = summary["counters"].get(series, 0) + record["v"]
+        elif kind == "g":
+            summary["gauges"][series] = record["v"]
+        elif kind == "t":
+            timer = summary["timers"].setdefault(series, {"count": 0, "sum": 0.0, "min": record["min"],
+                                                          "max": record["max"]})
+            timer["count"] += record["c"]
+            timer["sum"] = round(timer["sum"] + record["sum"], 3)
+            timer["min"] = min(timer["min"], record["min"])
+            timer["max"] = max(timer["max"], record["max"])
+        elif kind == "e":
+            events = summary["events"].setdefault(series, {"recorded": 0, "estimated": 0.0})
+            events["recorded"] += 1
+            rate = record.get("rate") or 1.0
+            events["estimated"] = round(events["estimated"] + 1.0 / rate, 1)
+    for timer in summary["timers"].values():
+        timer["mean"] = round(timer["sum"] / timer["count"], 3) if timer["count"] else 0.0
+    return summary
+
+
+def listen(target: str, output=None):
+    """Receive datagrams on a udp:// or unix:// target and write their lines to output"""
+    import socket
+
+    kind, address = parse_target(target)
+    if kind == "file":
+        raise ValueError("listen needs a udp:// or unix:// target")
+    family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    sock.bind(address)
+    output = output or sys.stdout
+    logger.info(f"Listening for metrics on {target}")
+    try:
+        while True:
+            payload = sock.recv(65536)
+            output.write(payload.decode('utf-8') + "\n")
+            output.flush()
+    finally:
+        sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Filament metrics stream tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary_parser = sub.add_parser("summary", help="Summarize a metrics file")
+    summary_parser.add_argument("path", help="Metrics file written with --metrics-output")
+    listen_parser = sub.add_parser("listen", help="Receive a metrics socket stream")
+    listen_parser.add_argument("target", help="udp://host:port or unix:///path")
+    listen_parser.add_argument("--output", metavar="PATH", help="Append received lines to PATH instead of stdout")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    if args.command == "summary":
+        with open(args.path, 'r', encoding='utf-8') as f:
+            print(json.dumps(summarize_lines(f), indent=2))
+        return 0
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    try:
+        listen(args.target, output)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
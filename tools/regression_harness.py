@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Filament Regression Harness
+Runs the reference-case corpus and the schema test queries through Filament
+on a worker pool and diffs the results against recorded expectations
+
+Cases come from two places:
+1. validation/reference_cases/*.yaml - each characterization's EEPs are mapped
+   to LER definitions and characterized in one constellation pass, on the
+   case's filament_test_data section or, when it has none (currently every
+   case), on the demo query's test data
+2. tests/test_schemas.yaml - explicit Filament queries under "test_cases",
+   optionally with inline expectations
+
+Every case records its detected signatures and confidences, runtime and peak
+traced memory. Compared with an expectations file (written by --update), a
+case is reported as pass, drift (signature set or confidence changed),
+perf_regression (runtime or memory grew past the allowed factor), error,
+known_error (the same error is recorded in the expectations) or new.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LER_ROOT = Path(__file__).resolve().parent.parent
+EXPECTATIONS_FILE = os.path.join("validation", "regression_expectations.json")
+EXPECTATIONS_NOTES = [
+    "Reference cases without a filament_test_data section are run on DEMO_QUERY test data "
+    "(observed.input_data = demo_query), so for them the corpus varies the EEPs characterized, "
+    "not the input data."
+]
+
+# Worker-process state, set by _init_worker
+_worker_engine = None
+_worker_root = None
+
+
+def discover_cases(ler_root: str) -> List[Dict[str, Any]]:
+    """
+    Collect regression cases from the reference-case directory and test schemas
+
+    Returns:
+        List of case dicts with case_id, kind and either source or query
+    """
+    import yaml
+
+    root = Path(ler_root)
+    cases = []
+    for path in sorted((root / "validation" / "reference_cases").glob("*.yaml")):
+        cases.append({"case_id": f"reference/{path.stem}", "kind": "reference", "source": str(path)})
+
+    schema_path = root / "tests" / "test_schemas.yaml"
+    if schema_path.exists():
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schemas = yaml.safe_load(f) or {}
+        test_cases = schemas.get("test_cases", []) if isinstance(schemas, dict) else schemas
+        for i, test_case in enumerate(test_cases or []):
+            cases.append({
+                "case_id": f"schema/{test_case.get('case_id', i)}",
+                "kind": "query",
+                "query": test_case.get("query", {}),
+                "expected": test_case.get("expected", {})
+            })
+    return cases
+
+
+def _init_worker(ler_root: str, log_level: int):
+    """Load the LER and engine modules once per worker process"""
+    global _worker_engine, _worker_root
+    _worker_root = ler_root
+    logging.basicConfig(level=log_level)
+    logging.getLogger().setLevel(log_level)
+    from ler_access import LERQueryEngine
+    _worker_engine = LERQueryEngine(ler_root)
+    # Import the engine and analysis modules up front so case runtimes exclude them
+    import constellation, filament_v001, fingerprint_index  # noqa: F401
+    from analysis_registry import ANALYTICS_DIR
+    if ANALYTICS_DIR not in sys.path:
+        sys.path.append(ANALYTICS_DIR)
+    import networkx_analyzer  # noqa: F401
+    # First-use work (lazy YAML loading, building the default fingerprint
+    # index) would otherwise be charged to whichever case triggers it
+    import lazy_yaml  # noqa: F401
+    from fingerprint_index import get_default_index
+    get_default_index()
+
+
+def _map_declared_eeps(document: Dict[str, Any], ler_engine) -> List[str]:
+    """LER EEP ids whose names match the EEPs a characterization declares"""
+    from fingerprint_index import find_section, tokenize
+
+    known = {}
+    for eep_id, definition in ler_engine.eep_definitions.items():
+        known[eep_id] = set(tokenize(definition.name or eep_id))
+
+    matched = []
+    for eep in find_section(document, "individual_eep_characterizations") or []:
+        declared = set(tokenize(eep.get("eep_name", ""))) if isinstance(eep, dict) else set()
+        for eep_id, tokens in known.items():
+            if tokens and declared and (tokens <= declared or declared <= tokens) and eep_id not in matched:
+                matched.append(eep_id)
+    return matched
+
+
+def _run_reference_case(case: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    import yaml
+    from constellation import ConstellationEvent
+    from fingerprint_index import find_section
+    from filament_v001 import DEMO_QUERY
+
+    with open(case["source"], "r", encoding="utf-8") as f:
+        document = yaml.safe_load(f)
+
+    eep_ids = _map_declared_eeps(document, _worker_engine)
+    test_data = find_section(document, "filament_test_data")
+    input_data = "case" if test_data else "demo_query"
+    test_data = test_data or DEMO_QUERY["test_data"]
+    constellation = ConstellationEvent(_worker_engine, eep_ids or None, seed=seed)
+    fingerprint = constellation.characterize(test_data)
+
+    signatures = {}
+    for eep_id, results in fingerprint["eeps_analyzed"].items():
+        for pattern in results.get("patterns", []):
+            signatures[f"{eep_id}/{pattern['name']}"] = round(float(pattern["confidence"]), 4)
+    return {
+        "eeps": {eep_id: round(float(c), 4) for eep_id, c in fingerprint["fingerprint"].items()},
+        "signatures": signatures,
+        "declared_eeps_in_ler": eep_ids,
+        "input_data": input_data
+    }
+
+
+def _run_query_case(case: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    from filament_v001 import FilamentEvent, DEMO_QUERY
+
+    query = {**DEMO_QUERY, "query_text": None, **case["query"]}
+    query.setdefault("random_seed", seed)
+    if query["query_text"] is None:
+        query["query_text"] = f"Regression case {case['case_id']}"
+
+    filament = FilamentEvent(_worker_engine)
+    filament.process_hardcoded_query(query)
+    filament.retrieve_ler_guidance()
+    filament.execute_stubbed_analysis()
+    output = filament.generate_output_projection()
+
+    summary = output["results"]["signature_detection_summary"]
+    return {
+        "eeps": {query["target_eep"]: round(float(summary["overall_confidence"]), 4)},
+        "signatures": {name: round(float(s["confidence"]), 4)
+                       for name, s in output["results"]["detected_signatures"].items()},
+        "status": summary["status"]
+    }
+
+
+def _portable_error(error: Exception) -> str:
+    """Error text with LER root paths made relative, so expectations match in any checkout"""
+    message = f"{type(error).__name__}: {error}"
+    root = Path(_worker_root or DEFAULT_LER_ROOT)
+    for prefix in {str(root.resolve()), str(root)}:
+        message = message.replace(prefix.rstrip(os.sep) + os.sep, "")
+    return message.replace(os.sep, "/")
+
+
+def run_case(task) -> Dict[str, Any]:
+    """
+    Run one case in a worker, recording runtime and peak traced memory
+
+    Module-level so it can be pickled for the process pool.
+    """
+    case, seed = task
+    result = {"case_id": case["case_id"], "kind": case["kind"]}
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        if case["kind"] == "reference":
+            result["observed"] = _run_reference_case(case, seed)
+        else:
+            result["observed"] = _run_query_case(case, seed)
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = _portable_error(e)
+    finally:
+        result["runtime_ms"] = round((time.perf_counter() - start) * 1000.0, 2)
+        result["peak_memory_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024.0, 1)
+        tracemalloc.stop()
+    return result
+
+
+def compare_case(result: Dict[str, Any], expected: Optional[Dict[str, Any]], inline: Dict[str, Any],
+                 tolerance: float, slowdown: float, min_runtime_ms: float) -> Dict[str, Any]:
+    """
+    Diff one case result against its recorded and inline expectations
+
+    Returns:
+        The result dict with status and a list of human-readable differences
+    """
+    differences = []
+    if result["status"] == "error":
+        if inline.get("status") == "error":
+            return {**result, "status": "pass", "differences": []}
+        if expected and expected.get("status") == "error" and expected.get("error") == result["error"]:
+            # Recorded failure (e.g. a reference case that does not parse): reported, not failing
+            return {**result, "status": "known_error", "differences": [result["error"]]}
+        return {**result, "differences": [result["error"]]}
+
+    observed = result["observed"]
+    for name in inline.get("signatures", []):
+        if name not in observed["signatures"]:
+            differences.append(f"expected signature missing: {name}")
+    if "min_patterns" in inline and len(observed["signatures"]) < inline["min_patterns"]:
+        differences.append(f"{len(observed['signatures'])} patterns < min_patterns {inline['min_patterns']}")
+    if "status" in inline and observed.get("status") != inline["status"]:
+        differences.append(f"status {observed.get('status')} != {inline['status']}")
+
+    if expected is None:
+        return {**result, "status": "drift" if differences else "new", "differences": differences}
+
+    if expected.get("status") == "error":
+        differences.append("case recorded as error now succeeds")
+    recorded = expected.get("observed", {})
+    if recorded.get("input_data") != observed.get("input_data"):
+        differences.append(f"input data {recorded.get('input_data')} -> {observed.get('input_data')}")
+    for group in ("eeps", "signatures"):
+        before, after = recorded.get(group, {}), observed.get(group, {})
+        for name in sorted(set(before) - set(after)):
+            differences.append(f"{group[:-1]} no longer detected: {name}")
+        for name in sorted(set(after) - set(before)):
+            differences.append(f"new {group[:-1]} detected: {name}")
+        for name in sorted(set(before) & set(after)):
+            if abs(after[name] - before[name]) > tolerance:
+                differences.append(f"{name} confidence {before[name]} -> {after[name]}")
+
+    regressions = []
+    for metric, unit in (("runtime_ms", "ms"), ("peak_memory_kb", "KB")):
+        baseline = expected.get(metric)
+        floor = min_runtime_ms if metric == "runtime_ms" else 256.0
+        if baseline and result[metric] > slowdown * baseline and result[metric] - baseline > floor:
+            regressions.append(f"{metric} {baseline}{unit} -> {result[metric]}{unit}")
+
+    if differences:
+        status = "drift"
+    elif regressions:
+        status = "perf_regression"
+    else:
+        status = "pass"
+    return {**result, "status": status, "differences": differences + regressions}
+
+
+def run_harness(ler_root: str, workers: int = None, seed: int = 0,
+                case_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Run every discovered case on a process pool"""
+    cases = discover_cases(ler_root)
+    if case_filter:
+        cases = [c for c in cases if case_filter in c["case_id"]]
+    tasks = [(case, seed) for case in cases]
+
+    log_level = logging.getLogger().getEffectiveLevel()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(ler_root), log_level)) as pool:
+        results = list(pool.map(run_case, tasks))
+
+    for case, result in zip(cases, results):
+        result["inline_expected"] = case.get("expected", {})
+    return results
+
+
+def load_expectations(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("cases", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def write_expectations(path: Path, results: List[Dict[str, Any]], seed: int):
+    """Record current results as the new expectations"""
+    cases = {}
+    for result in results:
+        entry = {"status": result["status"], "runtime_ms": result["runtime_ms"],
+                 "peak_memory_kb": result["peak_memory_kb"]}
+        if result["status"] == "ok":
+            entry["observed"] = result["observed"]
+        else:
+            entry["error"] = result["error"]
+        cases[result["case_id"]] = entry
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "notes": EXPECTATIONS_NOTES, "cases": cases}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = ["=" * 78, "FILAMENT REGRESSION REPORT", "=" * 78,
+             f"{'status':<16} {'runtime ms':>11} {'peak KB':>10}  case"]
+    for entry in report:
+        lines.append(f"{entry['status']:<16} {entry['runtime_ms']:>11.1f} {entry['peak_memory_kb']:>10.1f}  "
+                     f"{entry['case_id']}")
+        for difference in entry.get("differences", []):
+            lines.append(f"{'':<40}- {difference}")
+    counts = {}
+    for entry in report:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    lines.append("-" * 78)
+    lines.append(", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the reference-case corpus through Filament and diff the results")
+    parser.add_argument("--ler-root", default=str(DEFAULT_LER_ROOT), help="Path to the LER repository root")
+    parser.add_argument("--workers", type=int, help="Worker processes (defaults to CPU count)")
+    parser.add_argument("--expectations", help=f"Expectations file (default: <ler-root>/{EXPECTATIONS_FILE})")
+    parser.add_argument("--update", action="store_true", help="Record current results as the expectations")
+    parser.add_argument("--report", metavar="PATH", help="Write the full report as JSON to PATH")
+    parser.add_argument("--cases", metavar="SUBSTRING", help="Only run cases whose id contains SUBSTRING")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed passed to every case")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Allowed absolute confidence drift")
+    parser.add_argument("--slowdown", type=float, default=1.5,
+                        help="Runtime/memory growth factor reported as a performance regression")
+    parser.add_argument("--min-runtime-ms", type=float, default=50.0,
+                        help="Ignore runtime growth smaller than this many milliseconds")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    expectations_path = Path(args.expectations or os.path.join(args.ler_root, EXPECTATIONS_FILE))
+    results = run_harness(args.ler_root, args.workers, args.seed, args.cases)
+
+    if args.update:
+        write_expectations(expectations_path, results, args.seed)
+        print(f"Recorded expectations for {len(results)} cases -> {expectations_path}")
+        return 0
+
+    expectations = load_expectations(expectations_path)
+    report = [compare_case(result, expectations.get(result["case_id"]), result.pop("inline_expected"),
+                           args.tolerance, args.slowdown, args.min_runtime_ms)
+              for result in results]
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    failed = [entry for entry in report if entry["status"] in ("drift", "perf_regression", "error")]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Filament Event Result Cache
+Persistent cache of Filament event outputs keyed by query, input data and LER content
+
+A cache key combines:
+1. A hash of the normalized query (EEP, SOP, step, query type)
+2. A hash of the input data
+3. Content hashes of the EEP and SOP YAML files the query references
+
+Editing a referenced YAML file changes its content hash, so only the entries
+that depend on that definition stop matching. invalidate_stale() removes them.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Query fields that determine the analysis; free text such as query_text does not.
+# Every field an analysis plugin reads from query_data must be listed here.
+QUERY_KEY_FIELDS = ("query_type", "target_eep", "analysis_sop", "specific_step", "random_seed",
+                    "bootstrap_resamples", "weighted_analysis", "time_budget_seconds")
+
+
+def _stable_hash(obj: Any) -> str:
+    """SHA-256 of a canonical JSON encoding"""
+    encoded = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class EventResultCache:
+    """
+    Directory-backed cache of Filament event results
+
+    Each entry is a JSON file named by its key. An index file maps every
+    definition id to the keys that depend on it, so invalidating a definition
+    touches only the affected entries. Index updates hold an exclusive lock
+    on a side file, so events finishing together in several processes do
+    not drop each other's keys.
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = "index.lock"
+    VERSION_FILE = "ler_version.json"
+
+    def __init__(self, cache_dir: str = ".filament_cache"):
+        """
+        Args:
+            cache_dir: Directory holding cache entries (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    # Key construction
+
+    @staticmethod
+    def normalize_query(query_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a query to the fields that determine its result"""
+        normalized = {}
+        for field in QUERY_KEY_FIELDS:
+            value = query_data.get(field)
+            normalized[field] = value.strip() if isinstance(value, str) else value
+        return normalized
+
+    def make_key(self, query_data: Dict[str, Any], ler_engine) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Build the cache key for a query against the current LER content
+
+        Args:
+            query_data: FilamentEvent query dict
+            ler_engine: LERQueryEngine providing definition content hashes
+
+        Returns:
+            (key, dependencies) where dependencies maps definition id to content
+            hash. key is None if a referenced definition has no source file.
+        """
+        dependencies = {}
+        for field in ("target_eep", "analysis_sop"):
+            definition_id = query_data.get(field)
+            if not definition_id:
+                continue
+            content_hash = ler_engine.get_definition_content_hash(definition_id)
+            if content_hash is None:
+                return None, {}
+            dependencies[definition_id] = content_hash
+
+        key = _stable_hash({
+            "query": _stable_hash(self.normalize_query(query_data)),
+            "input": _stable_hash(query_data.get("test_data")),
+            "ler": dependencies
+        })
+        return key, dependencies
+
+    # Entry access
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        """Atomic write so concurrent readers never see a partial file"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cache entry
+
+        Returns:
+            Entry dict with analysis_results and final_output, or None on a miss
+        """
+        if key is None:
+            self.misses += 1
+            return None
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: Optional[str], dependencies: Dict[str, str],
+            analysis_results: Dict[str, Any], final_output: Dict[str, Any]):
+        """Store the results of a completed event"""
+        if key is None:
+            return
+        self._write_json(self._entry_path(key), {
+            "key": key,
+            "created": time.time(),
+            "dependencies": dependencies,
+            "analysis_results": analysis_results,
+            "final_output": final_output
+        })
+        with self._index_lock():
+            index = self._load_index()
+            for definition_id, content_hash in dependencies.items():
+                index.setdefault(definition_id, {})[key] = content_hash
+            self._write_json(self.cache_dir / self.INDEX_FILE, index)
+
+    @contextmanager
+    def _index_lock(self):
+        """Exclusive inter-process lock held while the index is read, changed and rewritten"""
+        with open(self.cache_dir / self.LOCK_FILE, 'a+b') as f:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # Invalidation
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """Load the definition id -> {key: content hash} index"""
+        try:
+            with open(self.cache_dir / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _remove_keys(self, index: Dict[str, Dict[str, str]], keys: List[str]) -> int:
+        """Delete entry files and drop the keys from every index bucket"""
+        removed = 0
+        for key in keys:
+            try:
+                self._entry_path(key).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        doomed = set(keys)
+        for definition_id in list(index):
+            bucket = {k: h for k, h in index[definition_id].items() if k not in doomed}
+            if bucket:
+                index[definition_id] = bucket
+            else:
+                del index[definition_id]
+        return removed
+
+    def invalidate_definition(self, definition_id: str) -> int:
+        """
+        Remove every entry that depends on a definition
+
+        Returns:
+            Number of entries removed
+        """
+        with self._index_lock():
+            index = self._load_index()
+            removed = self._remove_keys(index, list(index.get(definition_id, {})))
+            self._write_json(self.cache_dir / self.INDEX_FILE, index)
+        return removed
+
+    def invalidate_stale(self, ler_engine) -> int:
+        """
+        Remove entries whose recorded definition hashes no longer match the LER
+
+        Works from the index alone: entry files are only touched when removed.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._index_lock():
+            index = self._load_index()
+            stale = []
+            for definition_id, bucket in index.items():
+                current_hash = ler_engine.get_definition_content_hash(definition_id)
+                stale.extend(key for key, content_hash in bucket.items() if content_hash != current_hash)
+            removed = self._remove_keys(index, stale)
+            self._write_json(self.cache_dir / self.INDEX_FILE, index)
+        if removed:
+            logger.info(f"Invalidated {removed} stale cache entries")
+        return removed
+
+    def check_ler_version(self, ler_engine) -> int:
+        """
+        Invalidate stale entries when the LER version differs from the last run
+
+        Called once at startup: an unchanged LER version (the snapshot root
+        hash) means no definition changed, so the index scan is skipped.
+
+        Returns:
+            Number of entries removed
+        """
+        version = ler_engine.ler_version
+        path = self.cache_dir / self.VERSION_FILE
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if json.load(f).get("ler_version") == version:
+                    return 0
+        except (OSError, ValueError):
+            pass
+        removed = self.invalidate_stale(ler_engine)
+        self._write_json(path, {"ler_version": version})
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and entry count"""
+        entries = sum(1 for p in self.cache_dir.glob("*.json")
+                      if p.name not in (self.INDEX_FILE, self.VERSION_FILE))
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Compiled Signature-Pattern Matchers
+Vectorized scoring of observations against the quantitative signature patterns of every EEP
+
+EEP definitions declare quantitative signature patterns with a detection
+method and typical_values written as prose ("1.5x to 100x improvement",
+"0.01 to 0.1 per update", "10-100 time_constants"). compile_signature_matchers()
+parses those strings into numeric ranges once, when the LER is loaded, and
+binds each detection method to a kernel in analytics/signature_kernels.py.
+SignatureMatcherSet.score() then measures a whole batch of observations with
+each distinct kernel once and scores every range of every pattern of every
+EEP in a single array operation.
+
+Observations are a dict of arrays with the batch on axis 0. Kernel inputs
+may be grouped under the detection method name (so different kernels can
+each have their own "input"/"output"); a quantity can also be given directly
+as "<pattern_id>.<typical_values key>" or "<typical_values key>".
+
+Parsing is pure Python; NumPy and the kernel module are imported on the
+first score() call, so compiling at load time stays cheap.
+"""
+
+import re
+import math
+import logging
+from typing import Dict, Any, List, Optional, Tuple, Mapping
+
+from analysis_registry import AnalysisPlugin
+
+logger = logging.getLogger(__name__)
+
+# detection_method -> "module:attribute" kernel in tools/analytics
+DETECTION_KERNELS = {
+    "measure_input_output_signal_noise_ratio": "signature_kernels:snr_gain",
+    "track_threshold_values_over_time": "signature_kernels:threshold_adaptation",
+    "measure_differential_response_to_inputs": "signature_kernels:differential_response",
+}
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_BETWEEN = re.compile(rf"({_NUMBER})\s*(x|%)?\s*(?:to|–|—|-)\s*({_NUMBER})\s*(x|%)?", re.IGNORECASE)
+_PLUS_MINUS = re.compile(rf"({_NUMBER})\s*(?:_?plus_minus_?|±|\+/-)\s*({_NUMBER})", re.IGNORECASE)
+_BOUND = re.compile(rf"(>=|<=|>|<|≥|≤|above|below|at least|at most|over|under)\s*({_NUMBER})\s*(x|%)?",
+                    re.IGNORECASE)
+_SINGLE = re.compile(rf"(?:~|≈|about\s+)?({_NUMBER})\s*(x|%)?")
+_LOWER_BOUNDS = (">", ">=", "≥", "above", "at least", "over")
+
+
+class ValueRange:
+    """
+    A typical-value range parsed from an EEP definition
+
+    low/high are None for one-sided bounds. Ranges over positive values are
+    scored in log10 space, so "1.5x to 100x" is as wide as its decades.
+    """
+
+    __slots__ = ("low", "high", "unit", "text")
+
+    def __init__(self, low: Optional[float], high: Optional[float], unit: str = "", text: str = ""):
+        self.low = low
+        self.high = high
+        self.unit = unit
+        self.text = text
+
+    @property
+    def log_scale(self) -> bool:
+        bounds = [b for b in (self.low, self.high) if b is not None]
+        return bool(bounds) and min(bounds) > 0
+
+    def __repr__(self) -> str:
+        return f"ValueRange({self.low}, {self.high}, unit={self.unit!r})"
+
+
+def _unit(text: str, span: Tuple[int, int], suffix: Optional[str]) -> str:
+    rest = (text[:span[0]] + " " + text[span[1]:]).replace("_", " ")
+    rest = " ".join(rest.split())
+    return " ".join(part for part in (suffix, rest) if part)
+
+
+def parse_value_range(text: Any) -> Optional[ValueRange]:
+    """
+    Parse a typical_values string into a numeric range
+
+    Handles "A to B", "A-B", "Ax to Bx", "N_plus_minus_M", one-sided bounds
+    (">0.8", "below 0.1") and single values. Returns None for non-numeric
+    descriptions such as "decibels or ratio" or "application_dependent".
+    """
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return ValueRange(float(text), float(text), "", str(text))
+    if not isinstance(text, str):
+        return None
+
+    match = _PLUS_MINUS.search(text)
+    if match:
+        center, spread = float(match.group(1)), abs(float(match.group(2)))
+        return ValueRange(center - spread, center + spread, _unit(text, match.span(), None), text)
+
+    match = _BETWEEN.search(text)
+    if match:
+        low, high = float(match.group(1)), float(match.group(3))
+        if low > high:
+            low, high = high, low
+        return ValueRange(low, high, _unit(text, match.span(), match.group(2) or match.group(4)), text)
+
+    match = _BOUND.search(text)
+    if match:
+        value = float(match.group(2))
+        unit = _unit(text, match.span(), match.group(3))
+        if match.group(1).lower() in _LOWER_BOUNDS:
+            return ValueRange(value, None, unit, text)
+        return ValueRange(None, value, unit, text)
+
+    match = _SINGLE.search(text)
+    if match:
+        value = float(match.group(1))
+        return ValueRange(value, value, _unit(text, match.span(), match.group(2)), text)
+    return None
+
+
+def _falloff(value_range: ValueRange) -> float:
+    """Score falloff width outside a range: half its width, floored per scale"""
+    bounds = [b for b in (value_range.low, value_range.high) if b is not None]
+    if value_range.log_scale:
+        width = 0.5 * math.log10(max(bounds) / min(bounds)) if len(bounds) == 2 else 0.0
+        return max(width, 0.15)
+    width = 0.5 * (max(bounds) - min(bounds)) if len(bounds) == 2 else 0.0
+    return max(width, 0.1 * max(abs(b) for b in bounds), 1e-12)
+
+
+class PatternMatcher:
+    """One quantitative signature pattern with parsed ranges and its detection kernel"""
+
+    __slots__ = ("eep_id", "pattern_id", "name", "detection_method", "ranges", "kernel")
+
+    def __init__(self, eep_id: str, pattern_id: str, name: str, detection_method: str,
+                 ranges: Tuple[Tuple[str, ValueRange], ...]):
+        self.eep_id = eep_id
+        self.pattern_id = pattern_id
+        self.name = name
+        self.detection_method = detection_method
+        self.ranges = ranges
+        target = DETECTION_KERNELS.get(detection_method)
+        # Resolved on first use, like analysis plugins
+        self.kernel = AnalysisPlugin(detection_method, target, source="signature_kernel") if target else None
+
+    def __repr__(self) -> str:
+        return f"PatternMatcher({self.eep_id}/{self.pattern_id}, {len(self.ranges)} ranges)"
+
+
+class SignatureMatcherSet:
+    """
+    All compiled matchers of an LER, scored together
+
+    Each (pattern, typical_values key) pair is one column; score() fills a
+    (B, columns) matrix of measured quantities, scores it against the stacked
+    range bounds in one operation and averages the columns of each pattern.
+    """
+
+    def __init__(self, matchers: List[PatternMatcher]):
+        self.matchers = matchers
+        self.columns = [(m, key, value_range) for m in matchers for key, value_range in m.ranges]
+        self._arrays = None
+
+    def __len__(self) -> int:
+        return len(self.matchers)
+
+    @property
+    def pattern_keys(self) -> List[Tuple[str, str]]:
+        """(eep_id, pattern_id) for each row of score() output's pattern axis"""
+        return [(m.eep_id, m.pattern_id) for m in self.matchers]
+
+    def _bounds(self):
+        """Stacked range bounds, built on first use"""
+        if self._arrays is None:
+            import numpy as np
+
+            low = np.array([r.low if r.low is not None else -np.inf for _, _, r in self.columns])
+            high = np.array([r.high if r.high is not None else np.inf for _, _, r in self.columns])
+            log = np.array([r.log_scale for _, _, r in self.columns], dtype=bool)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_low = np.where(log, np.log10(low), low)
+                t_high = np.where(log, np.log10(high), high)
+            owner = {id(m): i for i, m in enumerate(self.matchers)}
+            self._arrays = {
+                "low": t_low, "high": t_high, "log": log,
+                "sigma": np.array([_falloff(r) for _, _, r in self.columns]),
+                "pattern": np.array([owner[id(m)] for m, _, _ in self.columns], dtype=np.int64)
+            }
+        return self._arrays
+
+    def measure(self, observations: Dict[str, Any], batch_size: Optional[int] = None):
+        """
+        Measured quantity per column
+
+        Returns:
+            (B, columns) array, NaN where a quantity could not be measured
+        """
+        import numpy as np
+
+        measured = {}
+        for method in {m.detection_method for m in self.matchers if m.kernel is not None}:
+            kernel = next(m.kernel for m in self.matchers if m.detection_method == method and m.kernel)
+            inputs = observations.get(method, observations)
+            if not isinstance(inputs, Mapping):
+                continue
+            try:
+                measured[method] = kernel.load()(inputs)
+            except Exception as e:
+                logger.warning(f"Detection kernel {kernel.target} failed: {e}")
+
+        columns = []
+        for matcher, key, _ in self.columns:
+            value = observations.get(f"{matcher.pattern_id}.{key}")
+            if value is None:
+                value = measured.get(matcher.detection_method, {}).get(key)
+            if value is None and key in observations and not isinstance(observations[key], Mapping):
+                value = observations[key]
+            columns.append(None if value is None else np.atleast_1d(np.asarray(value, dtype=np.float64)))
+
+        if batch_size is None:
+            sizes = {len(c) for c in columns if c is not None}
+            batch_size = max(sizes) if sizes else 1
+        matrix = np.full((batch_size, len(columns)), np.nan)
+        for j, values in enumerate(columns):
+            if values is not None:
+                matrix[:, j] = values.ravel()[:batch_size] if len(values) >= batch_size else values[0]
+        return matrix
+
+    def score(self, observations: Dict[str, Any], batch_size: Optional[int] = None):
+        """
+        Score a batch of observations against every compiled pattern
+
+        A measured quantity inside its typical range scores 1; outside, the
+        score falls off as exp(-d^2 / 2 sigma^2) with d the distance to the
+        nearest bound (in decades for log-scale ranges).
+
+        Returns:
+            (B, patterns) array of 0-1 scores, ordered like pattern_keys;
+            NaN for patterns with no measurable quantity
+        """
+        import numpy as np
+
+        bounds = self._bounds()
+        values = self.measure(observations, batch_size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = np.where(bounds["log"], np.log10(np.where(values > 0, values, np.nan)), values)
+        distance = np.maximum(bounds["low"] - scaled, 0.0) + np.maximum(scaled - bounds["high"], 0.0)
+        column_scores = np.exp(-0.5 * (distance / bounds["sigma"]) ** 2)
+        # Non-positive values on a log-scale range are outside it
+        column_scores = np.where(bounds["log"] & (values <= 0), 0.0, column_scores)
+
+        measured = ~np.isnan(values)
+        totals = np.zeros((values.shape[0], len(self.matchers)))
+        counts = np.zeros_like(totals)
+        np.add.at(totals.T, bounds["pattern"], np.where(measured, column_scores, 0.0).T)
+        np.add.at(counts.T, bounds["pattern"], measured.T.astype(np.float64))
+        with np.errstate(invalid="ignore"):
+            return totals / np.where(counts > 0, counts, np.nan)
+
+    def score_by_eep(self, observations: Dict[str, Any], batch_size: Optional[int] = None
+                     ) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-EEP view of score(): eep_id -> {pattern_id: (B,) scores}
+
+        Patterns without a measurable quantity are omitted.
+        """
+        import numpy as np
+
+        scores = self.score(observations, batch_size)
+        results: Dict[str, Dict[str, Any]] = {}
+        for i, matcher in enumerate(self.matchers):
+            if not np.all(np.isnan(scores[:, i])):
+                results.setdefault(matcher.eep_id, {})[matcher.pattern_id] = scores[:, i]
+        return results
+
+
+def compile_signature_matchers(eep_definitions: Mapping[str, Any]) -> SignatureMatcherSet:
+    """
+    Compile the quantitative signature patterns of every EEP
+
+    Args:
+        eep_definitions: eep_id -> EEPRecord (or definition dict)
+
+    Returns:
+        SignatureMatcherSet over every pattern with at least one parseable
+        typical value
+    """
+    from ler_records import EEPRecord
+
+    matchers = []
+    for eep_id, eep in eep_definitions.items():
+        record = eep if isinstance(eep, EEPRecord) else EEPRecord.from_dict(dict(eep))
+        for pattern in record.patterns:
+            typical = pattern.section("typical_values")
+            if not isinstance(typical, Mapping):
+                continue
+            ranges = []
+            for key, text in typical.items():
+                value_range = parse_value_range(text)
+                if value_range is not None:
+                    ranges.append((str(key), value_range))
+            if not ranges:
+                continue
+            if pattern.detection_method not in DETECTION_KERNELS:
+                logger.debug(f"{eep_id}/{pattern.pattern_id}: no kernel for {pattern.detection_method}; "
+                             f"quantities must be observed directly")
+            matchers.append(PatternMatcher(eep_id, pattern.pattern_id, pattern.name or pattern.pattern_id,
+                                           pattern.detection_method, tuple(ranges)))
+    return SignatureMatcherSet(matchers)
+
+
+if __name__ == "__main__":
+    from ler_access import LERQueryEngine
+
+    matchers = LERQueryEngine("..").signature_matchers
+    print(f"{len(matchers)} compiled signature patterns")
+    for matcher in matchers.matchers:
+        kernel = matcher.kernel.target if matcher.kernel else "direct observation"
+        print(f"\n{matcher.eep_id}/{matcher.pattern_id} ({kernel})")
+        for key, value_range in matcher.ranges:
+            print(f"  {key}: {value_range.low} .. {value_range.high} {value_range.unit}  <- {value_range.text!r}")
@@ -0,0 +1,334 @@
+# Ising Model Monte Carlo Generator
+# File: tools/simulations/ising.py
+
+import os
+import sys
+import json
+import math
+import logging
+import argparse
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Onsager's exact critical temperature of the square-lattice model, in units of J/k_B
+CRITICAL_TEMPERATURE = 2.0 / math.log(1.0 + math.sqrt(2.0))
+
+
+def critical_sweep(n_temperatures: int, width: float = 0.4, J: float = 1.0) -> np.ndarray:
+    """Temperatures spaced evenly across [Tc - width, Tc + width] (Tc scaled by J)"""
+    tc = CRITICAL_TEMPERATURE * J
+    return np.linspace(tc - width, tc + width, n_temperatures)
+
+
+def load_ising_run(directory: str) -> Dict[str, Any]:
+    """
+    Open a run written by IsingSimulator.run without reading the arrays into RAM
+
+    Returns:
+        The run metadata plus memmaps "magnetization", "energy" and
+        "susceptibility" shaped (n_records, n_temperatures) and "snapshots"
+        shaped (n_snapshots, n_temperatures, L, L)
+    """
+    with open(os.path.join(directory, "metadata.json"), "r", encoding="utf-8") as f:
+        run = json.load(f)
+    for name, spec in run["arrays"].items():
+        if spec["shape"][0]:
+            run[name] = np.memmap(os.path.join(directory, spec["file"]), dtype=spec["dtype"],
+                                  mode="r", shape=tuple(spec["shape"]))
+        else:
+            run[name] = np.empty(tuple(spec["shape"]), dtype=spec["dtype"])
+    return run
+
+
+class IsingSimulator:
+    """
+    Square-lattice Ising model at many temperatures at once
+
+    The lattice is stored as its two checkerboard sublattices, each shaped
+    (n_temperatures, L, L/2) int8. Every spin of one sublattice only couples
+    to the other, so a half-sweep updates a whole sublattice for every
+    temperature in one set of array operations. Acceptance probabilities
+    come from a per-temperature lookup table (the local field takes only
+    five values), so no exp() is evaluated per spin. Boundaries are periodic.
+    """
+
+    def __init__(self, size: int, temperatures: Sequence[float], J: float = 1.0, h: float = 0.0,
+                 algorithm: str = "metropolis", seed: Optional[int] = None, initial: str = "random"):
+        """
+        Args:
+            size: Lattice side L (even)
+            temperatures: Temperatures in units of J/k_B, one lattice each
+            J: Coupling constant
+            h: External field
+            algorithm: "metropolis" or "heat_bath"
+            seed: Random seed
+            initial: "random" (infinite-temperature start) or "ordered" (all +1)
+        """
+        if size < 2 or size % 2:
+            raise ValueError(f"Lattice size must be even and >= 2, got {size}")
+        if algorithm not in ("metropolis", "heat_bath"):
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        self.size = size
+        self.temperatures = np.asarray(temperatures, dtype=np.float64).reshape(-1)
+        if np.any(self.temperatures <= 0):
+            raise ValueError("Temperatures must be positive")
+        self.J = J
+        self.h = h
+        self.algorithm = algorithm
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.sweeps_done = 0
+
+        shape = (len(self.temperatures), size, size // 2)
+        if initial == "ordered":
+            self.black = np.ones(shape, dtype=np.int8)
+            self.white = np.ones(shape, dtype=np.int8)
+        else:
+            self.black = (self.rng.integers(0, 2, shape, dtype=np.int8) * 2 - 1).astype(np.int8)
+            self.white = (self.rng.integers(0, 2, shape, dtype=np.int8) * 2 - 1).astype(np.int8)
+
+        self._table = self._probability_table().astype(np.float32).ravel()
+        # Row offsets into the flattened table, one block per temperature
+        self._table_offset = (np.arange(len(self.temperatures), dtype=np.int32) * self._table_width)[:, None, None]
+        self._random = np.empty(shape, dtype=np.float32)
+        self._field = np.empty(shape, dtype=np.int8)
+        self._index = np.empty(shape, dtype=np.int32)
+
+    @property
+    def n_temperatures(self) -> int:
+        return len(self.temperatures)
+
+    @property
+    def n_spins(self) -> int:
+        return self.size * self.size
+
+    @property
+    def _table_width(self) -> int:
+        return 10 if self.algorithm == "metropolis" else 5
+
+    def _probability_table(self) -> np.ndarray:
+        """
+        Per-temperature update probabilities indexed by local configuration
+
+        Metropolis: acceptance of flipping spin s with neighbour sum n,
+        index (s + 1) / 2 * 5 + (n + 4) / 2. Heat bath: probability of the
+        spin becoming +1 given n, index (n + 4) / 2.
+        """
+        beta = 1.0 / self.temperatures[:, None]
+        neighbour_sums = np.arange(-4, 5, 2)[None, :]
+        local_field = self.J * neighbour_sums + self.h
+        if self.algorithm == "heat_bath":
+            return 1.0 / (1.0 + np.exp(-2.0 * beta * local_field))
+        down = np.minimum(1.0, np.exp(-2.0 * beta * -local_field))  # flipping s = -1
+        up = np.minimum(1.0, np.exp(-2.0 * beta * local_field))     # flipping s = +1
+        return np.concatenate([down, up], axis=1)
+
+    def _neighbour_sum(self, other: np.ndarray, odd_rows_shift: int) -> np.ndarray:
+        """
+        Sum of the four neighbours (all on the other sublattice) of each site
+
+        Vertical neighbours sit in the same packed column one row up and down;
+        of the horizontal ones, one shares the packed column and the other is
+        one column left or right depending on the row's parity.
+        """
+        field = self._field
+        np.add(np.roll(other, 1, axis=1), np.roll(other, -1, axis=1), out=field)
+        field += other
+        field[:, 0::2] += np.roll(other[:, 0::2], -odd_rows_shift, axis=2)
+        field[:, 1::2] += np.roll(other[:, 1::2], odd_rows_shift, axis=2)
+        return field
+
+    def _update(self, spins: np.ndarray, other: np.ndarray, odd_rows_shift: int):
+        field = self._neighbour_sum(other, odd_rows_shift)
+        index = self._index
+        np.add(field, 4, out=index)
+        index //= 2
+        if self.algorithm == "metropolis":
+            index += (spins > 0) * 5
+        index += self._table_offset
+        probability = self._table[index]
+        self.rng.random(dtype=np.float32, out=self._random)
+        if self.algorithm == "metropolis":
+            spins[self._random < probability] *= -1
+        else:
+            np.copyto(spins, np.where(self._random < probability, np.int8(1), np.int8(-1)))
+
+    def sweep(self, n_sweeps: int = 1):
+        """Run full lattice sweeps (black then white half-sweep) at every temperature"""
+        for _ in range(n_sweeps):
+            # Black sites sit at (i, 2j + i % 2): the second horizontal neighbour is one packed
+            # column left on even rows and right on odd rows; white sites mirror that
+            self._update(self.black, self.white, -1)
+            self._update(self.white, self.black, 1)
+            self.sweeps_done += 1
+
+    # Observables
+
+    def magnetization(self) -> np.ndarray:
+        """Magnetization per spin for each temperature"""
+        total = self.black.sum(axis=(1, 2), dtype=np.int64) + self.white.sum(axis=(1, 2), dtype=np.int64)
+        return total / self.n_spins
+
+    def energy(self) -> np.ndarray:
+        """Energy per spin for each temperature (every bond joins a black and a white site)"""
+        field = self._neighbour_sum(self.white, -1)
+        bonds = (self.black * field.astype(np.int32)).sum(axis=(1, 2), dtype=np.int64)
+        return (-self.J * bonds) / self.n_spins - self.h * self.magnetization()
+
+    def lattice(self) -> np.ndarray:
+        """Full (n_temperatures, L, L) spin configuration"""
+        full = np.empty((self.n_temperatures, self.size, self.size), dtype=np.int8)
+        full[:, 0::2, 0::2] = self.black[:, 0::2]
+        full[:, 0::2, 1::2] = self.white[:, 0::2]
+        full[:, 1::2, 1::2] = self.black[:, 1::2]
+        full[:, 1::2, 0::2] = self.white[:, 1::2]
+        return full
+
+    # Runs
+
+    def run(self, n_sweeps: int, output_dir: str, burn_in: int = 0, record_every: int = 1,
+            snapshot_every: int = 0) -> Dict[str, Any]:
+        """
+        Equilibrate, then record observables and snapshots to memory-mapped files
+
+        Writes to output_dir:
+            magnetization.f32, energy.f32, susceptibility.f32 - (n_records, n_temperatures);
+                susceptibility is the running estimate N (<m^2> - <|m|>^2) / T
+            snapshots.i8 - (n_snapshots, n_temperatures, L, L) lattices
+            metadata.json - parameters, array shapes and per-temperature summaries
+
+        Args:
+            n_sweeps: Sweeps after burn-in
+            output_dir: Directory for the run (created if missing)
+            burn_in: Unrecorded equilibration sweeps
+            record_every: Sweeps between observable records
+            snapshot_every: Sweeps between lattice snapshots (0 disables them)
+
+        Returns:
+            The metadata dict (see load_ising_run to reopen the arrays)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        n_records = n_sweeps // record_every
+        n_snapshots = n_sweeps // snapshot_every if snapshot_every else 0
+        n_t = self.n_temperatures
+
+        arrays = {
+            "magnetization": {"file": "magnetization.f32", "dtype": "float32", "shape": [n_records, n_t]},
+            "energy": {"file": "energy.f32", "dtype": "float32", "shape": [n_records, n_t]},
+            "susceptibility": {"file": "susceptibility.f32", "dtype": "float32", "shape": [n_records, n_t]},
+            "snapshots": {"file": "snapshots.i8", "dtype": "int8",
+                          "shape": [n_snapshots, n_t, self.size, self.size]},
+        }
+        outputs = {}
+        for name, spec in arrays.items():
+            path = os.path.join(output_dir, spec["file"])
+            if spec["shape"][0]:
+                outputs[name] = np.memmap(path, dtype=spec["dtype"], mode="w+", shape=tuple(spec["shape"]))
+            else:
+                open(path, "wb").close()
+
+        self.sweep(burn_in)
+        m_sum = np.zeros(n_t)
+        m_abs_sum = np.zeros(n_t)
+        m2_sum = np.zeros(n_t)
+        m4_sum = np.zeros(n_t)
+        e_sum = np.zeros(n_t)
+        e2_sum = np.zeros(n_t)
+        record = snapshot = 0
+        for step in range(1, n_sweeps + 1):
+            self.sweep()
+            if step % record_every == 0 and record < n_records:
+                m = self.magnetization()
+                e = self.energy()
+                m_sum += m
+                m_abs_sum += np.abs(m)
+                m2_sum += m * m
+                m4_sum += m ** 4
+                e_sum += e
+                e2_sum += e * e
+                count = record + 1
+                outputs["magnetization"][record] = m
+                outputs["energy"][record] = e
+                outputs["susceptibility"][record] = (self.n_spins * (m2_sum / count - (m_abs_sum / count) ** 2)
+                                                     / self.temperatures)
+                record += 1
+            if snapshot_every and step % snapshot_every == 0 and snapshot < n_snapshots:
+                outputs["snapshots"][snapshot] = self.lattice()
+                snapshot += 1
+
+        for array in outputs.values():
+            array.flush()
+
+        summary = {}
+        if n_records:
+            mean_m2, mean_e, mean_e2 = m2_sum / n_records, e_sum / n_records, e2_sum / n_records
+            summary = {
+                "mean_abs_magnetization": (m_abs_sum / n_records).round(6).tolist(),
+                "susceptibility": (self.n_spins * (mean_m2 - (m_abs_sum / n_records) ** 2)
+                                   / self.temperatures).round(6).tolist(),
+                "specific_heat": (self.n_spins * (mean_e2 - mean_e ** 2)
+                                  / self.temperatures ** 2).round(6).tolist(),
+                "binder_cumulant": np.where(mean_m2 > 0, 1.0 - (m4_sum / n_records) / (3.0 * np.maximum(mean_m2, 1e-300) ** 2),
+                                            0.0).round(6).tolist(),
+            }
+            peak = int(np.argmax(summary["susceptibility"]))
+            summary["susceptibility_peak_temperature"] = float(self.temperatures[peak])
+
+        metadata = {
+            "model": "ising_2d_square",
+            "size": self.size,
+            "temperatures": self.temperatures.tolist(),
+            "J": self.J,
+            "h": self.h,
+            "algorithm": self.algorithm,
+            "seed": self.seed,
+            "burn_in": burn_in,
+            "sweeps": n_sweeps,
+            "record_every": record_every,
+            "snapshot_every": snapshot_every,
+            "critical_temperature": CRITICAL_TEMPERATURE * self.J,
+            "arrays": arrays,
+            "summary": summary,
+        }
+        with open(os.path.join(output_dir, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        logger.info(f"Ising run: L={self.size}, {n_t} temperatures, {burn_in}+{n_sweeps} sweeps -> {output_dir}")
+        return metadata
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate Ising-model trajectories for the validation corpus")
+    parser.add_argument("--size", type=int, default=256, help="Lattice side L (even)")
+    parser.add_argument("--temperatures", type=float, nargs="+", help="Temperatures in units of J/k_B")
+    parser.add_argument("--critical-sweep", type=int, metavar="N", default=8,
+                        help="Without --temperatures, N temperatures across the critical point")
+    parser.add_argument("--width", type=float, default=0.4, help="Half-width of the critical sweep")
+    parser.add_argument("--algorithm", choices=["metropolis", "heat_bath"], default="metropolis")
+    parser.add_argument("--sweeps", type=int, default=1000)
+    parser.add_argument("--burn-in", type=int, default=200)
+    parser.add_argument("--record-every", type=int, default=1)
+    parser.add_argument("--snapshot-every", type=int, default=0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", required=True, help="Run directory")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    temperatures = args.temperatures or critical_sweep(args.critical_sweep, args.width)
+    simulator = IsingSimulator(args.size, temperatures, algorithm=args.algorithm, seed=args.seed)
+    metadata = simulator.run(args.sweeps, args.output, args.burn_in, args.record_every, args.snapshot_every)
+
+    summary = metadata["summary"]
+    if summary:
+        print(f"{'T':>8} {'<|m|>':>8} {'chi':>12} {'C':>10} {'U4':>8}")
+        for i, t in enumerate(metadata["temperatures"]):
+            print(f"{t:>8.4f} {summary['mean_abs_magnetization'][i]:>8.4f} {summary['susceptibility'][i]:>12.3f} "
+                  f"{summary['specific_heat'][i]:>10.4f} {summary['binder_cumulant'][i]:>8.4f}")
+        print(f"Susceptibility peak at T = {summary['susceptibility_peak_temperature']:.4f} "
+              f"(Tc = {metadata['critical_temperature']:.4f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
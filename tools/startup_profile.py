@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Startup Profiling for the Filament CLI
+Per-module import cost and time-to-first-event reporting
+
+ImportProfiler installs a meta path finder that times every module executed
+while it is active, attributing self time and cumulative time the same way
+``python -X importtime`` does.
+"""
+
+import sys
+import time
+import json
+from typing import Dict, Any, List, Optional
+
+
+class _TimedLoader:
+    """Loader proxy that times exec_module for the wrapped loader"""
+
+    def __init__(self, loader, profiler: 'ImportProfiler', name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportProfiler:
+    """
+    Records import time of every module loaded while active
+
+    Usage:
+        with ImportProfiler() as profiler:
+            import heavy_module
+        profiler.report()
+    """
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, float]] = {}
+        self._stack: List[List[float]] = []
+        self._active = False
+
+    # Meta path finder protocol
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self._active or fullname in self.records:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self, fullname)
+                return spec
+        return None
+
+    def _enter(self, name: str):
+        # [start time, time spent in nested imports]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str):
+        start, nested = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        self.records[name] = {
+            "self_ms": (cumulative - nested) * 1000.0,
+            "cumulative_ms": cumulative * 1000.0,
+            "depth": len(self._stack)
+        }
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    def start(self):
+        if not self._active:
+            sys.meta_path.insert(0, self)
+            self._active = True
+
+    def stop(self):
+        if self._active:
+            self._active = False
+            if self in sys.meta_path:
+                sys.meta_path.remove(self)
+
+    def __enter__(self) -> 'ImportProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def total_import_ms(self) -> float:
+        """Total time spent in top-level imports while profiling"""
+        return sum(r["cumulative_ms"] for r in self.records.values() if r["depth"] == 0)
+
+    def top_modules(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Return the modules with the highest self time"""
+        ranked = sorted(self.records.items(), key=lambda item: item[1]["self_ms"], reverse=True)
+        return [{"module": name, **{k: round(v, 3) for k, v in rec.items()}}
+                for name, rec in ranked[:limit]]
+
+
+class StartupReport:
+    """
+    Startup timeline for one CLI invocation
+
+    Marks are recorded relative to the process entry point so the report can
+    give a total time-to-first-event figure alongside per-module import costs.
+    """
+
+    def __init__(self, t0: float, profiler: Optional[ImportProfiler] = None):
+        """
+        Args:
+            t0: perf_counter() value captured when the entry module started
+            profiler: ImportProfiler active during the run
+        """
+        self.t0 = t0
+        self.profiler = profiler
+        self.marks: Dict[str, float] = {}
+        self.mark_modules: Dict[str, int] = {}
+
+    def mark(self, label: str, at: Optional[float] = None, modules: Optional[int] = None):
+        """
+        Record elapsed time since t0 under a label (first mark wins)
+
+        Args:
+            label: Timeline label
+            at: perf_counter() value to record instead of now, for points
+                passed before the report existed (e.g. the CLI's own imports)
+            modules: Number of modules imported during the phase ending here
+        """
+        if label not in self.marks:
+            self.marks[label] = ((time.perf_counter() if at is None else at) - self.t0) * 1000.0
+            if modules is not None:
+                self.mark_modules[label] = modules
+
+    def phases(self) -> Dict[str, float]:
+        """Time between each mark and the one before it, in timeline order"""
+        phases = {}
+        previous = 0.0
+        for label, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            phases[label] = ms - previous
+            previous = ms
+        return phases
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "marks_ms": {k: round(v, 3) for k, v in self.marks.items()},
+            "phases_ms": {k: round(v, 3) for k, v in self.phases().items()},
+            "time_to_first_event_ms": round(self.marks.get("first_event_output", 0.0), 3),
+            "python": sys.version.split()[0]
+        }
+        if self.mark_modules:
+            data["phase_modules"] = dict(self.mark_modules)
+        if self.profiler:
+            data["import_total_ms"] = round(self.profiler.total_import_ms(), 3)
+            data["modules_imported"] = len(self.profiler.records)
+            data["top_imports"] = self.profiler.top_modules()
+        return data
+
+    def format(self) -> str:
+        """Generate human-readable startup report"""
+        data = self.to_dict()
+        lines = ["=" * 60, "FILAMENT STARTUP PROFILE", "=" * 60]
+        lines.append(f"{'phase':<32} {'phase ms':>10} {'at ms':>10}")
+        for label, ms in data["phases_ms"].items():
+            modules = self.mark_modules.get(label)
+            note = f"  ({modules} modules imported)" if modules is not None else ""
+            lines.append(f"{label:<32} {ms:>10.2f} {data['marks_ms'][label]:>10.2f}{note}")
+        if self.profiler:
+            lines.append("")
+            lines.append(f"On-demand imports: {data['modules_imported']} modules, "
+                         f"{data['import_total_ms']:.2f} ms")
+            lines.append(f"{'module':<40} {'self ms':>9} {'cumul ms':>9}")
+            for rec in data["top_imports"]:
+                indent = "  " * int(rec["depth"])
+                lines.append(f"{(indent + rec['module'])[:40]:<40} {rec['self_ms']:>9.2f} {rec['cumulative_ms']:>9.2f}")
+        lines.append("")
+        lines.append(f"Time to first event: {data['time_to_first_event_ms']:.2f} ms")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
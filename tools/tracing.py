@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Filament Tracing
+Low-overhead spans recording wall time, CPU time and allocations per stage
+
+A Tracer collects nested spans for one FilamentEvent; a TraceAggregator folds
+the spans of many events into p50/p95/p99 histograms for batch runs.
+"""
+
+import sys
+import json
+import time
+import tracemalloc
+import functools
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+
+
+class Span:
+    """A single timed region, possibly containing child spans"""
+
+    __slots__ = ('name', 'parent', 'children', 'wall_s', 'cpu_s',
+                 'alloc_blocks', 'alloc_bytes', '_t0', '_c0', '_b0', '_m0')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None):
+        self.name = name
+        self.parent = parent
+        self.children: List['Span'] = []
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.alloc_blocks = 0
+        self.alloc_bytes = None
+
+    @property
+    def path(self) -> str:
+        """Slash-separated path from the root span"""
+        if self.parent is None:
+            return self.name
+        return f"{self.parent.path}/{self.name}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "wall_ms": round(self.wall_s * 1000.0, 3),
+            "cpu_ms": round(self.cpu_s * 1000.0, 3),
+            "alloc_blocks": self.alloc_blocks
+        }
+        if self.alloc_bytes is not None:
+            data["alloc_bytes"] = self.alloc_bytes
+        if self.children:
+            data["children"] = {}
+            for child in self.children:
+                data["children"][child.name] = _merge_span_dict(
+                    data["children"].get(child.name), child.to_dict())
+        return data
+
+
+def _merge_span_dict(existing: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine repeated sibling spans with the same name"""
+    if existing is None:
+        return new
+    for key in ("wall_ms", "cpu_ms", "alloc_blocks", "alloc_bytes"):
+        if key in new:
+            existing[key] = round(existing.get(key, 0) + new[key], 3)
+    existing["calls"] = existing.get("calls", 1) + 1
+    return existing
+
+
+class Tracer:
+    """
+    Records nested spans for a single processing event
+
+    Wall time uses perf_counter, CPU time uses process_time and allocations are
+    the change in live interpreter memory blocks. Byte-level allocation deltas
+    are added when tracemalloc is tracing (track_allocations=True starts it).
+    """
+
+    def __init__(self, track_allocations: bool = False, enabled: bool = True):
+        """
+        Args:
+            track_allocations: Start tracemalloc to record allocated bytes per span
+            enabled: When False, span() is a no-op
+        """
+        self.enabled = enabled
+        self.roots: List[Span] = []
+        self._current: Optional[Span] = None
+        if enabled and track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Optional[Span]]:
+        """Time the enclosed block as a child of the currently open span"""
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(name, self._current)
+        if self._current is None:
+            self.roots.append(span)
+        else:
+            self._current.children.append(span)
+        self._current = span
+
+        tracing_bytes = tracemalloc.is_tracing()
+        if tracing_bytes:
+            span._m0 = tracemalloc.get_traced_memory()[0]
+        span._b0 = sys.getallocatedblocks()
+        span._c0 = time.process_time()
+        span._t0 = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.wall_s = time.perf_counter() - span._t0
+            span.cpu_s = time.process_time() - span._c0
+            span.alloc_blocks = sys.getallocatedblocks() - span._b0
+            if tracing_bytes:
+                span.alloc_bytes = tracemalloc.get_traced_memory()[0] - span._m0
+            self._current = span.parent
+
+    def iter_spans(self) -> Iterator[Span]:
+        """Depth-first iteration over all completed and open spans"""
+        stack = list(reversed(self.roots))
+        while stack:
+            span = stack.pop()
+            yield span
+            stack.extend(reversed(span.children))
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Nested timing breakdown keyed by span name"""
+        data = {}
+        for root in self.roots:
+            data[root.name] = _merge_span_dict(data.get(root.name), root.to_dict())
+        return data
+
+    def total_wall_ms(self) -> float:
+        return round(sum(root.wall_s for root in self.roots) * 1000.0, 3)
+
+
+def traced(stage_name: Optional[str] = None):
+    """
+    Method decorator that runs the method inside a span of self.tracer
+
+    After the span closes, self._on_stage_traced(span) is called when the
+    instance defines it.
+    """
+    def decorator(method):
+        name = stage_name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, 'tracer', None)
+            if tracer is None or not tracer.enabled:
+                return method(self, *args, **kwargs)
+            with tracer.span(name) as span:
+                result = method(self, *args, **kwargs)
+            hook = getattr(self, '_on_stage_traced', None)
+            if hook:
+                hook(span)
+            return result
+        return wrapper
+    return decorator
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list (q in 0-100)"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    frac = pos - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * frac
+
+
+class TraceAggregator:
+    """
+    Aggregates spans from many tracers into per-path latency histograms
+    """
+
+    METRICS = ("wall_ms", "cpu_ms", "alloc_blocks", "alloc_bytes")
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+        self.events = 0
+
+    def add(self, tracer: Tracer):
+        """Fold every span of a tracer into the aggregate"""
+        self.events += 1
+        for span in tracer.iter_spans():
+            bucket = self.samples.setdefault(span.path, {m: [] for m in self.METRICS})
+            bucket["wall_ms"].append(span.wall_s * 1000.0)
+            bucket["cpu_ms"].append(span.cpu_s * 1000.0)
+            bucket["alloc_blocks"].append(float(span.alloc_blocks))
+            if span.alloc_bytes is not None:
+                bucket["alloc_bytes"].append(float(span.alloc_bytes))
+
+    def histograms(self) -> Dict[str, Any]:
+        """
+        Summary statistics per span path
+
+        Returns:
+            Dict mapping span path to {metric: {count, mean, p50, p95, p99, max}}
+        """
+        result = {}
+        for path, metrics in self.samples.items():
+            result[path] = {}
+            for metric, values in metrics.items():
+                if not values:
+                    continue
+                ordered = sorted(values)
+                result[path][metric] = {
+                    "count": len(ordered),
+                    "mean": round(sum(ordered) / len(ordered), 3),
+                    "p50": round(percentile(ordered, 50), 3),
+                    "p95": round(percentile(ordered, 95), 3),
+                    "p99": round(percentile(ordered, 99), 3),
+                    "max": round(ordered[-1], 3)
+                }
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"events": self.events, "spans": self.histograms()}
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format(self) -> str:
+        """Human-readable wall-time table"""
+        lines = [f"{'span':<56} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+        for path, metrics in self.histograms().items():
+            wall = metrics["wall_ms"]
+            lines.append(f"{path[:56]:<56} {wall['p50']:>9.3f} {wall['p95']:>9.3f} {wall['p99']:>9.3f}")
+        return "\n".join(lines)